@@ -0,0 +1,21 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['-created_at'], name='attendance_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['tour', '-created_at'], name='attendance_tour_created_idx'),
+        ),
+    ]
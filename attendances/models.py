@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from tours.models import Tour
 
@@ -20,12 +22,56 @@ class Attendance(models.Model):
         Orders attendances by date they were created
         from newest to oldest and ensures a user
         can't mark the same tour as attending twice.
+        Indexes attendances by tour in that order
+        for the tour's attendance list.
         """
         unique_together = ['owner', 'tour']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'], name='attendance_created_at_idx'
+            ),
+            models.Index(
+                fields=['tour', '-created_at'],
+                name='attendance_tour_created_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns the owner and tour of the attendance.
         """
         return f'{self.owner} {self.tour}'
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the attendance and updates the tour's attendance count
+        in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def increment_attendance_count(sender, instance, created, **kwargs):
+    """
+    Increments the tour's attendance count
+    upon the creation of a new attendance.
+    """
+    if created:
+        Tour.objects.filter(pk=instance.tour_id).update(
+            attendance_count=F('attendance_count') + 1
+        )
+
+
+def decrement_attendance_count(sender, instance, **kwargs):
+    """
+    Decrements the tour's attendance count
+    upon the deletion of an attendance.
+    """
+    Tour.objects.filter(pk=instance.tour_id).update(
+        attendance_count=F('attendance_count') - 1
+    )
+
+
+post_save.connect(increment_attendance_count, sender=Attendance)
+post_delete.connect(decrement_attendance_count, sender=Attendance)
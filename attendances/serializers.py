@@ -1,15 +1,17 @@
 from django.db import IntegrityError
 from rest_framework import serializers
+from captured_drf_api.fields import ImageURLField
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Attendance
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(BaseModelSerializer):
     """
     Serializes attendance data.
     """
     owner = serializers.ReadOnlyField(source='owner.username')
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
-    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+    profile_image = ImageURLField(source='owner.profile.image')
 
     class Meta:
         model = Attendance
@@ -3,6 +3,7 @@ from .models import Attendance
 from tours.models import Tour
 from rest_framework import status
 from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
 
 
 class AttendanceListViewTests(APITestCase):
@@ -148,3 +149,83 @@ class AttendanceModelTests(APITestCase):
             owner=user, tour=tour
             )
         self.assertEquals(str(Attendance.objects.first()), "user 1 title 1")
+
+
+class AttendanceCounterTests(APITestCase):
+    """
+    Tests the tour attendance count is kept up to date.
+    """
+    def test_attendance_count_follows_created_and_deleted_attendances(self):
+        """
+        Tests if creating and deleting an attendance updates
+        the stored attendance count of the tour.
+        """
+        user = User.objects.create_user(
+            username='user', password='password1'
+            )
+        tour = Tour.objects.create(
+            title='title 1',
+            owner=user,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='England',
+            city='London'
+            )
+        attendance = Attendance.objects.create(owner=user, tour=tour)
+        tour.refresh_from_db()
+        self.assertEqual(tour.attendance_count, 1)
+        attendance.delete()
+        tour.refresh_from_db()
+        self.assertEqual(tour.attendance_count, 0)
+
+
+class AttendanceQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the attendance views.
+    """
+    def setUp(self):
+        """
+        Sets up a user and a tour to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.tour = Tour.objects.create(
+            title='title 1',
+            owner=self.user1,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='England',
+            city='London'
+            )
+
+    def create_attendances(self, count):
+        """
+        Creates the given number of users attending the tour.
+        """
+        start = User.objects.count()
+        for number in range(start, start + count):
+            user = User.objects.create(username=f'attendee{number}')
+            Attendance.objects.create(owner=user, tour=self.tour)
+
+    def test_attendance_list_budget(self):
+        """
+        Tests if the attendance list of a tour validates the filter
+        value and runs the count and page queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget(
+            f'/attendances/?tour={self.tour.id}', 3, self.create_attendances
+            )
+
+    def test_attendance_detail_budget(self):
+        """
+        Tests if the attendance detail runs a single query,
+        plus the session and user if logged in.
+        """
+        self.create_attendances(1)
+        attendance = Attendance.objects.first()
+        self.assertQueryBudget(f'/attendances/{attendance.id}/', 1)
+        self.client.force_login(self.user1)
+        self.assertQueryBudget(f'/attendances/{attendance.id}/', 3)
@@ -1,11 +1,12 @@
 from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from captured_drf_api.mixins import OwnerQuerySetMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
 from .models import Attendance
 from .serializers import AttendanceSerializer
 
 
-class AttendanceList(generics.ListCreateAPIView):
+class AttendanceList(OwnerQuerySetMixin, generics.ListCreateAPIView):
     """
     Lists attendances and handles creation of an
     attendance if logged in.
@@ -25,7 +26,7 @@ class AttendanceList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class AttendanceDetail(generics.RetrieveDestroyAPIView):
+class AttendanceDetail(OwnerQuerySetMixin, generics.RetrieveDestroyAPIView):
     """
     Handles retrieving and deleting of attendances by id if owned
     """
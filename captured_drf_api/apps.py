@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class CapturedDrfApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'captured_drf_api'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .cache import connect_invalidation_signals
+        from .memberships import connect_membership_signals
+        connect_invalidation_signals()
+        connect_membership_signals()
@@ -0,0 +1,69 @@
+import statistics
+import time
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def scratch_database(keepdb=False):
+    """
+    Runs the block against a freshly migrated test database
+    so benchmarks never touch the configured database.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keepdb
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+
+
+def measure(func, repeat=5):
+    """
+    Calls func repeat times and returns the timings in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings, percent):
+    """
+    Returns the given percentile of the timings.
+    """
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method='inclusive')[
+        percent - 1
+    ]
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Returns a description of every scenario running more queries than
+    in the baseline, or with a p95 latency more than tolerance times
+    slower. Scenarios missing from either side are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: {result["queries"]} queries, '
+                f'baseline {expected["queries"]}'
+            )
+        if result['p95_ms'] > expected['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f'{name}: p95 {result["p95_ms"]:.2f}ms, '
+                f'baseline {expected["p95_ms"]:.2f}ms'
+            )
+    return regressions
@@ -0,0 +1,25 @@
+from django.db import connection
+
+
+def delete_rows(model, pks):
+    """
+    Deletes the rows of the model with the given primary keys in one
+    DELETE statement and returns how many were deleted. Unlike
+    QuerySet.delete(), it doesn't collect the rows or send the delete
+    signals, so the caller does the signals' bookkeeping once for
+    the whole batch. Only use it for models no other model cascades
+    from.
+    """
+    pks = list(pks)
+    if not pks:
+        return 0
+    quote_name = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote_name(model._meta.db_table)} '
+            f'WHERE {quote_name(model._meta.pk.column)} '
+            f'IN ({placeholders})',
+            pks,
+        )
+        return cursor.rowcount
@@ -0,0 +1,238 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework.response import Response
+from .clock import today
+from .conditional import evaluate_preconditions
+from .fields import wants_iso_timestamps
+
+def version_key(model, pk=None):
+    """
+    Returns the cache key holding the version of a model,
+    or of a single object of the model when a pk is given.
+    """
+    key = f'api-version:{model._meta.label_lower}'
+    if pk is not None:
+        key = f'{key}:{pk}'
+    return key
+
+
+def get_versions(keys):
+    """
+    Returns the versions stored under the keys, starting any
+    missing version from the current time so it can't repeat
+    a version an evicted key had before.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(keys):
+    """
+    Increments the versions stored under the keys, invalidating
+    every cached response built from them.
+    """
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate(model, pks=()):
+    """
+    Invalidates cached responses built from the model and,
+    more precisely, from the objects with the given pks. The
+    versions are bumped once the current transaction commits, so a
+    concurrent request can't cache the uncommitted state's
+    predecessor under the new versions.
+    """
+    keys = [version_key(model)] + [version_key(model, pk) for pk in pks]
+    transaction.on_commit(lambda: bump_versions(keys))
+
+
+class CachedResponseMixin:
+    """
+    Caches the responses of anonymous GET requests, keyed by path,
+    normalized query string and the versions of the models listed
+    in cache_models. Detail views are also keyed by the version of
+    the object they show, so unrelated objects don't invalidate them.
+    The ETag header is cached with the data, so conditional
+    requests can be answered without any query.
+    Views setting vary_on_today are also keyed by the date, and
+    views whose payload doesn't depend on the viewer can set
+    cache_authenticated to share the cache with logged in users.
+    Views rendering relative times like "5 minutes ago" set
+    relative_timestamps, so only their ?timestamps=iso responses
+    are cached. Caching is disabled when API_CACHE_TIMEOUT is 0.
+    """
+    cache_models = []
+    vary_on_today = False
+    cache_authenticated = False
+    relative_timestamps = False
+
+    def get_cache_key(self, request):
+        """
+        Returns the cache key of the response to the request.
+        """
+        keys = [version_key(model) for model in self.cache_models]
+        pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if pk is not None:
+            keys.append(version_key(self.queryset.model, pk))
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw_key = (
+            f'{request.path}?{query}:{request.accepted_renderer.format}:'
+            f'{get_versions(keys)}'
+        )
+        if self.vary_on_today:
+            raw_key += f':{today(request)}'
+        return 'api-response:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        timeout = settings.API_CACHE_TIMEOUT
+        if not timeout or (
+            request.user.is_authenticated and not self.cache_authenticated
+        ) or (
+            self.relative_timestamps and not wants_iso_timestamps(request)
+        ):
+            return super().get(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            etag = headers.get('ETag')
+            return (
+                etag and evaluate_preconditions(request, etag)
+            ) or Response(data, headers=headers)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {}
+            if 'ETag' in response:
+                headers['ETag'] = response['ETag']
+            cache.set(key, (response.data, headers), timeout)
+        return response
+
+
+def get_profile_ids(*owner_ids):
+    """
+    Returns the ids of the profiles owned by the users.
+    """
+    from profiles.models import Profile
+    return Profile.objects.filter(
+        owner__in=owner_ids
+    ).values_list('pk', flat=True)
+
+
+def invalidate_owned_content(*owner_ids):
+    """
+    Invalidates the photos and comments of the users, whose
+    responses show their owner's username and profile image.
+    """
+    from comments.models import Comment
+    from photos.models import Photo
+    for model in (Photo, Comment):
+        invalidate(model, model.objects.filter(
+            owner__in=owner_ids
+        ).values_list('pk', flat=True))
+
+
+def invalidate_photo(sender, instance, **kwargs):
+    """
+    Invalidates the photo and its owner's profile.
+    """
+    from profiles.models import Profile
+    invalidate(sender, [instance.pk])
+    invalidate(Profile, get_profile_ids(instance.owner_id))
+
+
+def invalidate_photo_child(sender, instance, **kwargs):
+    """
+    Invalidates a comment or like and the photo it belongs to.
+    """
+    from photos.models import Photo
+    invalidate(sender, [instance.pk])
+    invalidate(Photo, [instance.photo_id])
+
+
+def invalidate_attendance(sender, instance, **kwargs):
+    """
+    Invalidates an attendance and the tour it belongs to.
+    """
+    from tours.models import Tour
+    invalidate(sender, [instance.pk])
+    invalidate(Tour, [instance.tour_id])
+
+
+def invalidate_follower(sender, instance, **kwargs):
+    """
+    Invalidates a follower and the profiles of both users.
+    """
+    from profiles.models import Profile
+    invalidate(sender, [instance.pk])
+    invalidate(
+        Profile, get_profile_ids(instance.owner_id, instance.followed_id)
+    )
+
+
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidates the responses showing the user's username: those
+    of the user's profile, photos, comments and tours. Saves leaving
+    the username out of update_fields, like updating last_login, are
+    skipped.
+    """
+    from profiles.models import Profile
+    from tours.models import Tour
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    invalidate(Profile, get_profile_ids(instance.pk))
+    invalidate(Tour, Tour.objects.filter(
+        owner=instance.pk
+    ).values_list('pk', flat=True))
+    invalidate_owned_content(instance.pk)
+
+
+def invalidate_profile(sender, instance, **kwargs):
+    """
+    Invalidates the profile and the photos and comments of its
+    owner, which show the profile image.
+    """
+    invalidate(sender, [instance.pk])
+    invalidate_owned_content(instance.owner_id)
+
+
+def invalidate_instance(sender, instance, **kwargs):
+    """
+    Invalidates the saved or deleted object.
+    """
+    invalidate(sender, [instance.pk])
+
+
+INVALIDATION_HANDLERS = {
+    'photos.Photo': invalidate_photo,
+    'comments.Comment': invalidate_photo_child,
+    'likes.Like': invalidate_photo_child,
+    'tours.Tour': invalidate_instance,
+    'attendances.Attendance': invalidate_attendance,
+    'followers.Follower': invalidate_follower,
+    'profiles.Profile': invalidate_profile,
+    'auth.User': invalidate_user,
+}
+
+
+def connect_invalidation_signals():
+    """
+    Connects the invalidation handlers to the saving
+    and deletion of their models.
+    """
+    for sender, handler in INVALIDATION_HANDLERS.items():
+        post_save.connect(handler, sender=sender)
+        post_delete.connect(handler, sender=sender)
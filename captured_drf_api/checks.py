@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register()
+def check_response_cache(app_configs, **kwargs):
+    """
+    Warns when API responses are cached in local memory outside
+    DEBUG, as invalidations would only reach one worker.
+    """
+    if (
+        settings.API_CACHE_TIMEOUT and not settings.DEBUG
+        and settings.CACHES['default']['BACKEND'] == LOCAL_CACHE_BACKEND
+    ):
+        return [Warning(
+            'API_CACHE_TIMEOUT is set but the default cache is local to '
+            'each process, so workers serve stale responses after '
+            'writes handled by other workers.',
+            hint='Set CACHE_TABLE to use the database cache.',
+            id='captured_drf_api.W001',
+        )]
+    return []
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+def get_clock():
+    """
+    Returns the clock of the API, the callable or dotted path to a
+    callable returning the current aware datetime in the API_CLOCK
+    setting. Tests pin the date by overriding API_CLOCK.
+    """
+    clock = settings.API_CLOCK
+    if isinstance(clock, str):
+        clock = import_string(clock)
+    return clock
+
+
+def now(request=None):
+    """
+    Returns the current time, read once per request so everything
+    computed for the same request agrees on it.
+    """
+    if request is None:
+        return get_clock()()
+    request = getattr(request, '_request', request)
+    if not hasattr(request, 'clock_now'):
+        request.clock_now = get_clock()()
+    return request.clock_now
+
+
+def today(request=None):
+    """
+    Returns the current date in the current time zone,
+    read once per request.
+    """
+    return timezone.localdate(now(request))
@@ -0,0 +1,191 @@
+import hashlib
+import json
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.utils.encoders import JSONEncoder
+from .clock import today
+from .fields import wants_iso_timestamps
+
+
+def set_validators(response, etag):
+    """
+    Sets the ETag header of a response.
+    """
+    response['ETag'] = etag
+    return response
+
+
+def evaluate_preconditions(request, etag):
+    """
+    Returns a 304 Not Modified (or 412 Precondition Failed) response
+    when the request's conditional headers match the ETag,
+    otherwise None.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None and response.status_code == 304:
+        set_validators(response, etag)
+    return response
+
+
+def is_loaded(queryset, path):
+    """
+    Returns true if the field path, like updated_at or
+    owner__username, is loaded with the rows of the queryset,
+    so reading it from them doesn't run a query.
+    """
+    *relations, name = path.split('__')
+    model = queryset.model
+    select_related = queryset.query.select_related
+    for relation in relations:
+        if not isinstance(select_related, dict) or (
+            relation not in select_related
+        ):
+            return False
+        select_related = select_related[relation]
+        model = model._meta.get_field(relation).related_model
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    names, defer = queryset.query.deferred_loading
+    if defer:
+        return path not in names
+    return path in names
+
+
+def get_path(instance, path):
+    """
+    Returns the value of the field path on a model instance.
+    """
+    for attr in path.split('__'):
+        instance = getattr(instance, attr)
+    return instance
+
+
+class ConditionalGetMixin:
+    """
+    Sends an ETag with GET responses and answers a matching
+    If-None-Match with 304 Not Modified before the queryset is
+    serialized.
+
+    The ETag is a digest of the pk and etag_fields of the object or of
+    every row of the page, in order, so any change to a row changes
+    it and changes to different rows can't cancel out. etag_fields
+    should hold what changes the payload: updated_at, counters, viewer
+    annotations and the columns of related rows shown. Conditional
+    requests read them in one lightweight query, plus the count query
+    of numbered pages, while 200 responses take them from the rows
+    they serialize. The ETag also varies with the full path, the
+    viewer and the rendering format, and with the date on views
+    setting vary_on_today. Views rendering relative times set
+    relative_timestamps, so only their ?timestamps=iso responses
+    get an ETag.
+    """
+    etag_fields = ['updated_at']
+    vary_on_today = False
+    relative_timestamps = False
+
+    def is_detail_view(self):
+        """
+        Returns True if the view looks up a single object.
+        """
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def has_etag(self, request):
+        """
+        Returns true if the response to the request gets an ETag.
+        """
+        return not self.relative_timestamps or wants_iso_timestamps(request)
+
+    def get_etag_fields(self, queryset):
+        """
+        Returns pk and the etag_fields the rows of the queryset load,
+        leaving out viewer annotations that are only added for logged
+        in users and fields a sparse fieldset leaves out.
+        """
+        return ['pk'] + [
+            field for field in self.etag_fields
+            if field in queryset.query.annotations
+            or is_loaded(queryset, field)
+        ]
+
+    def get_validator_rows(self):
+        """
+        Returns the etag field values of the object or page rows
+        the request would show, read in a lightweight query,
+        or None when the object doesn't exist.
+        """
+        queryset = self.get_queryset()
+        fields = self.get_etag_fields(queryset)
+        if self.is_detail_view():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            row = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(*fields).first()
+            return None if row is None else [list(row)]
+        # Paginators read the ordering fields of the rows, so they
+        # are loaded along with the etag fields
+        columns = dict.fromkeys(fields + [
+            field.attname for field in queryset.model._meta.concrete_fields
+        ])
+        rows = self.filter_queryset(queryset).values(*columns)
+        if self.paginator is not None:
+            rows = self.paginator.paginate_queryset(rows, self.request, self)
+        return [[row[field] for field in fields] for row in rows]
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Keeps the object or page rows passed to the serializer,
+        so the ETag is computed from the rows of the response.
+        """
+        if args:
+            rows = args[0]
+            self.serialized_rows = rows if kwargs.get('many') else [rows]
+        return super().get_serializer(*args, **kwargs)
+
+    def get_serialized_rows(self):
+        """
+        Returns the etag field values of the rows serialized
+        for the response.
+        """
+        fields = self.get_etag_fields(self.get_queryset())
+        return [
+            [get_path(row, field) for field in fields]
+            for row in self.serialized_rows
+        ]
+
+    def get_etag(self, request, rows):
+        """
+        Returns the ETag of the response with the given
+        etag field values.
+        """
+        key = json.dumps(
+            [
+                request.get_full_path(),
+                request.user.pk,
+                request.accepted_renderer.format,
+                today(request) if self.vary_on_today else None,
+                rows,
+            ],
+            cls=JSONEncoder,
+        )
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_etag(request):
+            return super().get(request, *args, **kwargs)
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            rows = self.get_validator_rows()
+            if rows is not None:
+                response = evaluate_preconditions(
+                    request, self.get_etag(request, rows)
+                )
+                if response is not None:
+                    return response
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_validators(
+                response, self.get_etag(request, self.get_serialized_rows())
+            )
+        return response
@@ -0,0 +1,72 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from attendances.models import Attendance
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from photos.models import Photo
+from profiles.models import Profile
+from tours.models import Tour
+
+
+def count_of(queryset, field, outer_field='pk'):
+    """
+    Returns a subquery counting the rows of the queryset
+    whose field matches the outer row's outer_field.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def refresh_photo_counters(photo_ids=None):
+    """
+    Recomputes the likes and comments counts of the given photos,
+    or of all photos when no ids are given.
+    """
+    photos = Photo.objects.all()
+    if photo_ids is not None:
+        photos = photos.filter(pk__in=photo_ids)
+    return photos.update(
+        likes_count=count_of(Like.objects.all(), 'photo'),
+        comments_count=count_of(Comment.objects.all(), 'photo'),
+    )
+
+
+def refresh_tour_counters(tour_ids=None):
+    """
+    Recomputes the attendance count of the given tours,
+    or of all tours when no ids are given.
+    """
+    tours = Tour.objects.all()
+    if tour_ids is not None:
+        tours = tours.filter(pk__in=tour_ids)
+    return tours.update(
+        attendance_count=count_of(Attendance.objects.all(), 'tour'),
+    )
+
+
+def refresh_profile_counters(owner_ids=None):
+    """
+    Recomputes the photo, follower and following counts of the
+    profiles owned by the given users, or of all profiles
+    when no ids are given.
+    """
+    profiles = Profile.objects.all()
+    if owner_ids is not None:
+        profiles = profiles.filter(owner__in=owner_ids)
+    return profiles.update(
+        photos_count=count_of(Photo.objects.all(), 'owner', 'owner'),
+        followers_count=count_of(
+            Follower.objects.all(), 'followed', 'owner'
+        ),
+        following_count=count_of(Follower.objects.all(), 'owner', 'owner'),
+    )
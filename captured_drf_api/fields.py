@@ -0,0 +1,126 @@
+from functools import lru_cache
+from django.core.signals import setting_changed
+from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+from .clock import now
+from .humanize import RelativeTimeFormatter
+from .images import (
+    IMAGE_MAX_DIMENSION, IMAGE_MAX_SIZE, validate_image_upload,
+)
+
+# The number of image URLs kept by storage_url
+IMAGE_URL_CACHE_SIZE = 10_000
+TIMESTAMPS_QUERY_PARAM = 'timestamps'
+
+
+@lru_cache(maxsize=IMAGE_URL_CACHE_SIZE)
+def storage_url(storage, name):
+    """
+    Returns the URL of the stored file name, memoized per storage and
+    name since stored names never change, so the Cloudinary URL of
+    every image is only built once per process.
+    """
+    return storage.url(name)
+
+
+def image_url(image):
+    """
+    Returns the URL of an image field file, or None if it is empty.
+    """
+    if not image:
+        return None
+    return storage_url(image.storage, image.name)
+
+
+def wants_iso_timestamps(request):
+    """
+    Returns true if the request asks for ISO 8601 timestamps
+    instead of relative times with ?timestamps=iso.
+    """
+    return request is not None and request.query_params.get(
+        TIMESTAMPS_QUERY_PARAM
+    ) == 'iso'
+
+
+def clear_image_urls(setting, **kwargs):
+    """
+    Drops the memoized URLs when the storage settings change.
+    """
+    if setting in ('MEDIA_URL', 'CLOUDINARY_STORAGE', 'DEFAULT_FILE_STORAGE'):
+        storage_url.cache_clear()
+
+
+setting_changed.connect(clear_image_urls)
+
+
+class CachedImageField(serializers.ImageField):
+    """
+    Image field building its URL with the memoized storage_url.
+    """
+    def to_representation(self, value):
+        if not value:
+            return None
+        use_url = getattr(self, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        if not use_url:
+            return value.name
+        url = image_url(value)
+        request = self.context.get('request', None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class ImageURLField(serializers.ReadOnlyField):
+    """
+    Read only field returning the memoized URL of the image at its
+    source, like owner.profile.image.
+    """
+    def to_representation(self, value):
+        return image_url(value)
+
+
+class ImageUploadField(CachedImageField):
+    """
+    Image field validating uploads with validate_image_upload, which
+    checks the size before reading the dimensions from the header,
+    instead of having Pillow verify the whole file.
+    """
+    def __init__(self, max_size=IMAGE_MAX_SIZE,
+                 max_dimension=IMAGE_MAX_DIMENSION, **kwargs):
+        self.max_size = max_size
+        self.max_dimension = max_dimension
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        file_object = serializers.FileField.to_internal_value(self, data)
+        image = validate_image_upload(
+            file_object, self.max_size, self.max_dimension
+        )
+        if image is None:
+            self.fail('invalid_image')
+        file_object.image = image
+        file_object.content_type = image.get_format_mimetype()
+        return file_object
+
+
+class NaturalTimeField(serializers.DateTimeField):
+    """
+    Read only datetime field rendered as a relative time like
+    "2 hours ago", or as an ISO 8601 timestamp when the request
+    asks for ?timestamps=iso. The relative times of a response
+    share one RelativeTimeFormatter, and so one now.
+    """
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('format', ISO_8601)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        if wants_iso_timestamps(request):
+            return super().to_representation(value)
+        formatter = self.context.get('relative_time_formatter')
+        if formatter is None:
+            formatter = RelativeTimeFormatter(now(request))
+            self.context['relative_time_formatter'] = formatter
+        return formatter.format(value)
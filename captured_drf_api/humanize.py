@@ -0,0 +1,117 @@
+import calendar
+import datetime
+from django.contrib.humanize.templatetags.humanize import (
+    NaturalTimeFormatter, naturaltime,
+)
+from django.utils import timezone
+from django.utils.html import avoid_wrapping
+from django.utils.timesince import TIMESINCE_CHUNKS
+from django.utils.translation import gettext
+
+
+class RelativeTimeFormatter:
+    """
+    Formats datetimes like the naturaltime filter, relative to a now
+    captured once. Every translated string is resolved once per count
+    and reused, so a page of rows goes through the translation
+    machinery a handful of times instead of twice per row.
+    """
+    depth = 2
+
+    def __init__(self, now=None):
+        self.now = now or timezone.now()
+        self.strings = {}
+        self.separator = gettext(', ')
+
+    def translate(self, strings, key, count=None):
+        """
+        Returns the translated string of the key, formatted with
+        count, resolving it on first use only.
+        """
+        cache_key = (id(strings), key, count)
+        if cache_key not in self.strings:
+            string = strings[key]
+            if count is None:
+                value = str(string)
+            elif strings is NaturalTimeFormatter.time_strings:
+                value = string % {'count': count}
+            else:
+                value = avoid_wrapping(string % count)
+            self.strings[cache_key] = value
+        return self.strings[cache_key]
+
+    def timesince(self, earlier, later, substrings):
+        """
+        Returns the time between two datetimes as up to depth
+        adjacent units, like django.utils.timesince.timesince.
+        """
+        leapdays = calendar.leapdays(earlier.year, later.year)
+        if leapdays != 0:
+            if calendar.isleap(earlier.year):
+                leapdays -= 1
+            elif calendar.isleap(later.year):
+                leapdays += 1
+        delta = later - earlier - datetime.timedelta(leapdays)
+        since = delta.days * 24 * 60 * 60 + delta.seconds
+        if since <= 0:
+            return self.translate(substrings, 'minute', 0)
+        parts = []
+        for seconds, name in TIMESINCE_CHUNKS:
+            count = since // seconds
+            if count == 0:
+                if parts:
+                    break
+                continue
+            parts.append(self.translate(substrings, name, count))
+            since -= seconds * count
+            if len(parts) == self.depth:
+                break
+        if not parts:
+            return self.translate(substrings, 'minute', 0)
+        return self.separator.join(parts)
+
+    def format(self, value):
+        """
+        Returns the relative time of the value, as naturaltime would.
+        """
+        if not isinstance(value, datetime.datetime) or (
+            timezone.is_aware(value) != timezone.is_aware(self.now)
+        ):
+            return naturaltime(value)
+        strings = NaturalTimeFormatter.time_strings
+        if value < self.now:
+            delta = self.now - value
+            direction = 'past'
+            substrings = NaturalTimeFormatter.past_substrings
+            earlier, later = value, self.now
+        else:
+            delta = value - self.now
+            direction = 'future'
+            substrings = NaturalTimeFormatter.future_substrings
+            earlier, later = self.now, value
+        if delta.days != 0:
+            return self.translate(strings, f'{direction}-day') % {
+                'delta': self.timesince(earlier, later, substrings),
+            }
+        if delta.seconds == 0:
+            return self.translate(strings, 'now')
+        if delta.seconds < 60:
+            return self.translate(
+                strings, f'{direction}-second', delta.seconds
+            )
+        if delta.seconds // 60 < 60:
+            return self.translate(
+                strings, f'{direction}-minute', delta.seconds // 60
+            )
+        return self.translate(
+            strings, f'{direction}-hour', delta.seconds // 60 // 60
+        )
+
+
+def naturaltimes(values, now=None):
+    """
+    Returns the relative times of the values, formatted
+    against the same now with shared translations.
+    """
+    formatter = RelativeTimeFormatter(now)
+    return [formatter.format(value) for value in values]
@@ -0,0 +1,82 @@
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+
+IMAGE_MAX_SIZE = 2 * 1024 * 1024
+IMAGE_MAX_DIMENSION = 4096
+# Room left for the multipart boundaries and text fields of an upload
+UPLOAD_OVERHEAD = 512 * 1024
+
+
+def image_size_message(max_size=IMAGE_MAX_SIZE):
+    """
+    Returns the error message of images larger than max_size bytes.
+    """
+    return f'Image size larger than {max_size // (1024 * 1024)}MB!'
+
+
+def read_image_header(file):
+    """
+    Returns the Pillow image of the file with only its header parsed,
+    so its format and dimensions are known without decoding any
+    pixels, or None if Pillow doesn't recognize it.
+    """
+    try:
+        image = Image.open(file)
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+    return image
+
+
+def validate_image_upload(
+    file, max_size=IMAGE_MAX_SIZE, max_dimension=IMAGE_MAX_DIMENSION
+):
+    """
+    Validates an uploaded image from the cheapest check to the most
+    expensive: the upload size first, then the dimensions read from
+    the image header. Returns the header-only Pillow image, or None
+    if the file isn't an image.
+    """
+    if file.size > max_size:
+        raise serializers.ValidationError(image_size_message(max_size))
+    image = read_image_header(file)
+    if image is None:
+        return None
+    width, height = image.size
+    if height > max_dimension:
+        raise serializers.ValidationError(
+            f'Image height larger than {max_dimension}px!'
+        )
+    if width > max_dimension:
+        raise serializers.ValidationError(
+            f'Image width larger than {max_dimension}px!'
+        )
+    return image
+
+
+class ImageUploadParser(MultiPartParser):
+    """
+    Multipart parser rejecting requests whose content length can only
+    be explained by an image larger than IMAGE_MAX_SIZE, before the
+    body is read.
+    """
+    max_size = IMAGE_MAX_SIZE
+    image_field = 'image'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > self.max_size + UPLOAD_OVERHEAD:
+            raise serializers.ValidationError({
+                self.image_field: [image_size_message(self.max_size)]
+            })
+        return super().parse(stream, media_type, parser_context)
+
+
+# The parsers of views accepting image uploads
+IMAGE_UPLOAD_PARSER_CLASSES = [JSONParser, FormParser, ImageUploadParser]
@@ -0,0 +1,187 @@
+import json
+import secrets
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from captured_drf_api.benchmarks import (
+    compare_to_baseline, measure, percentile, scratch_database,
+)
+from captured_drf_api.metrics import RequestMetrics
+from photos.models import Photo
+from profiles.models import Profile
+from .seed_data import add_seed_arguments, seed_from_options
+
+BASELINE_PATH = settings.BASE_DIR / 'benchmarks' / 'api_baseline.json'
+SEED_OPTIONS = [
+    'users', 'follows', 'photos', 'likes', 'comments', 'tours',
+    'attendances', 'seed',
+]
+
+
+class Command(BaseCommand):
+    """
+    Seeds a scratch database and measures the latency and query
+    count of the main endpoints and the auth flows through the
+    DRF test client, failing when they regress from the baseline.
+    """
+    help = 'Benchmarks the API endpoints against a stored baseline.'
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--baseline', type=Path, default=BASELINE_PATH,
+            help='JSON file the results are compared against.',
+        )
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='Write the results to the baseline file.',
+        )
+        parser.add_argument(
+            '--output', type=Path, help='Also write the results here.',
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help='Allowed p95 slowdown over the baseline, 0.5 is 50%%.',
+        )
+        parser.add_argument(
+            '--cache', action='store_true',
+            help='Keep the anonymous response cache enabled.',
+        )
+
+    def logged_in_client(self, username):
+        """
+        Returns a client logged in through the login endpoint,
+        so it carries the same cookies as a browser would.
+        """
+        client = APIClient()
+        response = client.post('/dj-rest-auth/login/', {
+            'username': username, 'password': self.password,
+        })
+        if response.status_code != 200:
+            raise CommandError(f'Logging in failed: {response.data}')
+        return client
+
+    def get_scenarios(self):
+        """
+        Returns the benchmarked requests by name, each a function
+        sending one request, with an optional setup function run
+        untimed before each of them.
+        """
+        anonymous = APIClient()
+        username = Profile.objects.order_by(
+            '-following_count'
+        ).values_list('owner__username', flat=True)[0]
+        user = self.logged_in_client(username)
+        photo_id = Photo.objects.order_by(
+            '-comments_count'
+        ).values_list('id', flat=True)[0]
+        credentials = {'username': username, 'password': self.password}
+        flow = APIClient()
+
+        def log_in():
+            return flow.post('/dj-rest-auth/login/', credentials)
+
+        def log_out():
+            return flow.post('/dj-rest-auth/logout/')
+
+        return {
+            'photo_list': (lambda: anonymous.get('/photos/'), None),
+            'photo_search': (
+                lambda: anonymous.get('/photos/?search=mountain'), None
+            ),
+            'profile_list': (lambda: anonymous.get('/profiles/'), None),
+            'tour_list': (lambda: anonymous.get('/tours/'), None),
+            'comment_list': (
+                lambda: anonymous.get(f'/comments/?photo={photo_id}'), None
+            ),
+            'photo_list_logged_in': (lambda: user.get('/photos/'), None),
+            'profile_list_logged_in': (lambda: user.get('/profiles/'), None),
+            'feed': (lambda: user.get('/feed/'), None),
+            'login': (log_in, log_out),
+            'current_user': (lambda: user.get('/dj-rest-auth/user/'), None),
+            'logout': (log_out, log_in),
+        }
+
+    def run_scenario(self, request, setup, repeat):
+        """
+        Returns the p50 and p95 latency in milliseconds and the
+        query count of a scenario, after one warm-up request.
+        """
+        if setup:
+            setup()
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics.record_query):
+            response = request()
+        if response.status_code >= 400:
+            raise CommandError(f'{response.status_code}: {response.data}')
+        timings = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            timings.extend(measure(request, repeat=1))
+        return {
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'queries': metrics.queries,
+        }
+
+    def handle(self, *args, **options):
+        config = {name: options[name] for name in SEED_OPTIONS}
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            'DEBUG': False,
+        }
+        if not options['cache']:
+            overrides['API_CACHE_TIMEOUT'] = 0
+        self.password = secrets.token_urlsafe(16)
+        with scratch_database(), override_settings(**overrides):
+            seed_from_options(
+                options, password=self.password, log=self.stdout.write
+            )
+            results = {}
+            for name, (request, setup) in self.get_scenarios().items():
+                results[name] = self.run_scenario(
+                    request, setup, options['repeat']
+                )
+                self.stdout.write(
+                    f'{name:<24} p50 {results[name]["p50_ms"]:8.2f}ms '
+                    f'p95 {results[name]["p95_ms"]:8.2f}ms '
+                    f'{results[name]["queries"]:3} queries'
+                )
+        report = {'config': config, 'scenarios': results}
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2) + '\n')
+        baseline_path = options['baseline']
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(
+                f'Wrote the baseline to {baseline_path}.'
+            ))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(
+                f'No baseline at {baseline_path}, nothing to compare.'
+            ))
+            return
+        baseline = json.loads(baseline_path.read_text())
+        if baseline['config'] != config:
+            raise CommandError(
+                f'The baseline was recorded with {baseline["config"]}, '
+                f'run with the same volumes or --update-baseline.'
+            )
+        regressions = compare_to_baseline(
+            results, baseline['scenarios'], options['tolerance']
+        )
+        if regressions:
+            raise CommandError(
+                'Performance regressed from the baseline:\n'
+                + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'No regressions from the baseline.'
+        ))
@@ -0,0 +1,95 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from captured_drf_api.benchmarks import measure
+from captured_drf_api.fields import storage_url
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from profiles.models import Profile
+
+
+class UncachedCommentSerializer(CommentSerializer):
+    """
+    Comment serializer building the profile image URL through
+    the storage on every row, as before storage_url.
+    """
+    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+
+
+class Command(BaseCommand):
+    """
+    Compares the time spent serializing a page of comments with and
+    without the memoized image URLs. The comments are built in memory,
+    so only the serializer is measured.
+    """
+    help = 'Benchmarks image URL construction on a page of comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100)
+        parser.add_argument('--authors', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def build_page(self, rows, authors):
+        """
+        Returns unsaved comments by the given number of
+        authors, each with their own profile image.
+        """
+        now = timezone.now()
+        owners = []
+        for number in range(authors):
+            owner = User(id=number + 1, username=f'author{number}')
+            owner.profile = Profile(
+                id=number + 1, owner=owner, image=f'images/author{number}'
+            )
+            owners.append(owner)
+        return [
+            Comment(
+                id=number + 1,
+                owner=owners[number % authors],
+                photo_id=1,
+                content='comment',
+                created_at=now,
+                updated_at=now,
+            )
+            for number in range(rows)
+        ]
+
+    def serialize(self, serializer_class, page, clear=False):
+        """
+        Returns a function serializing the page, clearing the
+        memoized URLs first when clear is true.
+        """
+        request = Request(APIRequestFactory().get('/comments/'))
+
+        def run():
+            if clear:
+                storage_url.cache_clear()
+            serializer_class(
+                page, many=True, context={'request': request}
+            ).data
+        return run
+
+    def handle(self, *args, **options):
+        page = self.build_page(options['rows'], options['authors'])
+        cases = [
+            ('uncached', UncachedCommentSerializer, False),
+            ('memoized, cold', CommentSerializer, True),
+            ('memoized, warm', CommentSerializer, False),
+        ]
+        self.stdout.write(
+            f'Serializing {options["rows"]} comments by '
+            f'{options["authors"]} authors, {options["repeat"]} times:'
+        )
+        for name, serializer_class, clear in cases:
+            timings = measure(
+                self.serialize(serializer_class, page, clear),
+                options['repeat'],
+            )
+            self.stdout.write(
+                f'{name:<16} '
+                f'best {min(timings):8.3f}ms '
+                f'mean {sum(timings) / len(timings):8.3f}ms'
+            )
@@ -0,0 +1,109 @@
+import os
+from io import BytesIO
+from PIL import Image
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from captured_drf_api.benchmarks import measure
+from captured_drf_api.fields import ImageUploadField
+from captured_drf_api.images import IMAGE_MAX_DIMENSION, IMAGE_MAX_SIZE
+
+
+def encode(image_format, size, noise=False):
+    """
+    Returns the bytes of an image in the given format and size,
+    made of random pixels when noise is true so it compresses badly.
+    """
+    if noise:
+        image = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+    else:
+        image = Image.linear_gradient('L').resize(size).convert('RGB')
+    content = BytesIO()
+    image.save(content, image_format)
+    return content.getvalue()
+
+
+def validate_with_pillow_verify(upload):
+    """
+    Validates the upload the way the serializers did before
+    ImageUploadField: Django's ImageField opens and verifies the
+    whole file, then the size and dimensions are checked.
+    """
+    value = serializers.ImageField().to_internal_value(upload)
+    if value.size > IMAGE_MAX_SIZE:
+        raise serializers.ValidationError('Image size larger than 2MB!')
+    if value.image.height > IMAGE_MAX_DIMENSION:
+        raise serializers.ValidationError('Image height larger than 4096px!')
+    if value.image.width > IMAGE_MAX_DIMENSION:
+        raise serializers.ValidationError('Image width larger than 4096px!')
+    return value
+
+
+class Command(BaseCommand):
+    """
+    Compares the full Pillow verify validation of image uploads with
+    the header-only ImageUploadField on valid, oversized, too large
+    and malformed JPEG, PNG and WebP inputs.
+    """
+    help = 'Benchmarks the validation of uploaded images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def build_inputs(self):
+        """
+        Returns the name and bytes of every benchmarked input.
+        """
+        inputs = []
+        for image_format, extension in (
+            ('JPEG', 'jpg'), ('PNG', 'png'), ('WEBP', 'webp'),
+        ):
+            valid = encode(image_format, (1600, 1200))
+            inputs += [
+                (f'valid {extension}', extension, valid),
+                (
+                    f'oversized {extension}', extension,
+                    encode(image_format, (2400, 1800), noise=True),
+                ),
+                (
+                    f'too tall {extension}', extension,
+                    encode(image_format, (100, IMAGE_MAX_DIMENSION + 1)),
+                ),
+                (
+                    f'malformed {extension}', extension,
+                    b'\0' * 64 + valid[64:],
+                ),
+            ]
+        return inputs
+
+    def validate(self, validator, extension, content):
+        """
+        Returns a function running the validator on a fresh upload
+        of the content, ignoring validation errors.
+        """
+        def run():
+            upload = SimpleUploadedFile(f'image.{extension}', content)
+            try:
+                validator(upload)
+            except (ValidationError, serializers.ValidationError):
+                pass
+        return run
+
+    def handle(self, *args, **options):
+        validators = [
+            ('pillow verify', validate_with_pillow_verify),
+            ('header only', ImageUploadField().run_validation),
+        ]
+        for name, extension, content in self.build_inputs():
+            for validator_name, validator in validators:
+                timings = measure(
+                    self.validate(validator, extension, content),
+                    options['repeat'],
+                )
+                self.stdout.write(
+                    f'{name:<16} {len(content) / 1024:8.0f}KB '
+                    f'{validator_name:<14} '
+                    f'best {min(timings):8.3f}ms '
+                    f'mean {sum(timings) / len(timings):8.3f}ms'
+                )
@@ -0,0 +1,113 @@
+import datetime
+import random
+from django.contrib.auth.models import User
+from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from captured_drf_api.benchmarks import measure
+from captured_drf_api.humanize import naturaltimes
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from profiles.models import Profile
+
+
+class NaturaltimeCommentSerializer(CommentSerializer):
+    """
+    Comment serializer calling naturaltime for every
+    timestamp, as before NaturalTimeField.
+    """
+    created_at = serializers.SerializerMethodField()
+    updated_at = serializers.SerializerMethodField()
+
+    def get_created_at(self, obj):
+        return naturaltime(obj.created_at)
+
+    def get_updated_at(self, obj):
+        return naturaltime(obj.updated_at)
+
+
+class Command(BaseCommand):
+    """
+    Compares per row naturaltime calls with the request scoped
+    RelativeTimeFormatter and with ISO timestamps, on in-memory
+    comments spread over the last year.
+    """
+    help = 'Benchmarks the rendering of comment timestamps.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def build_comments(self, rows):
+        """
+        Returns unsaved comments created at random times in the last year.
+        """
+        rng = random.Random(0)
+        now = timezone.now()
+        owner = User(id=1, username='author')
+        owner.profile = Profile(id=1, owner=owner, image='images/author')
+        comments = []
+        for number in range(rows):
+            created_at = now - datetime.timedelta(
+                seconds=rng.randint(0, 365 * 24 * 60 * 60)
+            )
+            comments.append(Comment(
+                id=number + 1,
+                owner=owner,
+                photo_id=1,
+                content='comment',
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        return comments
+
+    def serialize(self, serializer_class, comments, query=None):
+        """
+        Returns a function serializing the comments for a
+        request with the given query parameters.
+        """
+        request = Request(APIRequestFactory().get('/comments/', query))
+
+        def run():
+            serializer_class(
+                comments, many=True, context={'request': request}
+            ).data
+        return run
+
+    def report(self, name, timings):
+        """
+        Writes the best and mean timings of a case.
+        """
+        self.stdout.write(
+            f'{name:<26} '
+            f'best {min(timings):8.2f}ms '
+            f'mean {sum(timings) / len(timings):8.2f}ms'
+        )
+
+    def handle(self, *args, **options):
+        comments = self.build_comments(options['rows'])
+        timestamps = [comment.created_at for comment in comments] * 2
+        self.stdout.write(
+            f'Rendering {len(timestamps)} timestamps of '
+            f'{len(comments)} comments, {options["repeat"]} times:'
+        )
+        self.report('naturaltime', measure(
+            lambda: [naturaltime(value) for value in timestamps],
+            options['repeat'],
+        ))
+        self.report('naturaltimes', measure(
+            lambda: naturaltimes(timestamps), options['repeat'],
+        ))
+        cases = [
+            ('serializer, naturaltime', NaturaltimeCommentSerializer, None),
+            ('serializer, formatter', CommentSerializer, None),
+            ('serializer, iso', CommentSerializer, {'timestamps': 'iso'}),
+        ]
+        for name, serializer_class, query in cases:
+            self.report(name, measure(
+                self.serialize(serializer_class, comments, query),
+                options['repeat'],
+            ))
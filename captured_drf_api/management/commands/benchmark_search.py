@@ -0,0 +1,90 @@
+import random
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from captured_drf_api.benchmarks import measure, scratch_database
+from captured_drf_api.search import FullTextSearchFilter, rebuild_search_index
+from photos.models import Photo
+from photos.views import PhotoList
+
+WORDS = [
+    'sunset', 'harbour', 'mountain', 'street', 'portrait', 'city', 'river',
+    'forest', 'night', 'winter', 'summer', 'bridge', 'market', 'coast',
+    'desert', 'lake', 'garden', 'train', 'festival', 'storm',
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the icontains SearchFilter with the full text search
+    filter on synthetic photos in a scratch database.
+    """
+    help = 'Benchmarks photo search on synthetic data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--photos', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def seed(self, count):
+        """
+        Creates the given number of photos with random titles.
+        """
+        rng = random.Random(0)
+        User.objects.bulk_create([
+            User(username=f'photographer{number}') for number in range(100)
+        ])
+        owners = list(User.objects.filter(username__startswith='photographer'))
+        batch = []
+        for number in range(count):
+            owner = owners[number % len(owners)]
+            title = ' '.join(rng.sample(WORDS, 3))
+            if number % 10_000 == 0:
+                title = f'{title} aurora'
+            batch.append(Photo(
+                owner=owner,
+                title=title,
+                search_document=f'{owner.username} {title}',
+            ))
+            if len(batch) == 10_000:
+                Photo.objects.bulk_create(batch)
+                batch = []
+        Photo.objects.bulk_create(batch)
+        rebuild_search_index(Photo)
+
+    def search(self, search_filter, query):
+        """
+        Returns a function running the count and first page
+        queries of a photo list search, as the paginator does.
+        """
+        request = Request(APIRequestFactory().get('/photos/', {
+            'search': query
+        }))
+        view = PhotoList()
+        queryset = Photo.objects.order_by('-created_at')
+
+        def run():
+            results = search_filter.filter_queryset(request, queryset, view)
+            results.count()
+            list(results[:10])
+        return run
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            self.stdout.write(f'Seeding {options["photos"]} photos...')
+            self.seed(options['photos'])
+            queries = ['aurora', 'harb', 'mountain storm', 'photographer7']
+            for query in queries:
+                for search_filter in (
+                    filters.SearchFilter(), FullTextSearchFilter()
+                ):
+                    timings = measure(
+                        self.search(search_filter, query), options['repeat']
+                    )
+                    self.stdout.write(
+                        f'{search_filter.__class__.__name__:<22} '
+                        f'{query!r:<18} '
+                        f'best {min(timings):8.2f}ms '
+                        f'mean {sum(timings) / len(timings):8.2f}ms'
+                    )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from captured_drf_api.counters import (
+    refresh_photo_counters, refresh_profile_counters, refresh_tour_counters,
+)
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the stored like, comment, attendance, photo
+    and follower counters from the underlying rows.
+    """
+    help = 'Rebuilds the stored counter columns from scratch.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            photos = refresh_photo_counters()
+            tours = refresh_tour_counters()
+            profiles = refresh_profile_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt counters for {photos} photos, {tours} tours '
+            f'and {profiles} profiles.'
+        ))
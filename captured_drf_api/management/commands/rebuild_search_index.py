@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from captured_drf_api.search import rebuild_search_index
+from photos.models import Photo
+from tours.models import Tour
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full text search documents and index
+    of photos and tours.
+    """
+    help = 'Rebuilds the full text search index of photos and tours.'
+
+    def handle(self, *args, **options):
+        for model in (Photo, Tour):
+            with transaction.atomic():
+                rebuild_search_index(model)
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt the search index of {model._meta.verbose_name}s.'
+            ))
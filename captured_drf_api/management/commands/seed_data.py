@@ -0,0 +1,75 @@
+import secrets
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from captured_drf_api.seeding import seed
+
+
+def add_seed_arguments(parser):
+    """
+    Adds the data volume arguments shared by the seeding
+    and benchmarking commands.
+    """
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument(
+        '--follows', type=int, default=20,
+        help='Average number of users each user follows.',
+    )
+    parser.add_argument('--photos', type=int, default=5000)
+    parser.add_argument('--likes', type=int, default=20000)
+    parser.add_argument('--comments', type=int, default=10000)
+    parser.add_argument('--tours', type=int, default=200)
+    parser.add_argument('--attendances', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def seed_from_options(options, password=None, log=None):
+    """
+    Seeds the database with the volumes given on the command line,
+    giving every user the password.
+    """
+    return seed(
+        users=options['users'],
+        follows=options['follows'],
+        photos=options['photos'],
+        likes=options['likes'],
+        comments=options['comments'],
+        tours=options['tours'],
+        attendances=options['attendances'],
+        random_seed=options['seed'],
+        password=password,
+        log=log,
+    )
+
+
+class Command(BaseCommand):
+    """
+    Fills the database with synthetic users, follows, photos,
+    likes, comments, tours and attendances. Refuses to run unless
+    DEBUG is on or --force is given, as the seeded users can log in
+    with a password generated for the run and printed once.
+    """
+    help = 'Seeds the database with realistic synthetic data volumes.'
+
+    def add_arguments(self, parser):
+        add_seed_arguments(parser)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Seed the database even when DEBUG is off.',
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['force']):
+            raise CommandError(
+                'Refusing to seed a database with DEBUG off, '
+                'pass --force to seed it anyway.'
+            )
+        password = secrets.token_urlsafe(16)
+        with transaction.atomic():
+            user_ids = seed_from_options(
+                options, password=password, log=self.stdout.write
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(user_ids)} users with the password '
+            f'{password!r}.'
+        ))
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from attendances.models import Attendance
+from followers.models import Follower
+from likes.models import Like
+from profiles.models import Profile
+
+# The model and id column of every membership set, by name. The
+# version of each set is stored in the <name>_version column of the
+# owner's profile, so every worker agrees on it.
+MEMBERSHIPS = {
+    'likes': (Like, 'photo_id'),
+    'follows': (Follower, 'followed_id'),
+    'attendances': (Attendance, 'tour_id'),
+}
+
+
+def membership_version_key(user_id, name):
+    """
+    Returns the prefix of the cache keys holding a user's membership set.
+    """
+    return f'api-memberships:{name}:{user_id}'
+
+
+def get_membership_versions(user_id):
+    """
+    Returns the versions of the user's membership sets, by name.
+    """
+    versions = Profile.objects.filter(owner_id=user_id).values_list(
+        *[f'{name}_version' for name in MEMBERSHIPS]
+    ).first() or [0] * len(MEMBERSHIPS)
+    return dict(zip(MEMBERSHIPS, (str(version) for version in versions)))
+
+
+def bump_memberships(name, user_ids):
+    """
+    Marks the membership set of the given users as changed,
+    in the transaction changing it.
+    """
+    field = f'{name}_version'
+    Profile.objects.filter(owner_id__in=user_ids).update(
+        **{field: F(field) + 1}
+    )
+
+
+def get_membership_ids(user_id, name, version):
+    """
+    Returns the sorted ids in a user's membership set, cached under
+    its version when the response cache is enabled, so unchanged sets
+    are read from the cache instead of the database.
+    """
+    key = f'{membership_version_key(user_id, name)}:{version}'
+    ids = cache.get(key) if settings.API_CACHE_TIMEOUT else None
+    if ids is None:
+        model, field = MEMBERSHIPS[name]
+        ids = list(model.objects.filter(
+            owner_id=user_id
+        ).order_by(field).values_list(field, flat=True))
+        if settings.API_CACHE_TIMEOUT:
+            cache.set(key, ids, settings.API_CACHE_TIMEOUT)
+    return ids
+
+
+def bump_owner_memberships(sender, instance, **kwargs):
+    """
+    Marks the owner's membership set of the saved
+    or deleted like, follower or attendance as changed.
+    """
+    for name, (model, field) in MEMBERSHIPS.items():
+        if model is sender:
+            bump_memberships(name, [instance.owner_id])
+
+
+def connect_membership_signals():
+    """
+    Connects bump_owner_memberships to the saving
+    and deletion of the membership models.
+    """
+    for model, field in MEMBERSHIPS.values():
+        post_save.connect(bump_owner_memberships, sender=model)
+        post_delete.connect(bump_owner_memberships, sender=model)
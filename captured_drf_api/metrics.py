@@ -0,0 +1,203 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+# The metrics of the request being handled, None when not recording
+current_metrics = ContextVar('current_metrics', default=None)
+
+SECONDS_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class RequestMetrics:
+    """
+    Accumulates the query count, query time and serializer
+    time of a single request.
+    """
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper timing every query of the request.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def time_serialization(to_representation, instance):
+    """
+    Returns to_representation(instance), adding the time it took to
+    the current request's serializer time. Nested and listed
+    serializers are only timed once, by the outermost call.
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.serializing:
+        return to_representation(instance)
+    metrics.serializing = True
+    start = time.perf_counter()
+    try:
+        return to_representation(instance)
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics.serializing = False
+
+
+class Histogram:
+    """
+    Cumulative histogram of observations with fixed bucket bounds.
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Adds an observation to the histogram.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, endpoint):
+        """
+        Returns the histogram's lines in Prometheus text format.
+        """
+        lines = []
+        cumulative = 0
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        for bound, count in zip(bounds, self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} '
+                f'{cumulative}'
+            )
+        lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {self.sum}')
+        lines.append(f'{name}_count{{endpoint="{endpoint}"}} {self.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process histograms of the recorded requests, per endpoint.
+    """
+    metrics = {
+        'api_request_duration_seconds': (
+            'Total time spent handling the request.', SECONDS_BUCKETS
+        ),
+        'api_db_queries': (
+            'Number of database queries run by the request.',
+            QUERY_COUNT_BUCKETS,
+        ),
+        'api_db_duration_seconds': (
+            'Time spent in database queries.', SECONDS_BUCKETS
+        ),
+        'api_serializer_duration_seconds': (
+            'Time spent serializing the response data.', SECONDS_BUCKETS
+        ),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in self.metrics}
+
+    def observe(self, endpoint, values):
+        """
+        Adds the values, keyed by metric name, to the
+        histograms of the endpoint.
+        """
+        with self.lock:
+            for name, value in values.items():
+                histograms = self.histograms[name]
+                if endpoint not in histograms:
+                    histograms[endpoint] = Histogram(self.metrics[name][1])
+                histograms[endpoint].observe(value)
+
+    def clear(self):
+        """
+        Drops every recorded observation.
+        """
+        with self.lock:
+            self.histograms = {name: {} for name in self.metrics}
+
+    def render(self):
+        """
+        Returns all histograms in Prometheus text exposition format.
+        """
+        lines = []
+        with self.lock:
+            for name, (description, buckets) in self.metrics.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for endpoint, histogram in sorted(
+                    self.histograms[name].items()
+                ):
+                    lines.extend(histogram.render(name, endpoint))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def get_endpoint(request):
+    """
+    Returns the label of the endpoint that handled the request,
+    its URL name or else its route.
+    """
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.route
+
+
+class MetricsMiddleware:
+    """
+    Records the query count, query time, serializer time and total
+    time of every request into the registry's histograms, and sends
+    them as a Server-Timing header when DEBUG is on. The middleware
+    removes itself from the stack when API_METRICS is off.
+    """
+    def __init__(self, get_response):
+        if not settings.API_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics.record_query):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        total = time.perf_counter() - start
+        registry.observe(get_endpoint(request), {
+            'api_request_duration_seconds': total,
+            'api_db_queries': metrics.queries,
+            'api_db_duration_seconds': metrics.db_time,
+            'api_serializer_duration_seconds': metrics.serializer_time,
+        })
+        if settings.DEBUG:
+            response['Server-Timing'] = ', '.join([
+                f'db;desc="{metrics.queries} queries";'
+                f'dur={metrics.db_time * 1000:.1f}',
+                f'serializer;dur={metrics.serializer_time * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+        return response
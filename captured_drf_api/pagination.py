@@ -0,0 +1,73 @@
+from django.conf import settings
+from rest_framework import pagination
+from rest_framework.settings import api_settings
+
+
+class CreatedAtCursorPagination(pagination.CursorPagination):
+    """
+    Keyset pagination on (-created_at, -id), so every page costs
+    the same regardless of how deep the client has scrolled.
+    """
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Uses the ordering requested through the view's OrderingFilter
+        when it is valid, falling back to the default keyset ordering
+        for invalid fields, orderings across relations and views
+        without an OrderingFilter.
+        """
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            for backend in getattr(view, 'filter_backends', []):
+                if not hasattr(backend, 'get_ordering'):
+                    continue
+                ordering = backend().get_ordering(request, queryset, view)
+                if isinstance(ordering, str):
+                    ordering = (ordering,)
+                if ordering and '__' not in ordering[0]:
+                    return tuple(ordering) + ('-id',)
+                break
+        return self.ordering
+
+
+class PageOrCursorPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination with an opt-in cursor mode, selected by
+    ?pagination=cursor, by sending a cursor, or by setting
+    PAGINATION_MODE to 'cursor'. Cursor mode skips the COUNT query
+    and the OFFSET, but omits the count from the response.
+    """
+    mode_query_param = 'pagination'
+    cursor_pagination_class = CreatedAtCursorPagination
+
+    def use_cursor(self, request):
+        """
+        Returns true if the request should be paginated by cursor.
+        """
+        mode = request.query_params.get(self.mode_query_param)
+        if mode is None:
+            if self.cursor_pagination_class.cursor_query_param in (
+                request.query_params
+            ):
+                return True
+            mode = getattr(settings, 'PAGINATION_MODE', 'page')
+        return mode == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
@@ -0,0 +1,195 @@
+import re
+from django.db import connection
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def get_index_table(model):
+    """
+    Returns the name of the SQLite FTS5 table indexing the model.
+    """
+    return f'{model._meta.db_table}_fts'
+
+
+def create_search_index(schema_editor, model):
+    """
+    Creates the full text index of a model with a search_document
+    column, for use in migrations. On PostgreSQL this is a generated
+    tsvector column with a GIN index, on SQLite an FTS5 table.
+    """
+    table = model._meta.db_table
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+            f"GENERATED ALWAYS AS (to_tsvector('simple', search_document)) "
+            f'STORED'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {table}_search_idx '
+            f'ON {table} USING gin (search_vector)'
+        )
+    elif schema_editor.connection.vendor == 'sqlite':
+        index_table = get_index_table(model)
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {index_table} USING fts5('
+            f"search_document, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'INSERT INTO {index_table} (rowid, search_document) '
+            f'SELECT id, search_document FROM {table}'
+        )
+
+
+def drop_search_index(schema_editor, model):
+    """
+    Drops the full text index created by create_search_index.
+    """
+    table = model._meta.db_table
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'ALTER TABLE {table} DROP COLUMN search_vector'
+        )
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {get_index_table(model)}')
+
+
+def update_search_index(sender, instance, **kwargs):
+    """
+    Writes the instance's search document to the SQLite FTS5 index
+    upon saving. PostgreSQL keeps its generated column up to date.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    index_table = get_index_table(sender)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {index_table} WHERE rowid = %s', [instance.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {index_table} (rowid, search_document) '
+            f'VALUES (%s, %s)',
+            [instance.pk, instance.search_document],
+        )
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Removes the instance from the SQLite FTS5 index upon deletion.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {get_index_table(sender)} WHERE rowid = %s',
+            [instance.pk],
+        )
+
+
+def refresh_search_index(queryset):
+    """
+    Rewrites the SQLite FTS5 index entries of the queryset's rows
+    from their stored search documents, for search documents
+    changed by QuerySet.update().
+    """
+    if connection.vendor != 'sqlite':
+        return
+    model = queryset.model
+    index_table = get_index_table(model)
+    pks, params = queryset.values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {index_table} WHERE rowid IN ({pks})', params
+        )
+        cursor.execute(
+            f'INSERT INTO {index_table} (rowid, search_document) '
+            f'SELECT id, search_document FROM {model._meta.db_table} '
+            f'WHERE id IN ({pks})',
+            params,
+        )
+
+
+def rebuild_search_index(model):
+    """
+    Recomputes the search document of every instance of the model
+    and repopulates the SQLite FTS5 index from them.
+    """
+    instances = model.objects.all()
+    if hasattr(model, 'owner'):
+        instances = instances.select_related('owner')
+    batch = []
+    for instance in instances.iterator():
+        instance.search_document = instance.get_search_document()
+        batch.append(instance)
+        if len(batch) == 1000:
+            model.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    model.objects.bulk_update(batch, ['search_document'])
+    if connection.vendor == 'sqlite':
+        index_table = get_index_table(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {index_table}')
+            cursor.execute(
+                f'INSERT INTO {index_table} (rowid, search_document) '
+                f'SELECT id, search_document FROM {model._meta.db_table}'
+            )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter that matches the ?search=
+    terms as word prefixes, not substrings, against the model's precomputed full text
+    index and ranks the results, unless the client asked for another
+    ordering. Databases without a full text index fall back to
+    the icontains lookups of SearchFilter.
+    """
+
+    def get_search_tokens(self, request):
+        """
+        Returns the words of the search terms, dropping any
+        characters that have a meaning in full text query syntax.
+        """
+        return [
+            token.lower()
+            for term in self.get_search_terms(request)
+            for token in TOKEN_PATTERN.findall(term)
+        ]
+
+    def filter_queryset(self, request, queryset, view):
+        tokens = self.get_search_tokens(request)
+        if not tokens:
+            return super().filter_queryset(request, queryset, view)
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            query = ' & '.join(f'{token}:*' for token in tokens)
+            queryset = queryset.extra(
+                select={'search_rank': (
+                    f'ts_rank({table}.search_vector, '
+                    f"to_tsquery('simple', %s))"
+                )},
+                select_params=[query],
+                where=[
+                    f"{table}.search_vector @@ to_tsquery('simple', %s)"
+                ],
+                params=[query],
+            )
+            rank = '-search_rank'
+        elif connection.vendor == 'sqlite':
+            index_table = get_index_table(queryset.model)
+            query = ' '.join(f'"{token}"*' for token in tokens)
+            queryset = queryset.extra(
+                select={'search_rank': f'{index_table}.rank'},
+                tables=[index_table],
+                where=[
+                    f'{index_table}.rowid = {table}.id',
+                    f'{index_table} MATCH %s',
+                ],
+                params=[query],
+            )
+            rank = 'search_rank'
+        else:
+            return super().filter_queryset(request, queryset, view)
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        return queryset.order_by(rank, *queryset.query.order_by)
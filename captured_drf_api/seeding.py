@@ -0,0 +1,203 @@
+import datetime
+import random
+from itertools import accumulate
+from io import StringIO
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from attendances.models import Attendance
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from photos.models import Photo
+from profiles.models import Profile
+from tours.models import Tour
+from . import clock
+from .counters import (
+    refresh_photo_counters, refresh_profile_counters, refresh_tour_counters,
+)
+from .search import rebuild_search_index
+
+USERNAME_PREFIX = 'seeduser'
+WORDS = [
+    'sunset', 'harbour', 'mountain', 'street', 'portrait', 'city', 'river',
+    'forest', 'night', 'winter', 'summer', 'bridge', 'market', 'coast',
+    'desert', 'lake', 'garden', 'train', 'festival', 'storm',
+]
+PLACES = [
+    ('England', 'London'), ('England', 'York'), ('France', 'Paris'),
+    ('France', 'Lyon'), ('Italy', 'Rome'), ('Italy', 'Venice'),
+    ('Spain', 'Seville'), ('Japan', 'Kyoto'), ('Iceland', 'Reykjavik'),
+    ('Norway', 'Bergen'),
+]
+BATCH_SIZE = 5000
+
+
+def power_law_weights(count, exponent):
+    """
+    Returns cumulative Zipf-like weights for count items, so that the
+    item at rank r is picked in proportion to 1 / r ** exponent.
+    """
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, count + 1)
+    ))
+
+
+def sample_pairs(rng, owner_ids, target_ids, cum_weights, total):
+    """
+    Returns up to total distinct (owner_id, target_id) pairs, with owners
+    picked uniformly and targets picked by their cumulative weights.
+    """
+    pairs = set()
+    for _ in range(3):
+        missing = total - len(pairs)
+        if not missing:
+            break
+        pairs.update(zip(
+            rng.choices(owner_ids, k=missing),
+            rng.choices(target_ids, cum_weights=cum_weights, k=missing),
+        ))
+    return pairs
+
+
+def bulk_create(model, objects):
+    """
+    Inserts the objects in batches without sending signals.
+    """
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def seed(
+    users=1000, follows=20, photos=5000, likes=20000, comments=10000,
+    tours=200, attendances=2000, exponent=1.1, random_seed=0,
+    password=None, log=None,
+):
+    """
+    Fills the database with synthetic users, follower graph, photos,
+    likes, comments, tours and attendances using bulk_create.
+
+    Popularity follows a power law: the follower in-degree and the
+    number of photos, likes and comments per user or photo are drawn
+    from Zipf-like weights, and follows per user average `follows`
+    with a heavy tail. Counters, search indexes and home feeds are
+    rebuilt afterwards, since bulk_create skips the signals
+    maintaining them, and trending scores are computed. Every
+    user's password is the given password, or unusable without one.
+    """
+    rng = random.Random(random_seed)
+    log = log or (lambda message: None)
+
+    log(f'Creating {users} users...')
+    password = make_password(password)
+    start = User.objects.filter(
+        username__startswith=USERNAME_PREFIX
+    ).count()
+    bulk_create(User, [
+        User(username=f'{USERNAME_PREFIX}{number}', password=password)
+        for number in range(start, start + users)
+    ])
+    user_ids = list(User.objects.filter(
+        username__startswith=USERNAME_PREFIX
+    ).order_by('id').values_list('id', flat=True))[start:]
+    bulk_create(Profile, [
+        Profile(owner_id=user_id, name=f'{USERNAME_PREFIX}{user_id}')
+        for user_id in user_ids
+    ])
+    staff_user = User.objects.get(id=user_ids[0])
+    staff_user.is_staff = True
+    staff_user.save()
+    popular_ids = user_ids[:]
+    rng.shuffle(popular_ids)
+    user_weights = power_law_weights(len(popular_ids), exponent)
+
+    log('Creating the follower graph...')
+    pairs = set()
+    for owner_id in user_ids:
+        degree = min(
+            int(rng.paretovariate(2) * follows / 2), len(user_ids) - 1
+        )
+        for followed_id in rng.choices(
+            popular_ids, cum_weights=user_weights, k=degree
+        ):
+            if followed_id != owner_id:
+                pairs.add((owner_id, followed_id))
+    bulk_create(Follower, [
+        Follower(owner_id=owner_id, followed_id=followed_id)
+        for owner_id, followed_id in pairs
+    ])
+
+    log(f'Creating {photos} photos...')
+    bulk_create(Photo, [
+        Photo(
+            owner_id=owner_id,
+            title=' '.join(rng.sample(WORDS, 3)),
+            description=' '.join(rng.sample(WORDS, 8)),
+        )
+        for owner_id in rng.choices(
+            popular_ids, cum_weights=user_weights, k=photos
+        )
+    ])
+    photo_ids = list(Photo.objects.filter(
+        owner__in=user_ids
+    ).values_list('id', flat=True))
+    rng.shuffle(photo_ids)
+    photo_weights = power_law_weights(len(photo_ids), exponent)
+
+    log(f'Creating {likes} likes and {comments} comments...')
+    bulk_create(Like, [
+        Like(owner_id=owner_id, photo_id=photo_id)
+        for owner_id, photo_id in sample_pairs(
+            rng, user_ids, photo_ids, photo_weights, likes
+        )
+    ])
+    bulk_create(Comment, [
+        Comment(
+            owner_id=rng.choice(user_ids),
+            photo_id=photo_id,
+            content=' '.join(rng.sample(WORDS, 6)),
+        )
+        for photo_id in rng.choices(
+            photo_ids, cum_weights=photo_weights, k=comments
+        )
+    ])
+
+    log(f'Creating {tours} tours and {attendances} attendances...')
+    today = clock.today()
+    tour_objects = []
+    for _ in range(tours):
+        country, city = rng.choice(PLACES)
+        start_date = today + datetime.timedelta(days=rng.randint(-60, 365))
+        tour_objects.append(Tour(
+            owner=staff_user,
+            title=f'{city} {" ".join(rng.sample(WORDS, 2))} tour',
+            country=country,
+            city=city,
+            start_date=start_date,
+            end_date=start_date + datetime.timedelta(
+                days=rng.randint(1, 14)
+            ),
+            booking_means='book online',
+        ))
+    bulk_create(Tour, tour_objects)
+    tour_ids = list(Tour.objects.filter(
+        owner=staff_user
+    ).values_list('id', flat=True))
+    bulk_create(Attendance, [
+        Attendance(owner_id=owner_id, tour_id=tour_id)
+        for owner_id, tour_id in sample_pairs(
+            rng, user_ids, tour_ids,
+            power_law_weights(len(tour_ids), exponent), attendances,
+        )
+    ])
+
+    log('Rebuilding counters, search indexes, feeds, trending scores '
+        'and suggestions...')
+    refresh_photo_counters()
+    refresh_tour_counters()
+    refresh_profile_counters()
+    rebuild_search_index(Photo)
+    rebuild_search_index(Tour)
+    call_command('rebuild_feeds', stdout=StringIO())
+    call_command('refresh_trending', '--full', stdout=StringIO())
+    call_command('rebuild_suggestions', stdout=StringIO())
+    return user_ids
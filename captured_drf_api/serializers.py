@@ -1,5 +1,23 @@
 from dj_rest_auth.serializers import UserDetailsSerializer
+from django.db import models
 from rest_framework import serializers
+from .fields import CachedImageField, ImageURLField
+from .metrics import time_serialization
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def get_requested_fields(request):
+    """
+    Returns the set of field names a read request asked for with
+    ?fields=id,image,... or None when every field should be sent.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
 
 
 class CurrentUserSerializer(UserDetailsSerializer):
@@ -7,7 +25,7 @@ class CurrentUserSerializer(UserDetailsSerializer):
     Serializes current user data.
     """
     profile_id = serializers.ReadOnlyField(source='profile.id')
-    profile_image = serializers.ReadOnlyField(source='profile.image.url')
+    profile_image = ImageURLField(source='profile.image')
     is_admin_user = serializers.SerializerMethodField()
 
     class Meta(UserDetailsSerializer.Meta):
@@ -20,3 +38,40 @@ class CurrentUserSerializer(UserDetailsSerializer):
         Returns true if the user is a admin/staff user
         """
         return obj.is_staff
+
+
+class BaseModelSerializer(serializers.ModelSerializer):
+    """
+    Base serializer of the API's models, adding the time spent
+    serializing to the request's metrics when they are recorded.
+    Read requests may pick a sparse fieldset with ?fields=, in which
+    case the other fields, method fields included, are never computed.
+    Image fields build their URLs with the memoized storage_url.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: CachedImageField,
+    }
+
+    def get_fields(self):
+        """
+        Returns the serializer fields, limited to the requested ones.
+        """
+        fields = super().get_fields()
+        requested = get_requested_fields(self.context.get('request'))
+        if requested is None:
+            return fields
+        unknown = requested - set(fields)
+        if unknown:
+            raise serializers.ValidationError({
+                FIELDS_QUERY_PARAM: [
+                    f'Unknown field: {name}.' for name in sorted(unknown)
+                ]
+            })
+        return {
+            name: field for name, field in fields.items()
+            if name in requested
+        }
+
+    def to_representation(self, instance):
+        return time_serialization(super().to_representation, instance)
@@ -34,11 +34,36 @@ REST_FRAMEWORK = {
         else 'dj_rest_auth.jwt_auth.JWTCookieAuthentication'
     )],
     'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.PageNumberPagination',
+        'captured_drf_api.pagination.PageOrCursorPagination',
     'PAGE_SIZE': 10,
     'DATETIME_FORMAT': '%d %b %Y',
 }
 
+# 'page' or 'cursor', the default mode of PageOrCursorPagination
+PAGINATION_MODE = os.environ.get('PAGINATION_MODE', 'page')
+
+# Record per endpoint query and timing histograms, served at /metrics/
+API_METRICS = 'API_METRICS' in os.environ
+
+# Callable, or dotted path to one, returning the current time of the API
+API_CLOCK = 'django.utils.timezone.now'
+
+# Photos of users with more followers than this are read into
+# home feeds at request time instead of being written to them
+FEED_FANOUT_LIMIT = int(os.environ.get('FEED_FANOUT_LIMIT', 1000))
+# The number of recent photos written to a feed upon following a user
+FEED_BACKFILL_LIMIT = 100
+
+# Trending photo scores halve every TRENDING_HALF_LIFE_HOURS
+TRENDING_HALF_LIFE_HOURS = float(
+    os.environ.get('TRENDING_HALF_LIFE_HOURS', 24)
+)
+TRENDING_LIKE_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 2
+
+# The number of accounts suggested to each user to follow
+SUGGESTIONS_PER_USER = 20
+
 if 'DEV' not in os.environ:
     REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
         'rest_framework.renderers.JSONRenderer',
@@ -93,10 +118,15 @@ INSTALLED_APPS = [
     'followers',
     'tours',
     'attendances',
+    'feeds',
+    'trending',
+    'suggestions',
+    'captured_drf_api',
 ]
 
 SITE_ID = 1
 MIDDLEWARE = [
+    'captured_drf_api.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -158,6 +188,43 @@ else:
         'default': dj_database_url.parse(os.environ.get("DATABASE_URL"))
     }
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# The response cache must be shared by every gunicorn worker, or
+# invalidating it in one worker leaves the others serving stale
+# responses. CACHE_TABLE selects the database cache, shared by every
+# worker and dyno, and CACHE_LOCATION a file cache, shared by the
+# workers of one machine. Without either, each worker has its own
+# local memory cache and API responses aren't cached by default.
+if 'CACHE_TABLE' in os.environ:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.environ.get('CACHE_TABLE'),
+        }
+    }
+elif 'CACHE_LOCATION' in os.environ:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+SHARED_CACHE = 'CACHE_TABLE' in os.environ or 'CACHE_LOCATION' in os.environ
+
+# Seconds anonymous GET responses are cached for, 0 disables the cache
+API_CACHE_TIMEOUT = int(os.environ.get(
+    'API_CACHE_TIMEOUT',
+    300 if SHARED_CACHE and 'DEV' not in os.environ else 0
+))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
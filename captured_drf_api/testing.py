@@ -0,0 +1,72 @@
+import datetime
+from contextlib import contextmanager
+from unittest import mock
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .pagination import CreatedAtCursorPagination, PageOrCursorPagination
+
+
+def fixed_clock(value):
+    """
+    Returns an API_CLOCK for override_settings that always reads
+    the given ISO date, at midnight, or datetime.
+    """
+    moment = parse_datetime(value) or datetime.datetime.combine(
+        parse_date(value), datetime.time()
+    )
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return lambda: moment
+
+
+@contextmanager
+def page_size(size):
+    """
+    Runs the block with list pages of the given size
+    in both pagination modes.
+    """
+    with mock.patch.object(PageOrCursorPagination, 'page_size', size), \
+            mock.patch.object(CreatedAtCursorPagination, 'page_size', size):
+        yield
+
+
+class QueryBudgetMixin:
+    """
+    Test case mixin asserting how many queries a request may run.
+
+    assertListQueryBudget fills a list endpoint with each of row_counts
+    rows, one page of that size each, and fails when any of them runs
+    more or fewer queries than budgeted, so a query per row fails the
+    build. The budget is either one number for every page size or a
+    dict of budgets by row count.
+    """
+    row_counts = (1, 100)
+
+    def assertQueryBudget(self, url, budget):
+        """
+        Asserts a GET of the url succeeds with exactly budget queries
+        and returns the response.
+        """
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertListQueryBudget(self, url, budget, create_rows, existing=0):
+        """
+        Asserts the list at url stays within budget at every row count,
+        calling create_rows(count) to add the rows missing for the next
+        row count. existing is the number of rows the list already
+        shows before the first call.
+        """
+        rows = existing
+        for row_count in self.row_counts:
+            create_rows(row_count - rows)
+            rows = row_count
+            if isinstance(budget, dict):
+                row_budget = budget[row_count]
+            else:
+                row_budget = budget
+            with page_size(row_count), self.subTest(rows=row_count):
+                response = self.assertQueryBudget(url, row_budget)
+                self.assertEqual(len(response.data['results']), row_count)
@@ -0,0 +1,950 @@
+from io import BytesIO, StringIO
+from PIL import Image
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import get_storage_class
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from unittest import mock
+from rest_framework.test import APITestCase
+from attendances.views import AttendanceList
+from comments.models import Comment
+from comments.views import CommentList
+from .benchmarks import compare_to_baseline
+from .checks import check_response_cache
+from .fields import storage_url
+from .images import IMAGE_MAX_SIZE
+from .metrics import registry
+from followers.models import Follower
+from followers.views import FollowerList
+from likes.models import Like
+from likes.views import LikeList
+from photos.models import Photo
+from photos.serializers import PhotoSerializer
+from photos.views import PhotoList
+from profiles.models import Profile
+from profiles.views import ProfileList
+from tours.models import Tour
+from tours.views import TourList
+
+
+class RebuildCountersCommandTests(APITestCase):
+    """
+    Tests the rebuild_counters management command.
+    """
+    def test_command_rebuilds_counters_from_rows(self):
+        """
+        Tests if counters that have drifted from the underlying
+        rows are rebuilt by the command.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        photo = Photo.objects.create(owner=user1, title='title 1')
+        Like.objects.create(owner=user2, photo=photo)
+        Follower.objects.create(owner=user2, followed=user1)
+        Photo.objects.update(likes_count=10, comments_count=5)
+        Profile.objects.update(
+            photos_count=7, followers_count=7, following_count=7
+        )
+
+        call_command('rebuild_counters', stdout=StringIO())
+
+        photo.refresh_from_db()
+        self.assertEqual(photo.likes_count, 1)
+        self.assertEqual(photo.comments_count, 0)
+        profile1 = Profile.objects.get(owner=user1)
+        profile2 = Profile.objects.get(owner=user2)
+        self.assertEqual(profile1.photos_count, 1)
+        self.assertEqual(profile1.followers_count, 1)
+        self.assertEqual(profile1.following_count, 0)
+        self.assertEqual(profile2.photos_count, 0)
+        self.assertEqual(profile2.following_count, 1)
+
+
+class PageOrCursorPaginationTests(APITestCase):
+    """
+    Tests the opt-in cursor mode of the default pagination class.
+    """
+    def setUp(self):
+        """
+        Sets up a user with fifteen photos.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        for number in range(15):
+            Photo.objects.create(owner=self.user1, title=f'title {number}')
+
+    def test_default_response_shape_is_unchanged(self):
+        """
+        Tests if page number pagination is used by default.
+        """
+        response = self.client.get('/photos/')
+        self.assertEqual(response.data['count'], 15)
+        self.assertIn('page=2', response.data['next'])
+
+    def test_cursor_mode_pages_through_all_rows(self):
+        """
+        Tests if cursor mode returns every row once, newest first,
+        without running a count query.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get('/photos/?pagination=cursor')
+        self.assertNotIn('count', response.data)
+        first_page = [photo['id'] for photo in response.data['results']]
+        response = self.client.get(response.data['next'])
+        second_page = [photo['id'] for photo in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        ids = first_page + second_page
+        self.assertEqual(
+            ids,
+            list(Photo.objects.order_by('-created_at', '-id')
+                 .values_list('id', flat=True))
+            )
+
+    @override_settings(PAGINATION_MODE='cursor')
+    def test_cursor_mode_can_be_selected_by_setting(self):
+        """
+        Tests if the PAGINATION_MODE setting selects cursor mode
+        and ?pagination=page selects page numbers again.
+        """
+        response = self.client.get('/photos/')
+        self.assertNotIn('count', response.data)
+        response = self.client.get('/photos/?pagination=page')
+        self.assertEqual(response.data['count'], 15)
+
+    def test_cursor_mode_follows_requested_ordering(self):
+        """
+        Tests if cursor mode keeps an ordering requested by the client.
+        """
+        liked = Photo.objects.order_by('created_at').first()
+        Like.objects.create(owner=self.user1, photo=liked)
+        response = self.client.get(
+            '/photos/?pagination=cursor&ordering=-likes_count'
+            )
+        self.assertEqual(response.data['results'][0]['id'], liked.id)
+
+    def test_cursor_mode_ignores_invalid_ordering(self):
+        """
+        Tests if cursor mode falls back to the newest first ordering
+        when the requested ordering is invalid, also when cursor mode
+        is selected by setting.
+        """
+        newest = Photo.objects.order_by('-created_at', '-id').first()
+        response = self.client.get(
+            '/photos/?pagination=cursor&ordering=bogus'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['id'], newest.id)
+        with override_settings(PAGINATION_MODE='cursor'):
+            for url in ['/profiles/', '/tours/', '/comments/']:
+                response = self.client.get(f'{url}?ordering=bogus')
+                self.assertEqual(response.status_code, 200)
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Tests the query shapes of the list views are served by indexes.
+    """
+    list_views = [
+        AttendanceList,
+        CommentList,
+        FollowerList,
+        LikeList,
+        PhotoList,
+        ProfileList,
+        TourList,
+    ]
+
+    def query_shapes(self, view):
+        """
+        Yields the querysets a list view builds from its default
+        ordering, filterset_fields and ordering_fields. Lookups that
+        span relationships are served by joins and are skipped.
+        """
+        queryset = view.queryset.all()
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        yield queryset.order_by(*ordering)
+        for field in getattr(view, 'filterset_fields', []):
+            if '__' not in field:
+                yield queryset.filter(**{field: 1}).order_by(*ordering)
+        for field in getattr(view, 'ordering_fields', []):
+            if '__' not in field:
+                yield queryset.order_by(f'-{field}')
+
+    def test_list_query_shapes_do_not_scan_tables(self):
+        """
+        Tests if no list view query shape falls back to a full
+        table scan or a temporary sort on SQLite.
+        """
+        for view in self.list_views:
+            for queryset in self.query_shapes(view):
+                table = queryset.model._meta.db_table
+                plan = queryset[:10].explain()
+                with self.subTest(view=view.__name__, query=str(
+                    queryset.query
+                )):
+                    self.assertNotRegex(
+                        plan, rf'SCAN (TABLE )?{table}\b(?! USING)'
+                        )
+                    self.assertNotIn('USE TEMP B-TREE', plan)
+
+
+class RebuildSearchIndexCommandTests(APITestCase):
+    """
+    Tests the rebuild_search_index management command.
+    """
+    def test_command_reindexes_renamed_owners(self):
+        """
+        Tests if photos are found by their owner's new username
+        after the index is rebuilt.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        photo = Photo.objects.create(owner=user1, title='title 1')
+        user1.username = 'renamed'
+        user1.save()
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        response = self.client.get('/photos/', {'search': 'renamed'})
+        self.assertEqual(response.data['results'][0]['id'], photo.id)
+
+
+@override_settings(API_CACHE_TIMEOUT=60)
+class ResponseCacheTests(APITestCase):
+    """
+    Tests the caching of anonymous GET responses.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.photo1 = Photo.objects.create(owner=self.user1, title='title 1')
+        self.photo2 = Photo.objects.create(owner=self.user1, title='title 2')
+
+    def test_anonymous_list_is_served_from_cache(self):
+        """
+        Tests if a repeated anonymous list request runs no queries,
+        and if a different query string is cached separately.
+        """
+        self.client.get('/photos/?ordering=-likes_count&search=title')
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                '/photos/?search=title&ordering=-likes_count'
+                )
+        self.assertEqual(response.data['count'], 2)
+        with self.assertNumQueries(2):
+            self.client.get('/photos/')
+
+    def test_saving_a_related_model_invalidates_list(self):
+        """
+        Tests if creating a like invalidates the cached photo list,
+        while saving an unrelated model leaves it cached.
+        """
+        self.client.get('/photos/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Tour.objects.create(
+                owner=self.user1, title='tour',
+                start_date='2024-11-11', end_date='2024-12-12'
+                )
+        with self.assertNumQueries(0):
+            self.client.get('/photos/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(owner=self.user2, photo=self.photo1)
+        response = self.client.get('/photos/')
+        likes_counts = [
+            photo['likes_count'] for photo in response.data['results']
+            ]
+        self.assertIn(1, likes_counts)
+
+    def test_object_change_only_invalidates_its_detail(self):
+        """
+        Tests if liking a photo invalidates the cached detail
+        of that photo but not the detail of another photo.
+        """
+        self.client.get(f'/photos/{self.photo1.id}/')
+        self.client.get(f'/photos/{self.photo2.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(owner=self.user2, photo=self.photo2)
+        with self.assertNumQueries(0):
+            self.client.get(f'/photos/{self.photo1.id}/')
+        response = self.client.get(f'/photos/{self.photo2.id}/')
+        self.assertEqual(response.data['likes_count'], 1)
+
+    def test_following_invalidates_profile_detail(self):
+        """
+        Tests if following a user invalidates the cached
+        detail of the followed user's profile.
+        """
+        profile = self.user1.profile
+        self.client.get(f'/profiles/{profile.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Follower.objects.create(owner=self.user2, followed=self.user1)
+        response = self.client.get(f'/profiles/{profile.id}/')
+        self.assertEqual(response.data['followers_count'], 1)
+
+    def test_following_leaves_photo_and_comment_details_cached(self):
+        """
+        Tests if following the owner of a photo leaves the cached
+        details of the photo and of its comments alone, while
+        editing the owner's profile invalidates them.
+        """
+        comment = Comment.objects.create(
+            owner=self.user1, photo=self.photo1, content='content'
+            )
+        self.client.get(f'/photos/{self.photo1.id}/')
+        self.client.get(f'/comments/{comment.id}/?timestamps=iso')
+        with self.captureOnCommitCallbacks(execute=True):
+            Follower.objects.create(owner=self.user2, followed=self.user1)
+        with self.assertNumQueries(0):
+            self.client.get(f'/photos/{self.photo1.id}/')
+            self.client.get(f'/comments/{comment.id}/?timestamps=iso')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.profile.save()
+        with self.assertNumQueries(1):
+            self.client.get(f'/photos/{self.photo1.id}/')
+        with self.assertNumQueries(1):
+            self.client.get(f'/comments/{comment.id}/?timestamps=iso')
+
+    def test_invalidation_waits_for_the_commit(self):
+        """
+        Tests if a change leaves the cached responses alone
+        until its transaction commits.
+        """
+        self.client.get(f'/photos/{self.photo1.id}/')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Like.objects.create(owner=self.user2, photo=self.photo1)
+        with self.assertNumQueries(0):
+            self.client.get(f'/photos/{self.photo1.id}/')
+        for callback in callbacks:
+            callback()
+        response = self.client.get(f'/photos/{self.photo1.id}/')
+        self.assertEqual(response.data['likes_count'], 1)
+
+    def test_authenticated_requests_are_not_cached(self):
+        """
+        Tests if responses to logged in users are neither
+        served from nor written to the cache.
+        """
+        self.client.get('/photos/')
+        self.client.force_login(self.user2)
+        with self.assertNumQueries(4):
+            self.client.get('/photos/')
+
+    def test_cached_response_answers_conditional_request(self):
+        """
+        Tests if a cached response keeps its ETag and answers a
+        matching If-None-Match with 304 without any query.
+        """
+        response = self.client.get(f'/photos/{self.photo1.id}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f'/photos/{self.photo1.id}/',
+                HTTP_IF_NONE_MATCH=response['ETag']
+                )
+        self.assertEqual(response.status_code, 304)
+
+    def test_renaming_a_user_invalidates_their_responses(self):
+        """
+        Tests if renaming a user invalidates the cached photo list,
+        photo detail and tour detail showing their username, while updating
+        their last login leaves the cache alone.
+        """
+        tour = Tour.objects.create(
+            owner=self.user1, title='tour',
+            start_date='2024-11-11', end_date='2024-12-12'
+            )
+        self.client.get('/photos/')
+        self.client.get(f'/photos/{self.photo1.id}/')
+        self.client.get(f'/tours/{tour.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            self.client.get('/photos/')
+        self.user1.username = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.save()
+        response = self.client.get('/photos/')
+        self.assertEqual(response.data['results'][0]['owner'], 'renamed')
+        response = self.client.get(f'/photos/{self.photo1.id}/')
+        self.assertEqual(response.data['owner'], 'renamed')
+        response = self.client.get(f'/tours/{tour.id}/')
+        self.assertEqual(response.data['owner'], 'renamed')
+
+    def test_relative_timestamps_are_not_cached(self):
+        """
+        Tests if comments rendered with relative times are not
+        cached, while comments with ISO timestamps are.
+        """
+        Comment.objects.create(
+            owner=self.user1, photo=self.photo1, content='content'
+            )
+        self.client.get('/comments/')
+        self.client.get('/comments/?timestamps=iso')
+        Comment.objects.update(content='edited')
+        response = self.client.get('/comments/')
+        self.assertEqual(response.data['results'][0]['content'], 'edited')
+        with self.assertNumQueries(0):
+            response = self.client.get('/comments/?timestamps=iso')
+        self.assertEqual(response.data['results'][0]['content'], 'content')
+
+    @override_settings(DEBUG=False)
+    def test_local_memory_cache_is_reported(self):
+        """
+        Tests if caching responses in local memory outside
+        DEBUG raises a system check warning.
+        """
+        self.assertEqual(
+            [warning.id for warning in check_response_cache(None)],
+            ['captured_drf_api.W001']
+            )
+        with override_settings(API_CACHE_TIMEOUT=0):
+            self.assertEqual(check_response_cache(None), [])
+
+
+class ConditionalGetTests(APITestCase):
+    """
+    Tests the ETag validators of the views.
+    """
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.photo = Photo.objects.create(owner=self.user1, title='title 1')
+
+    def test_detail_returns_not_modified_for_matching_etag(self):
+        """
+        Tests if a photo detail request with the ETag of the previous
+        response gets a 304 after a single validator query.
+        """
+        response = self.client.get(f'/photos/{self.photo.id}/')
+        self.assertIn('ETag', response)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/photos/{self.photo.id}/',
+                HTTP_IF_NONE_MATCH=response['ETag']
+                )
+        self.assertEqual(response.status_code, 304)
+
+    def test_counter_change_changes_detail_etag(self):
+        """
+        Tests if liking a photo changes its ETag although
+        the photo's updated_at stays the same.
+        """
+        etag = self.client.get(f'/photos/{self.photo.id}/')['ETag']
+        Like.objects.create(owner=self.user2, photo=self.photo)
+        response = self.client.get(
+            f'/photos/{self.photo.id}/', HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['likes_count'], 1)
+
+    def test_etag_varies_with_viewer(self):
+        """
+        Tests if a logged in user doesn't get a 304
+        for the ETag of an anonymous response.
+        """
+        etag = self.client.get(f'/photos/{self.photo.id}/')['ETag']
+        self.client.force_login(self.user2)
+        response = self.client.get(
+            f'/photos/{self.photo.id}/', HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_changes_when_rows_change(self):
+        """
+        Tests if the photo list answers with 304 until a photo
+        is added or liked.
+        """
+        etag = self.client.get('/photos/')['ETag']
+        response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Like.objects.create(owner=self.user2, photo=self.photo)
+        response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        Photo.objects.create(owner=self.user2, title='title 2')
+        response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_changes_when_likes_move_between_rows(self):
+        """
+        Tests if liking one photo and unliking another, which leaves
+        the sum of the likes counts the same, changes the list ETag.
+        """
+        other = Photo.objects.create(owner=self.user1, title='title 2')
+        like = Like.objects.create(owner=self.user2, photo=self.photo)
+        etag = self.client.get('/photos/')['ETag']
+        Like.objects.create(owner=self.user2, photo=other)
+        like.delete()
+        response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_returns_not_modified_without_serializing(self):
+        """
+        Tests if a matching list request gets a 304 after the count
+        and page validator queries alone, or the page query alone
+        in cursor mode, and so does a logged in user.
+        """
+        etag = self.client.get('/photos/')['ETag']
+        with self.assertNumQueries(2):
+            response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        url = '/photos/?pagination=cursor'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.client.force_login(self.user2)
+        etag = self.client.get('/photos/')['ETag']
+        response = self.client.get('/photos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_owner_rename_changes_etag(self):
+        """
+        Tests if renaming the owner of a photo changes its ETag.
+        """
+        etag = self.client.get(f'/photos/{self.photo.id}/')['ETag']
+        self.user1.username = 'renamed'
+        self.user1.save()
+        response = self.client.get(
+            f'/photos/{self.photo.id}/', HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['owner'], 'renamed')
+
+    def test_sparse_fieldset_returns_not_modified(self):
+        """
+        Tests if a sparse fieldset request gets a 304
+        without loading the fields it leaves out.
+        """
+        url = f'/photos/{self.photo.id}/?fields=id,title'
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+                )
+        self.assertEqual(response.status_code, 304)
+
+    def test_comment_detail_etag_needs_iso_timestamps(self):
+        """
+        Tests if comment details with relative times get no ETag, and
+        those with ISO timestamps answer a matching If-None-Match
+        with 304.
+        """
+        comment = Comment.objects.create(
+            owner=self.user1, photo=self.photo, content='content'
+            )
+        response = self.client.get(f'/comments/{comment.id}/')
+        self.assertNotIn('ETag', response)
+        url = f'/comments/{comment.id}/?timestamps=iso'
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_object_returns_not_found(self):
+        """
+        Tests if a conditional request for a missing photo gets a 404.
+        """
+        response = self.client.get('/photos/999/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(API_METRICS=True, DEBUG=True)
+class MetricsMiddlewareTests(APITestCase):
+    """
+    Tests the request metrics middleware and the /metrics/ endpoint.
+    """
+    def setUp(self):
+        registry.clear()
+        self.user = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.staff_user = User.objects.create_user(
+            username='staff', password='password2', is_staff=True
+            )
+        Photo.objects.create(owner=self.user, title='title 1')
+
+    def test_response_has_server_timing_header(self):
+        """
+        Tests if responses report their query count and timings
+        in a Server-Timing header.
+        """
+        response = self.client.get('/photos/')
+        self.assertIn('db;desc="2 queries"', response['Server-Timing'])
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+
+    def test_metrics_are_recorded_per_route(self):
+        """
+        Tests if a staff user can read the histograms
+        of the requested routes in Prometheus format.
+        """
+        self.client.get('/photos/')
+        self.client.get('/photos/')
+        self.client.force_login(self.staff_user)
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('# TYPE api_db_queries histogram', content)
+        self.assertIn(
+            'api_request_duration_seconds_count{endpoint="photos/"} 2',
+            content
+            )
+        self.assertIn(
+            'api_db_queries_bucket{endpoint="photos/",le="3"} 2', content
+            )
+
+    def test_metrics_are_staff_only(self):
+        """
+        Tests if a user who isn't staff can't read the metrics.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(API_METRICS=False)
+    def test_nothing_is_recorded_when_off(self):
+        """
+        Tests if no header or histogram is written when metrics are off.
+        """
+        response = self.client.get('/photos/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(registry.histograms['api_db_queries'], {})
+
+
+class SeedDataCommandTests(APITestCase):
+    """
+    Tests the seed_data management command.
+    """
+    def test_command_seeds_consistent_data(self):
+        """
+        Tests if the seeded rows have profiles, stored counters
+        matching the rows and users who can log in with
+        the password printed by the command.
+        """
+        out = StringIO()
+        call_command(
+            'seed_data', users=30, follows=5, photos=60, likes=100,
+            comments=50, tours=5, attendances=20, force=True, stdout=out
+            )
+        password = out.getvalue().rsplit("'", 2)[1]
+        self.assertEqual(Profile.objects.count(), 30)
+        self.assertEqual(Photo.objects.count(), 60)
+        self.assertEqual(Like.objects.count(), 100)
+        photo = Photo.objects.order_by('-likes_count').first()
+        self.assertEqual(photo.likes_count, photo.likes.count())
+        profile = Profile.objects.order_by('-followers_count').first()
+        self.assertEqual(
+            profile.followers_count,
+            Follower.objects.filter(followed=profile.owner).count()
+            )
+        response = self.client.post('/dj-rest-auth/login/', {
+            'username': profile.owner.username, 'password': password
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(password, 'seed-password')
+
+    def test_command_refuses_to_run_with_debug_off(self):
+        """
+        Tests if the command seeds nothing with DEBUG off
+        unless --force is given.
+        """
+        with self.assertRaisesMessage(CommandError, '--force'):
+            call_command('seed_data', users=5, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 0)
+
+
+class CompareToBaselineTests(APITestCase):
+    """
+    Tests the comparison of benchmark results with a baseline.
+    """
+    def test_regressions_are_reported(self):
+        """
+        Tests if extra queries and p95 slowdowns beyond the
+        tolerance are reported, and smaller slowdowns are not.
+        """
+        baseline = {
+            'photo_list': {'p50_ms': 10, 'p95_ms': 20, 'queries': 3},
+            'tour_list': {'p50_ms': 10, 'p95_ms': 20, 'queries': 3},
+        }
+        results = {
+            'photo_list': {'p50_ms': 12, 'p95_ms': 25, 'queries': 4},
+            'tour_list': {'p50_ms': 12, 'p95_ms': 25, 'queries': 3},
+            'feed': {'p50_ms': 12, 'p95_ms': 25, 'queries': 4},
+        }
+        self.assertEqual(compare_to_baseline(results, baseline, 0.5), [
+            'photo_list: 4 queries, baseline 3',
+        ])
+        self.assertEqual(len(compare_to_baseline(results, baseline, 0.1)), 3)
+
+
+class MembershipsViewTests(APITestCase):
+    """
+    Tests the current user's memberships view.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.photo1 = Photo.objects.create(owner=self.user2, title='title 1')
+        self.photo2 = Photo.objects.create(owner=self.user2, title='title 2')
+        Like.objects.create(owner=self.user1, photo=self.photo2)
+        Like.objects.create(owner=self.user1, photo=self.photo1)
+        Like.objects.create(owner=self.user2, photo=self.photo1)
+        Follower.objects.create(owner=self.user1, followed=self.user2)
+        self.client.force_login(self.user1)
+
+    def test_memberships_list_ids_of_the_user(self):
+        """
+        Tests if the sorted ids of the user's liked photos, followed
+        users and attended tours are returned with a query each,
+        after one query for the versions.
+        """
+        with self.assertNumQueries(6):
+            response = self.client.get('/memberships/')
+        self.assertEqual(response.data['likes']['ids'], [
+            self.photo1.id, self.photo2.id
+            ])
+        self.assertEqual(response.data['follows']['ids'], [self.user2.id])
+        self.assertEqual(response.data['attendances']['ids'], [])
+
+    def test_unchanged_sets_are_skipped(self):
+        """
+        Tests if sets whose version the client already has are
+        returned without ids or queries, and changed sets with ids.
+        """
+        versions = {
+            name: membership['version']
+            for name, membership
+            in self.client.get('/memberships/').data.items()
+        }
+        Like.objects.filter(photo=self.photo2).delete()
+        with self.assertNumQueries(4):
+            response = self.client.get('/memberships/', versions)
+        self.assertEqual(response.data['likes']['ids'], [self.photo1.id])
+        self.assertNotEqual(
+            response.data['likes']['version'], versions['likes']
+            )
+        self.assertIsNone(response.data['follows']['ids'])
+        self.assertEqual(
+            response.data['follows']['version'], versions['follows']
+            )
+
+    def test_unchanged_memberships_return_not_modified(self):
+        """
+        Tests if a matching If-None-Match gets a 304 until
+        the user follows someone in bulk.
+        """
+        etag = self.client.get('/memberships/')['ETag']
+        response = self.client.get('/memberships/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.client.post('/followers/bulk/', {
+            'unfollow': [self.user2.id]
+            }, format='json')
+        response = self.client.get('/memberships/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['follows']['ids'], [])
+
+    def test_versions_are_stored_in_the_database(self):
+        """
+        Tests if the versions are read from the database, so every
+        worker agrees on them whatever its cache holds.
+        """
+        versions = self.client.get('/memberships/').data
+        cache.clear()
+        response = self.client.get('/memberships/')
+        self.assertEqual(response.data, versions)
+        Like.objects.create(owner=self.user1, photo=Photo.objects.create(
+            owner=self.user2, title='title 3'
+            ))
+        self.assertEqual(
+            int(self.client.get('/memberships/').data['likes']['version']),
+            int(versions['likes']['version']) + 1
+            )
+
+    def test_not_logged_in_user_cannot_list_memberships(self):
+        """
+        Tests if logged out users cannot list memberships.
+        """
+        self.client.logout()
+        response = self.client.get('/memberships/')
+        self.assertEqual(response.status_code, 403)
+
+
+class ImageURLTests(APITestCase):
+    """
+    Tests the memoized image URLs of the serializers.
+    """
+    def setUp(self):
+        """
+        Sets up a user with a photo and a comment to be used in the tests.
+        """
+        storage_url.cache_clear()
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photo = Photo.objects.create(
+            owner=self.user1, title='title', image='images/photo'
+            )
+        Comment.objects.create(
+            owner=self.user1, photo=self.photo, content='comment'
+            )
+
+    def test_image_urls_are_built_once(self):
+        """
+        Tests if the image URLs are only built by the
+        storage once for repeated responses.
+        """
+        def build_url(storage, name):
+            return f'https://images.example.com/{name}'
+
+        with mock.patch.object(
+            get_storage_class(), 'url', autospec=True, side_effect=build_url
+        ) as url:
+            for _ in range(3):
+                response = self.client.get('/comments/')
+                photo_response = self.client.get(f'/photos/{self.photo.id}/')
+        self.assertEqual(url.call_count, 2)
+        self.assertEqual(
+            photo_response.data['image'],
+            'https://images.example.com/images/photo'
+            )
+        self.assertEqual(
+            response.data['results'][0]['profile_image'],
+            photo_response.data['profile_image']
+            )
+
+    def test_empty_images_are_none(self):
+        """
+        Tests if an empty image serializes as None.
+        """
+        tour = Tour.objects.create(
+            owner=self.user1,
+            title='title',
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            )
+        response = self.client.get(f'/tours/{tour.id}/')
+        self.assertIsNone(response.data['image'])
+
+
+def make_image(image_format='PNG', size=(10, 10)):
+    """
+    Returns an upload of a blank image in the given format and size.
+    """
+    content = BytesIO()
+    Image.new('RGB', size).save(content, image_format)
+    return SimpleUploadedFile(
+        f'image.{image_format.lower()}', content.getvalue()
+        )
+
+
+class ImageUploadValidationTests(APITestCase):
+    """
+    Tests the validation of uploaded photo and tour images.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def validate(self, image):
+        """
+        Returns the photo serializer validating a photo with the image.
+        """
+        serializer = PhotoSerializer(data={'title': 'title', 'image': image})
+        serializer.is_valid()
+        return serializer
+
+    def test_valid_images_are_accepted(self):
+        """
+        Tests if JPEG, PNG and WebP images within the limits are valid.
+        """
+        for image_format in ('JPEG', 'PNG', 'WEBP'):
+            with self.subTest(image_format=image_format):
+                serializer = self.validate(make_image(image_format))
+                self.assertEqual(serializer.errors, {})
+                self.assertEqual(
+                    serializer.validated_data['image'].image.format,
+                    image_format
+                    )
+
+    def test_oversized_image_is_rejected_before_reading_it(self):
+        """
+        Tests if an image over the size limit is
+        rejected without opening it with Pillow.
+        """
+        image = SimpleUploadedFile(
+            'image.png', b'0' * (IMAGE_MAX_SIZE + 1)
+            )
+        with mock.patch('PIL.Image.open') as open_image:
+            serializer = self.validate(image)
+        open_image.assert_not_called()
+        self.assertEqual(
+            serializer.errors['image'], ['Image size larger than 2MB!']
+            )
+
+    def test_image_dimensions_are_limited(self):
+        """
+        Tests if images taller or wider than 4096px are rejected.
+        """
+        serializer = self.validate(make_image(size=(10, 4097)))
+        self.assertEqual(
+            serializer.errors['image'], ['Image height larger than 4096px!']
+            )
+        serializer = self.validate(make_image(size=(4097, 10)))
+        self.assertEqual(
+            serializer.errors['image'], ['Image width larger than 4096px!']
+            )
+
+    def test_malformed_image_is_rejected(self):
+        """
+        Tests if a file that isn't an image is rejected.
+        """
+        serializer = self.validate(
+            SimpleUploadedFile('image.jpg', b'not an image')
+            )
+        self.assertIn('image', serializer.errors)
+
+    def test_oversized_upload_is_rejected_before_parsing(self):
+        """
+        Tests if an upload too large for a valid image
+        is rejected from its content length.
+        """
+        self.client.force_login(self.user1)
+        with mock.patch(
+            'rest_framework.parsers.MultiPartParser.parse'
+        ) as parse:
+            response = self.client.post('/photos/', {
+                'title': 'title',
+                'image': SimpleUploadedFile(
+                    'image.png', b'0' * (IMAGE_MAX_SIZE * 2)
+                    ),
+            })
+        parse.assert_not_called()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['image'], ['Image size larger than 2MB!']
+            )
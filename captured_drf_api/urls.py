@@ -15,11 +15,15 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from .views import root_route, logout_route
+from .views import (
+    root_route, logout_route, memberships_route, metrics_route,
+)
 
 urlpatterns = [
     path('', root_route),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_route),
+    path('memberships/', memberships_route),
     path('api-auth/', include('rest_framework.urls')),
     path('dj-rest-auth/logout/', logout_route),
     path('dj-rest-auth/', include('dj_rest_auth.urls')),
@@ -27,6 +31,8 @@ urlpatterns = [
         'dj-rest-auth/registration/',
         include('dj_rest_auth.registration.urls')
         ),
+    path('', include('trending.urls')),
+    path('', include('suggestions.urls')),
     path('', include('profiles.urls')),
     path('', include('photos.urls')),
     path('', include('comments.urls')),
@@ -34,4 +40,5 @@ urlpatterns = [
     path('', include('followers.urls')),
     path('', include('tours.urls')),
     path('', include('attendances.urls')),
+    path('', include('feeds.urls')),
 ]
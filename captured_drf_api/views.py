@@ -1,5 +1,13 @@
-from rest_framework.decorators import api_view
+from django.http import HttpResponse
+from django.utils.http import quote_etag
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from .conditional import evaluate_preconditions
+from .memberships import (
+    MEMBERSHIPS, get_membership_ids, get_membership_versions,
+)
+from .metrics import registry
 from .settings import (
     JWT_AUTH_COOKIE, JWT_AUTH_REFRESH_COOKIE, JWT_AUTH_SAMESITE,
     JWT_AUTH_SECURE,
@@ -36,3 +44,40 @@ def logout_route(request):
         secure=JWT_AUTH_SECURE,
     )
     return response
+
+
+@api_view()
+@permission_classes([IsAdminUser])
+def metrics_route(request):
+    """
+    Returns the recorded endpoint histograms in Prometheus text format.
+    """
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@api_view()
+@permission_classes([IsAuthenticated])
+def memberships_route(request):
+    """
+    Returns the ids of the photos the user likes, the users they
+    follow and the tours they attend, each with a version. Sets whose
+    version the client sends as ?likes=, ?follows= or ?attendances=
+    are returned without ids, and If-None-Match with the ETag
+    gets a 304 when no set changed.
+    """
+    versions = get_membership_versions(request.user.id)
+    etag = quote_etag('-'.join(versions[name] for name in MEMBERSHIPS))
+    not_modified = evaluate_preconditions(request, etag)
+    if not_modified is not None:
+        return not_modified
+    data = {}
+    for name, version in versions.items():
+        if request.query_params.get(name) == version:
+            ids = None
+        else:
+            ids = get_membership_ids(request.user.id, name, version)
+        data[name] = {'version': version, 'ids': ids}
+    return Response(data, headers={'ETag': etag})
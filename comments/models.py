@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from photos.models import Photo
 
@@ -16,12 +18,55 @@ class Comment(models.Model):
     class Meta:
         """
         Orders comments by date they were created
-        from newest to oldest.
+        from newest to oldest and indexes them by photo
+        in that order for the photo's comment list.
         """
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'], name='comment_created_at_idx'
+            ),
+            models.Index(
+                fields=['photo', '-created_at'],
+                name='comment_photo_created_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns the content of the comment.
         """
         return self.content
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the comment and updates the photo's comments count
+        in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def increment_comments_count(sender, instance, created, **kwargs):
+    """
+    Increments the photo's comments count
+    upon the creation of a new comment.
+    """
+    if created:
+        Photo.objects.filter(pk=instance.photo_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+def decrement_comments_count(sender, instance, **kwargs):
+    """
+    Decrements the photo's comments count
+    upon the deletion of a comment.
+    """
+    Photo.objects.filter(pk=instance.photo_id).update(
+        comments_count=F('comments_count') - 1
+    )
+
+
+post_save.connect(increment_comments_count, sender=Comment)
+post_delete.connect(decrement_comments_count, sender=Comment)
@@ -1,9 +1,10 @@
-from django.contrib.humanize.templatetags.humanize import naturaltime
 from rest_framework import serializers
+from captured_drf_api.fields import ImageURLField, NaturalTimeField
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(BaseModelSerializer):
     """
     Serializes comment data.
     """
@@ -11,9 +12,9 @@ class CommentSerializer(serializers.ModelSerializer):
     owner = serializers.ReadOnlyField(source='owner.username')
     is_owner = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
-    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
-    created_at = serializers.SerializerMethodField()
-    updated_at = serializers.SerializerMethodField()
+    profile_image = ImageURLField(source='owner.profile.image')
+    created_at = NaturalTimeField()
+    updated_at = NaturalTimeField()
 
     def get_is_owner(self, obj):
         """
@@ -22,18 +23,6 @@ class CommentSerializer(serializers.ModelSerializer):
         request = self.context['request']
         return request.user == obj.owner
 
-    def get_created_at(self, obj):
-        """
-        Returns the time elapsed since the comment was created.
-        """
-        return naturaltime(obj.created_at)
-
-    def get_updated_at(self, obj):
-        """
-        Returns the time elapsed since the comment was updated.
-        """
-        return naturaltime(obj.updated_at)
-
     class Meta:
         model = Comment
         fields = [
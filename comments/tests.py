@@ -1,6 +1,12 @@
+import datetime
+from unittest import mock
 from django.contrib.auth.models import User
+from django.contrib.humanize.templatetags.humanize import naturaltime
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
+from captured_drf_api.humanize import naturaltimes
+from captured_drf_api.testing import QueryBudgetMixin
 from .models import Comment
 from photos.models import Photo
 
@@ -156,3 +162,145 @@ class CommentModelTests(APITestCase):
             owner=user, photo=photo, content='comment content'
             )
         self.assertEquals(str(Comment.objects.first()), "comment content")
+
+
+class CommentCounterTests(APITestCase):
+    """
+    Tests the photo comments count is kept up to date.
+    """
+    def test_comments_count_follows_created_and_deleted_comments(self):
+        """
+        Tests if creating and deleting a comment updates
+        the stored comments count of the photo.
+        """
+        user = User.objects.create_user(
+            username='user', password='password1'
+            )
+        photo = Photo.objects.create(owner=user, title='test title')
+        comment = Comment.objects.create(
+            owner=user, photo=photo, content='comment 1'
+            )
+        photo.refresh_from_db()
+        self.assertEqual(photo.comments_count, 1)
+        comment.delete()
+        photo.refresh_from_db()
+        self.assertEqual(photo.comments_count, 0)
+
+
+class CommentQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the comment views.
+    """
+    def setUp(self):
+        """
+        Sets up a user and a photo to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photo = Photo.objects.create(owner=self.user1, title='title 1')
+
+    def create_comments(self, count):
+        """
+        Creates the given number of comments on the photo,
+        each from a different user.
+        """
+        start = User.objects.count()
+        for number in range(start, start + count):
+            user = User.objects.create(username=f'commenter{number}')
+            Comment.objects.create(
+                owner=user, photo=self.photo, content=f'comment {number}'
+                )
+
+    def test_comment_list_budget(self):
+        """
+        Tests if the comment list runs the count and
+        page queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget('/comments/', 2, self.create_comments)
+
+    def test_filtered_comment_list_budget(self):
+        """
+        Tests if the comment list of a photo also validates
+        the filter value at 1 and 100 rows.
+        """
+        self.assertListQueryBudget(
+            f'/comments/?photo={self.photo.id}', 3, self.create_comments
+            )
+
+    def test_comment_detail_budget(self):
+        """
+        Tests if the comment detail runs the object query,
+        plus the session and user if logged in.
+        """
+        self.create_comments(1)
+        comment = Comment.objects.first()
+        response = self.assertQueryBudget(f'/comments/{comment.id}/', 1)
+        self.assertEqual(response.data['photo'], self.photo.id)
+        self.client.force_login(self.user1)
+        self.assertQueryBudget(f'/comments/{comment.id}/', 3)
+
+
+class CommentTimestampTests(APITestCase):
+    """
+    Tests the rendering of comment timestamps.
+    """
+    def setUp(self):
+        """
+        Sets up a user, photo and comment to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photo1 = Photo.objects.create(
+            owner=self.user1,
+            title='title 1',
+            )
+        self.comment = Comment.objects.create(
+            owner=self.user1, content='comment 1', photo=self.photo1
+            )
+        Comment.objects.filter(pk=self.comment.pk).update(
+            created_at=timezone.now() - datetime.timedelta(days=3, hours=2)
+            )
+
+    def test_comments_show_relative_times_by_default(self):
+        """
+        Tests if comment timestamps are relative times.
+        """
+        response = self.client.get('/comments/')
+        self.assertEqual(
+            response.data['results'][0]['created_at'],
+            '3\xa0days, 2\xa0hours ago'
+            )
+        self.assertEqual(response.data['results'][0]['updated_at'], 'now')
+
+    def test_comments_can_show_iso_timestamps(self):
+        """
+        Tests if ?timestamps=iso returns ISO 8601 timestamps.
+        """
+        comment = Comment.objects.get(pk=self.comment.pk)
+        response = self.client.get(f'/comments/{comment.id}/?timestamps=iso')
+        self.assertEqual(
+            response.data['created_at'],
+            comment.created_at.isoformat().replace('+00:00', 'Z')
+            )
+
+    def test_naturaltimes_matches_naturaltime(self):
+        """
+        Tests if the shared formatter renders the same
+        strings as naturaltime, in the past and future.
+        """
+        now = timezone.now()
+        values = [
+            now + datetime.timedelta(seconds=seconds)
+            for seconds in (
+                -400 * 24 * 3600, -40 * 24 * 3600, -25 * 3600, -3600 * 5,
+                -61, -59, 0, 30, 90, 7200, 3 * 24 * 3600 + 60,
+            )
+        ]
+        with mock.patch(
+            'django.contrib.humanize.templatetags.humanize.datetime'
+        ) as clock:
+            clock.now.return_value = now
+            expected = [naturaltime(value) for value in values]
+        self.assertEqual(naturaltimes(values, now), expected)
@@ -1,17 +1,32 @@
 from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
+from captured_drf_api.cache import CachedResponseMixin
+from captured_drf_api.conditional import ConditionalGetMixin
+from captured_drf_api.mixins import OwnerQuerySetMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
 from .models import Comment
 from .serializers import CommentSerializer, CommentDetailSerializer
 
+COMMENT_ETAG_FIELDS = [
+    'updated_at', 'owner__username', 'owner__profile__updated_at',
+]
 
-class CommentList(generics.ListCreateAPIView):
+
+class CommentList(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    OwnerQuerySetMixin,
+    generics.ListCreateAPIView
+):
     """
     Lists comments and handles creation of a comment if logged in.
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     queryset = Comment.objects.all()
+    cache_models = [Comment]
+    relative_timestamps = True
+    etag_fields = COMMENT_ETAG_FIELDS
 
     filter_backends = [
         DjangoFilterBackend,
@@ -24,10 +39,18 @@ class CommentList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetail(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    OwnerQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Handles editing and deleting of comments by id if owned.
     """
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = CommentDetailSerializer
     queryset = Comment.objects.all()
+    select_related_fields = ['owner__profile', 'photo']
+    relative_timestamps = True
+    etag_fields = COMMENT_ETAG_FIELDS
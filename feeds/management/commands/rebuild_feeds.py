@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from feeds.models import FeedEntry, backfill_feed
+from followers.models import Follower
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds every user's home feed from the follower graph.
+    """
+    help = 'Rebuilds the home feed entries of every user.'
+
+    def handle(self, *args, **options):
+        followed_ids = {}
+        for owner_id, followed_id in Follower.objects.values_list(
+            'owner_id', 'followed_id'
+        ).iterator():
+            followed_ids.setdefault(owner_id, []).append(followed_id)
+        with transaction.atomic():
+            FeedEntry.objects.all().delete()
+            for owner_id, followed in followed_ids.items():
+                backfill_feed(owner_id, followed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the feeds of {len(followed_ids)} users.'
+        ))
@@ -0,0 +1,62 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_feeds(apps, schema_editor):
+    FeedEntry = apps.get_model('feeds', 'FeedEntry')
+    Follower = apps.get_model('followers', 'Follower')
+    Photo = apps.get_model('photos', 'Photo')
+    for owner_id, followed_id in Follower.objects.filter(
+        followed__profile__followers_count__lte=settings.FEED_FANOUT_LIMIT
+    ).values_list('owner_id', 'followed_id').iterator():
+        photos = Photo.objects.filter(owner_id=followed_id).order_by(
+            '-created_at'
+        ).values_list('pk', 'created_at')[:settings.FEED_BACKFILL_LIMIT]
+        FeedEntry.objects.bulk_create(
+            [
+                FeedEntry(
+                    owner_id=owner_id, photo_id=pk, created_at=created_at
+                )
+                for pk, created_at in photos
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('photos', '0006_search'),
+        ('followers', '0002_indexes'),
+        ('profiles', '0002_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+                ('photo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='photos.photo')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['owner', '-created_at'], name='feedentry_owner_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='feedentry',
+            unique_together={('owner', 'photo')},
+        ),
+        migrations.RunPython(populate_feeds, migrations.RunPython.noop),
+    ]
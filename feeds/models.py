@@ -0,0 +1,233 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import User
+from followers.models import Follower
+from photos.models import Photo
+from profiles.models import Profile
+
+
+class FeedEntry(models.Model):
+    """
+    The model for home feed entries, linking a photo to a user
+    who follows its owner. Entries are written when a photo is
+    posted (fan-out on write) or when its owner is followed.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+        )
+    photo = models.ForeignKey(
+        Photo,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+        )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        """
+        Orders feed entries by the date their photo was created
+        from newest to oldest, indexed per user, and ensures a photo
+        is only in a user's feed once.
+        """
+        unique_together = ['owner', 'photo']
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['owner', '-created_at'],
+                name='feedentry_owner_created_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Returns the owner and photo of the feed entry.
+        """
+        return f'{self.owner} {self.photo}'
+
+
+def fans_out_on_write(user_id):
+    """
+    Returns true if the user's photos are written to their
+    followers' feeds, false if they have so many followers that
+    their photos are read into feeds at request time instead.
+    """
+    followers_count = Profile.objects.filter(
+        owner_id=user_id
+    ).values_list('followers_count', flat=True).first()
+    return (followers_count or 0) <= settings.FEED_FANOUT_LIMIT
+
+
+def get_read_time_owners(user):
+    """
+    Returns the ids of the users the user follows whose photos
+    are read into feeds at request time, as a subquery.
+    """
+    return Follower.objects.filter(
+        owner=user,
+        followed__profile__followers_count__gt=settings.FEED_FANOUT_LIMIT,
+    ).values('followed')
+
+
+class FeedRows:
+    """
+    The created_at and photo_id rows of a user's home feed: their
+    feed entries, merged with the photos of followed users who are
+    not fanned out on write and aren't in the feed already.
+
+    Supports the counting, ordering, created_at filtering and slicing
+    the page number and cursor paginators use, applying them to both
+    sides of one UNION ALL, so a page reads its rows from the feed
+    entry index and the photos of the read-time owners only, however
+    long the feed has grown.
+    """
+    def __init__(self, user, ordering='-created_at', bounds=None):
+        self.user = user
+        self.ordering = ordering
+        self.bounds = bounds or {}
+
+    def order_by(self, *ordering):
+        """
+        Returns the rows ordered by created_at, in the direction of
+        the first field. Feeds have no other ordering.
+        """
+        return FeedRows(self.user, ordering[0], self.bounds)
+
+    def filter(self, **bounds):
+        """
+        Returns the rows within the created_at bounds,
+        e.g. created_at__lt for the position of a cursor.
+        """
+        return FeedRows(self.user, self.ordering, {**self.bounds, **bounds})
+
+    def get_queryset(self):
+        """
+        Returns the UNION ALL of the feed entries and read-time photos.
+        """
+        entries = FeedEntry.objects.filter(
+            owner=self.user, **self.bounds
+        ).order_by().values('created_at', 'photo_id')
+        read_time_photos = Photo.objects.filter(
+            owner__in=get_read_time_owners(self.user), **self.bounds
+        ).exclude(
+            models.Exists(FeedEntry.objects.filter(
+                owner=self.user, photo=models.OuterRef('pk')
+            ))
+        ).order_by().values('created_at', 'pk')
+        return entries.union(read_time_photos, all=True)
+
+    def count(self):
+        return self.get_queryset().count()
+
+    def __getitem__(self, index):
+        return list(self.get_queryset().order_by(self.ordering)[index])
+
+
+def backfill_feed(owner_id, followed_ids):
+    """
+    Writes the most recent photos of the followed users
+    to the owner's feed.
+    """
+    entries = []
+    for followed_id in followed_ids:
+        if not fans_out_on_write(followed_id):
+            continue
+        photos = Photo.objects.filter(owner_id=followed_id).order_by(
+            '-created_at'
+        ).values_list('pk', 'created_at')[:settings.FEED_BACKFILL_LIMIT]
+        entries.extend(
+            FeedEntry(owner_id=owner_id, photo_id=pk, created_at=created_at)
+            for pk, created_at in photos
+        )
+    FeedEntry.objects.bulk_create(
+        entries, batch_size=1000, ignore_conflicts=True
+    )
+
+
+def prune_feed(owner_id, followed_ids):
+    """
+    Removes the photos of the followed users from the owner's feed.
+    """
+    FeedEntry.objects.filter(
+        owner_id=owner_id, photo__owner__in=followed_ids
+    ).delete()
+
+
+def restore_fan_out(user_ids):
+    """
+    Writes the recent photos of the given users who are back at the
+    fan-out limit, after losing a follower, to their followers' feeds.
+    The photos they posted while over the limit were only read into
+    feeds, so they would drop out of them otherwise.
+    """
+    for user_id in Profile.objects.filter(
+        owner__in=user_ids, followers_count=settings.FEED_FANOUT_LIMIT
+    ).values_list('owner_id', flat=True):
+        photos = list(Photo.objects.filter(owner_id=user_id).order_by(
+            '-created_at'
+        ).values_list('pk', 'created_at')[:settings.FEED_BACKFILL_LIMIT])
+        if not photos:
+            continue
+        FeedEntry.objects.bulk_create(
+            [
+                FeedEntry(
+                    owner_id=follower_id, photo_id=pk, created_at=created_at
+                )
+                for follower_id in Follower.objects.filter(
+                    followed=user_id
+                ).values_list('owner_id', flat=True)
+                for pk, created_at in photos
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+def fan_out_photo(sender, instance, created, **kwargs):
+    """
+    Writes a new photo to the feeds of its owner's followers,
+    unless the owner has too many followers to fan out on write.
+    """
+    if not created or not fans_out_on_write(instance.owner_id):
+        return
+    follower_ids = Follower.objects.filter(
+        followed=instance.owner_id
+    ).values_list('owner_id', flat=True)
+    FeedEntry.objects.bulk_create(
+        [
+            FeedEntry(
+                owner_id=follower_id,
+                photo=instance,
+                created_at=instance.created_at,
+            )
+            for follower_id in follower_ids
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def backfill_followed_photos(sender, instance, created, **kwargs):
+    """
+    Backfills the followed user's photos into the owner's feed
+    upon the creation of a follower.
+    """
+    if created:
+        backfill_feed(instance.owner_id, [instance.followed_id])
+
+
+def prune_followed_photos(sender, instance, **kwargs):
+    """
+    Prunes the followed user's photos from the owner's feed upon the
+    deletion of a follower, and restores the followed user's fan-out
+    once the change is committed if they are back at the limit.
+    """
+    prune_feed(instance.owner_id, [instance.followed_id])
+    followed_id = instance.followed_id
+    transaction.on_commit(lambda: restore_fan_out([followed_id]))
+
+
+post_save.connect(fan_out_photo, sender=Photo)
+post_save.connect(backfill_followed_photos, sender=Follower)
+post_delete.connect(prune_followed_photos, sender=Follower)
@@ -0,0 +1,208 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
+from followers.models import Follower
+from photos.models import Photo
+from .models import FeedEntry
+
+
+class FeedListViewTests(APITestCase):
+    """
+    Tests the feed list view.
+    """
+    def setUp(self):
+        """
+        Sets up users to be used in the tests, with user1 following user2.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.user3 = User.objects.create_user(
+            username='user3', password='password3'
+            )
+        Follower.objects.create(owner=self.user1, followed=self.user2)
+
+    def get_feed_ids(self):
+        """
+        Returns the ids of the photos in user1's feed.
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get('/feed/')
+        return [photo['id'] for photo in response.data['results']]
+
+    def test_user_not_logged_in_cannot_view_feed(self):
+        """
+        Tests if a logged out user cannot view a feed.
+        """
+        response = self.client.get('/feed/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_new_photos_are_fanned_out_to_followers(self):
+        """
+        Tests if a new photo is written to the feeds of its
+        owner's followers only.
+        """
+        followed = Photo.objects.create(owner=self.user2, title='title 1')
+        Photo.objects.create(owner=self.user3, title='title 2')
+        self.assertTrue(FeedEntry.objects.filter(
+            owner=self.user1, photo=followed
+            ).exists())
+        self.assertEqual(self.get_feed_ids(), [followed.id])
+
+    def test_following_backfills_and_unfollowing_prunes_feed(self):
+        """
+        Tests if following a user adds their existing photos to the
+        feed and unfollowing them removes the photos again.
+        """
+        photo = Photo.objects.create(owner=self.user3, title='title 1')
+        follower = Follower.objects.create(
+            owner=self.user1, followed=self.user3
+            )
+        self.assertEqual(self.get_feed_ids(), [photo.id])
+        follower.delete()
+        self.assertEqual(self.get_feed_ids(), [])
+        self.assertFalse(FeedEntry.objects.filter(owner=self.user1).exists())
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_photos_of_users_with_many_followers_are_read_into_feed(self):
+        """
+        Tests if the photos of users above the fan-out limit are
+        not written to feeds but still read into them.
+        """
+        photo = Photo.objects.create(owner=self.user2, title='title 1')
+        self.assertFalse(FeedEntry.objects.exists())
+        self.assertEqual(self.get_feed_ids(), [photo.id])
+
+    def test_feed_query_count_does_not_grow_with_rows(self):
+        """
+        Tests if a feed page uses a fixed number of queries.
+        """
+        for number in range(15):
+            Photo.objects.create(owner=self.user2, title=f'title {number}')
+        self.client.force_login(self.user1)
+        with self.assertNumQueries(5):
+            response = self.client.get('/feed/')
+        self.assertEqual(len(response.data['results']), 10)
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_read_time_photos_are_merged_into_feed_entries(self):
+        """
+        Tests if the photos of users above the fan-out limit are merged
+        into the feed entries by date, without duplicating photos
+        written to the feed before they went over the limit.
+        """
+        written = Photo.objects.create(owner=self.user2, title='title 1')
+        Follower.objects.create(owner=self.user3, followed=self.user2)
+        read = Photo.objects.create(owner=self.user2, title='title 2')
+        Photo.objects.create(owner=self.user3, title='title 3')
+        self.assertFalse(FeedEntry.objects.filter(photo=read).exists())
+        self.assertEqual(self.get_feed_ids(), [read.id, written.id])
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_photos_are_written_to_feeds_when_back_at_the_limit(self):
+        """
+        Tests if photos posted while over the fan-out limit are written
+        to the followers' feeds when their owner drops back to it.
+        """
+        follower = Follower.objects.create(
+            owner=self.user3, followed=self.user2
+            )
+        photo = Photo.objects.create(owner=self.user2, title='title 1')
+        with self.captureOnCommitCallbacks(execute=True):
+            follower.delete()
+        self.assertTrue(FeedEntry.objects.filter(
+            owner=self.user1, photo=photo
+            ).exists())
+        self.assertEqual(self.get_feed_ids(), [photo.id])
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_feed_pages_by_cursor(self):
+        """
+        Tests if the feed pages by cursor through feed entries and
+        read-time photos alike.
+        """
+        photos = [
+            Photo.objects.create(owner=self.user2, title=f'title {number}')
+            for number in range(6)
+        ]
+        Follower.objects.create(owner=self.user3, followed=self.user2)
+        photos += [
+            Photo.objects.create(owner=self.user2, title=f'title {number}')
+            for number in range(6, 12)
+        ]
+        self.client.force_login(self.user1)
+        response = self.client.get('/feed/', {'pagination': 'cursor'})
+        ids = [photo['id'] for photo in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [photo['id'] for photo in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(ids, [photo.id for photo in reversed(photos)])
+
+
+class FeedQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budget of the home feed.
+    """
+    def setUp(self):
+        """
+        Sets up a user following another user.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        Follower.objects.create(owner=self.user1, followed=self.user2)
+
+    def create_photos(self, count):
+        """
+        Creates the given number of photos by the followed user.
+        """
+        for number in range(count):
+            Photo.objects.create(owner=self.user2, title=f'title {number}')
+
+    def test_feed_budget(self):
+        """
+        Tests if the feed runs the session, user, count, feed row
+        and photo queries at 1 and 100 rows.
+        """
+        self.client.force_login(self.user1)
+        self.assertListQueryBudget('/feed/', 5, self.create_photos)
+
+
+class RebuildFeedsCommandTests(APITestCase):
+    """
+    Tests the rebuild_feeds management command.
+    """
+    def test_command_rebuilds_feeds_from_followers(self):
+        """
+        Tests if missing and stale feed entries are fixed.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        Follower.objects.create(owner=user1, followed=user2)
+        photo = Photo.objects.create(owner=user2, title='title 1')
+        stale = Photo.objects.create(owner=user1, title='title 2')
+        FeedEntry.objects.all().delete()
+        FeedEntry.objects.create(
+            owner=user2, photo=stale, created_at=stale.created_at
+            )
+
+        call_command('rebuild_feeds', stdout=StringIO())
+
+        self.assertEqual(
+            list(FeedEntry.objects.values_list('owner', 'photo')),
+            [(user1.id, photo.id)]
+            )
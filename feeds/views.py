@@ -0,0 +1,54 @@
+from rest_framework import generics, permissions
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
+from captured_drf_api.pagination import (
+    CreatedAtCursorPagination, PageOrCursorPagination,
+)
+from photos.models import Photo
+from photos.serializers import PhotoSerializer
+from photos.views import PhotoQuerySetMixin
+from .models import FeedRows
+
+
+class FeedCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination on the created_at of feed rows, the ordering of
+    the feed entry index, with ties broken by the cursor offset.
+    """
+    ordering = ('-created_at',)
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+
+class FeedPagination(PageOrCursorPagination):
+    """
+    Page number or cursor pagination of feed rows.
+    """
+    cursor_pagination_class = FeedCursorPagination
+
+
+class FeedList(
+    PhotoQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListAPIView
+):
+    """
+    Lists the photos of the users the logged in user follows.
+    """
+    serializer_class = PhotoSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FeedPagination
+    queryset = Photo.objects.order_by('-created_at')
+
+    def paginate_queryset(self, queryset):
+        """
+        Paginates the user's feed rows and returns the photos of the
+        page, loaded by primary key through the view queryset.
+        """
+        rows = super().paginate_queryset(FeedRows(self.request.user))
+        photos = queryset.in_bulk([row['photo_id'] for row in rows])
+        return [
+            photos[row['photo_id']] for row in rows
+            if row['photo_id'] in photos
+        ]
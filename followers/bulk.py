@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from itertools import islice
+from django.contrib.auth.models import User
+from django.db import transaction
+from captured_drf_api.bulk import delete_rows
+from captured_drf_api.cache import get_profile_ids, invalidate
+from captured_drf_api.counters import refresh_profile_counters
+from captured_drf_api.memberships import bump_memberships
+from feeds.models import backfill_feed, prune_feed, restore_fan_out
+from profiles.models import Profile
+from suggestions.models import update_suggestions
+from .models import Follower
+
+CHUNK_SIZE = 1000
+
+
+def invalidate_follows(user_ids):
+    """
+    Invalidates the cached follower lists and the
+    cached profiles of the given users.
+    """
+    invalidate(Follower)
+    invalidate(Profile, get_profile_ids(*user_ids))
+
+
+def apply_follows(owner_id, follow, unfollow):
+    """
+    Makes the owner follow and unfollow the given user ids in one
+    transaction, with one conflict-ignoring INSERT and one DELETE.
+    Both skip the Follower signals, so the profile counters, home
+    feed, fan-out, suggestions and cached responses are updated here
+    once for the whole batch.
+    """
+    with transaction.atomic():
+        existing = set(Follower.objects.filter(
+            owner_id=owner_id, followed__in=follow
+        ).values_list('followed_id', flat=True))
+        Follower.objects.bulk_create(
+            [
+                Follower(owner_id=owner_id, followed_id=followed_id)
+                for followed_id in follow - existing
+            ],
+            ignore_conflicts=True,
+        )
+        unfollowed = dict(Follower.objects.filter(
+            owner_id=owner_id, followed__in=unfollow
+        ).values_list('pk', 'followed_id'))
+        delete_rows(Follower, unfollowed)
+        unfollowed_ids = set(unfollowed.values())
+        refresh_profile_counters({owner_id} | follow | unfollowed_ids)
+        backfill_feed(owner_id, follow - existing)
+        prune_feed(owner_id, unfollowed_ids)
+        restore_fan_out(unfollowed_ids)
+        bump_memberships('follows', [owner_id])
+    update_suggestions(owner_id)
+    invalidate_follows({owner_id} | follow | unfollowed_ids)
+
+
+def parse_follow_rows(file, file_format):
+    """
+    Yields the line number and (owner_id, followed_id) pair of every
+    row of a CSV or JSONL follow graph, with None as the pair for
+    malformed rows. CSV rows are owner,followed with an optional
+    header, JSONL rows are {"owner": id, "followed": id}.
+    """
+    lines = io.TextIOWrapper(file, encoding='utf-8')
+    if file_format == 'csv':
+        for number, row in enumerate(csv.reader(lines), start=1):
+            try:
+                yield number, (int(row[0]), int(row[1]))
+            except (IndexError, ValueError):
+                if number > 1:
+                    yield number, None
+        return
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            yield number, (int(row['owner']), int(row['followed']))
+        except (KeyError, TypeError, ValueError):
+            yield number, None
+
+
+def import_follows(rows, chunk_size=CHUNK_SIZE):
+    """
+    Creates the follows of (line number, pair) rows from
+    parse_follow_rows, one transaction per chunk of rows. Existing
+    follows, self-follows and unknown users are skipped. Returns
+    the created, skipped and malformed counts and the line numbers
+    of the first malformed rows. Suggestions are left to the next
+    rebuild_suggestions run.
+    """
+    result = {'created': 0, 'skipped': 0, 'invalid': 0, 'invalid_lines': []}
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return result
+        pairs = set()
+        invalid = 0
+        for number, pair in chunk:
+            if pair is None:
+                invalid += 1
+                if len(result['invalid_lines']) < 10:
+                    result['invalid_lines'].append(number)
+            else:
+                pairs.add(pair)
+        user_ids = {user_id for pair in pairs for user_id in pair}
+        with transaction.atomic():
+            known_ids = set(User.objects.filter(
+                pk__in=user_ids
+            ).values_list('pk', flat=True))
+            existing = set(Follower.objects.filter(
+                owner__in={owner_id for owner_id, _ in pairs},
+                followed__in={followed_id for _, followed_id in pairs},
+            ).values_list('owner_id', 'followed_id'))
+            new = {
+                (owner_id, followed_id)
+                for owner_id, followed_id in pairs - existing
+                if owner_id != followed_id
+                and owner_id in known_ids and followed_id in known_ids
+            }
+            Follower.objects.bulk_create(
+                [
+                    Follower(owner_id=owner_id, followed_id=followed_id)
+                    for owner_id, followed_id in new
+                ],
+                ignore_conflicts=True,
+            )
+            refresh_profile_counters(known_ids)
+            followed_ids = {}
+            for owner_id, followed_id in new:
+                followed_ids.setdefault(owner_id, []).append(followed_id)
+            for owner_id, followed in followed_ids.items():
+                backfill_feed(owner_id, followed)
+            bump_memberships('follows', list(followed_ids))
+        invalidate_follows(known_ids)
+        result['created'] += len(new)
+        result['skipped'] += len(chunk) - invalid - len(new)
+        result['invalid'] += invalid
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from followers.bulk import CHUNK_SIZE, import_follows, parse_follow_rows
+
+
+class Command(BaseCommand):
+    """
+    Imports a follow graph from a CSV or JSONL file in chunks.
+    """
+    help = 'Imports follows from a CSV (owner,followed) or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if path.endswith('.csv'):
+            file_format = 'csv'
+        elif path.endswith(('.jsonl', '.ndjson')):
+            file_format = 'jsonl'
+        else:
+            raise CommandError('Import a .csv or .jsonl file.')
+        with open(path, 'rb') as file:
+            result = import_follows(
+                parse_follow_rows(file, file_format), options['chunk_size']
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result["created"]} follows, skipped '
+            f'{result["skipped"]} and found {result["invalid"]} '
+            f'malformed rows.'
+        ))
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('followers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follower',
+            index=models.Index(fields=['-created_at'], name='follower_created_at_idx'),
+        ),
+    ]
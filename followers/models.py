@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from profiles.models import Profile
 
 
 class Follower(models.Model):
@@ -26,9 +29,53 @@ class Follower(models.Model):
         """
         unique_together = ['owner', 'followed']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'], name='follower_created_at_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns a string with the owner and followed fields.
         """
         return f'{self.owner} {self.followed}'
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the follower and updates the profile counters
+        in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def increment_follow_counts(sender, instance, created, **kwargs):
+    """
+    Increments the followed profile's followers count and the
+    owner profile's following count upon the creation of a follower.
+    """
+    if created:
+        Profile.objects.filter(owner_id=instance.followed_id).update(
+            followers_count=F('followers_count') + 1
+        )
+        Profile.objects.filter(owner_id=instance.owner_id).update(
+            following_count=F('following_count') + 1
+        )
+
+
+def decrement_follow_counts(sender, instance, **kwargs):
+    """
+    Decrements the followed profile's followers count and the
+    owner profile's following count upon the deletion of a follower.
+    """
+    Profile.objects.filter(owner_id=instance.followed_id).update(
+        followers_count=F('followers_count') - 1
+    )
+    Profile.objects.filter(owner_id=instance.owner_id).update(
+        following_count=F('following_count') - 1
+    )
+
+
+post_save.connect(increment_follow_counts, sender=Follower)
+post_delete.connect(decrement_follow_counts, sender=Follower)
@@ -1,9 +1,13 @@
+from django.contrib.auth.models import User
 from django.db import IntegrityError
 from rest_framework import serializers
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Follower
 
+BULK_MAX_LENGTH = 500
 
-class FollowerSerializer(serializers.ModelSerializer):
+
+class FollowerSerializer(BaseModelSerializer):
     """
     Serializes follower data.
     """
@@ -31,3 +35,42 @@ class FollowerSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {'detail': 'possible duplicate'}
             )
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    """
+    Validates the user ids a user follows and unfollows in one request.
+    """
+    follow = serializers.ListField(
+        child=serializers.IntegerField(), default=list,
+        max_length=BULK_MAX_LENGTH
+    )
+    unfollow = serializers.ListField(
+        child=serializers.IntegerField(), default=list,
+        max_length=BULK_MAX_LENGTH
+    )
+
+    def validate(self, data):
+        """
+        Checks no user is both followed and unfollowed, that users
+        don't follow themselves and that every followed user
+        exists, in one query.
+        """
+        follow = set(data['follow'])
+        unfollow = set(data['unfollow'])
+        if follow & unfollow:
+            raise serializers.ValidationError({
+                'detail': 'users cannot be followed and unfollowed at once'
+            })
+        if self.context['request'].user.id in follow:
+            raise serializers.ValidationError({
+                'follow': 'users cannot follow themselves'
+            })
+        missing = follow - set(
+            User.objects.filter(pk__in=follow).values_list('pk', flat=True)
+        )
+        if missing:
+            raise serializers.ValidationError({
+                'follow': f'unknown user ids {sorted(missing)}'
+            })
+        return {'follow': follow, 'unfollow': unfollow}
@@ -1,7 +1,16 @@
+from io import BytesIO
+from unittest import mock
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
 from rest_framework.test import APITestCase
+from feeds.models import FeedEntry
+from photos.models import Photo
+from profiles.models import Profile
+from captured_drf_api.testing import QueryBudgetMixin
+from .bulk import import_follows, parse_follow_rows
 from .models import Follower
+from .views import FollowerImport
 
 
 class FollowerListViewTests(APITestCase):
@@ -127,3 +136,302 @@ class FollowerModelTests(APITestCase):
             owner=user1, followed=user2
             )
         self.assertEquals(str(Follower.objects.first()), "user1 user2")
+
+
+class FollowerCounterTests(APITestCase):
+    """
+    Tests the profile follower counts are kept up to date.
+    """
+    def test_follow_counts_follow_created_and_deleted_followers(self):
+        """
+        Tests if creating and deleting a follower updates the
+        followers count of the followed profile and the following
+        count of the owner's profile.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        follower = Follower.objects.create(owner=user1, followed=user2)
+        user1.profile.refresh_from_db()
+        user2.profile.refresh_from_db()
+        self.assertEqual(user1.profile.following_count, 1)
+        self.assertEqual(user2.profile.followers_count, 1)
+        follower.delete()
+        user1.profile.refresh_from_db()
+        user2.profile.refresh_from_db()
+        self.assertEqual(user1.profile.following_count, 0)
+        self.assertEqual(user2.profile.followers_count, 0)
+
+
+class FollowerQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the follower views.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def create_followers(self, count):
+        """
+        Creates the given number of users, each following
+        another new user.
+        """
+        start = Follower.objects.count()
+        for number in range(start, start + count):
+            owner = User.objects.create(username=f'owner{number}')
+            followed = User.objects.create(username=f'followed{number}')
+            Follower.objects.create(owner=owner, followed=followed)
+
+    def test_follower_list_budget(self):
+        """
+        Tests if the follower list runs the count and page
+        queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget('/followers/', 2, self.create_followers)
+
+    def test_follower_detail_budget(self):
+        """
+        Tests if the follower detail runs a single query,
+        plus the session and user if logged in.
+        """
+        self.create_followers(1)
+        follower = Follower.objects.first()
+        response = self.assertQueryBudget(f'/followers/{follower.id}/', 1)
+        self.assertEqual(
+            response.data['followed_name'], follower.followed.username
+            )
+        self.client.force_login(self.user1)
+        self.assertQueryBudget(f'/followers/{follower.id}/', 3)
+
+
+class FollowerBulkViewTests(APITestCase):
+    """
+    Tests the bulk follow and unfollow view.
+    """
+    def setUp(self):
+        """
+        Sets up users to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.others = [
+            User.objects.create(username=f'user{number}')
+            for number in range(2, 5)
+        ]
+
+    def test_logged_in_user_can_follow_and_unfollow_users(self):
+        """
+        Tests if follows and unfollows are applied together, the
+        follower ids are returned per user and the profile counters
+        and home feed are updated.
+        """
+        user2, user3, user4 = self.others
+        photo = Photo.objects.create(owner=user2, title='title 1')
+        follower = Follower.objects.create(owner=self.user1, followed=user4)
+        self.client.force_login(self.user1)
+        response = self.client.post('/followers/bulk/', {
+            'follow': [user2.id, user3.id],
+            'unfollow': [user4.id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            user2.id: Follower.objects.get(followed=user2).id,
+            user3.id: Follower.objects.get(followed=user3).id,
+            user4.id: None,
+            })
+        self.assertFalse(Follower.objects.filter(pk=follower.pk).exists())
+        self.assertEqual(
+            Profile.objects.get(owner=self.user1).following_count, 2
+            )
+        self.assertEqual(Profile.objects.get(owner=user4).followers_count, 0)
+        self.assertTrue(FeedEntry.objects.filter(
+            owner=self.user1, photo=photo
+            ).exists())
+
+    def test_already_followed_users_are_ignored(self):
+        """
+        Tests if following an already followed user keeps the
+        existing follower instead of failing.
+        """
+        user2 = self.others[0]
+        follower = Follower.objects.create(owner=self.user1, followed=user2)
+        self.client.force_login(self.user1)
+        response = self.client.post('/followers/bulk/', {
+            'follow': [user2.id],
+            }, format='json')
+        self.assertEqual(response.data, {user2.id: follower.id})
+        self.assertEqual(Profile.objects.get(owner=user2).followers_count, 1)
+
+    def test_cannot_follow_self_or_unknown_user(self):
+        """
+        Tests if following oneself or a user that
+        doesn't exist is rejected.
+        """
+        self.client.force_login(self.user1)
+        for user_id in (self.user1.id, 999):
+            response = self.client.post('/followers/bulk/', {
+                'follow': [user_id],
+                }, format='json')
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+        self.assertEqual(Follower.objects.count(), 0)
+
+    def test_unfollow_query_count_does_not_grow(self):
+        """
+        Tests if unfollowing ten users runs as many queries as
+        unfollowing one, and still updates the counters and feed.
+        """
+        fans = [
+            User.objects.create(username=f'fan{number}')
+            for number in range(11)
+        ]
+        for fan in fans:
+            Follower.objects.create(owner=self.user1, followed=fan)
+            Photo.objects.create(owner=fan, title='title')
+        self.client.force_login(self.user1)
+        for unfollow in [fans[:1], fans[1:]]:
+            with self.assertNumQueries(16):
+                self.client.post('/followers/bulk/', {
+                    'unfollow': [fan.id for fan in unfollow],
+                    }, format='json')
+        self.assertEqual(Follower.objects.count(), 0)
+        self.assertEqual(
+            Profile.objects.get(owner=self.user1).following_count, 0
+            )
+        self.assertFalse(FeedEntry.objects.filter(owner=self.user1).exists())
+
+    def test_not_logged_in_user_cannot_bulk_follow(self):
+        """
+        Tests if logged out users cannot follow users in bulk.
+        """
+        response = self.client.post('/followers/bulk/', {
+            'follow': [self.others[0].id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class FollowerImportViewTests(APITestCase):
+    """
+    Tests the staff only follow graph import view.
+    """
+    def setUp(self):
+        """
+        Sets up a staff user and users to be followed.
+        """
+        self.staff_user = User.objects.create_user(
+            username='staff', password='password1', is_staff=True
+            )
+        self.users = [
+            User.objects.create(username=f'user{number}')
+            for number in range(3)
+        ]
+
+    def upload(self, name, content):
+        """
+        Posts the content as an uploaded file with the given name.
+        """
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(
+            '/followers/import/', {'file': upload}, format='multipart'
+            )
+
+    def test_staff_user_can_import_csv(self):
+        """
+        Tests if the follows of a CSV file are created, skipping
+        existing follows, self-follows, unknown users and malformed rows.
+        """
+        user0, user1, user2 = self.users
+        Follower.objects.create(owner=user0, followed=user2)
+        self.client.force_login(self.staff_user)
+        response = self.upload('graph.csv', (
+            'owner,followed\n'
+            f'{user0.id},{user1.id}\n'
+            f'{user1.id},{user0.id}\n'
+            f'{user0.id},{user2.id}\n'
+            f'{user1.id},{user1.id}\n'
+            f'{user1.id},999\n'
+            'not,a number\n'
+            ))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'created': 2, 'skipped': 3, 'invalid': 1, 'invalid_lines': [7],
+            })
+        self.assertEqual(Follower.objects.count(), 3)
+        self.assertEqual(Profile.objects.get(owner=user0).following_count, 2)
+
+    def test_staff_user_can_import_jsonl(self):
+        """
+        Tests if the follows of a JSONL file are created.
+        """
+        user0, user1, user2 = self.users
+        self.client.force_login(self.staff_user)
+        response = self.upload('graph.jsonl', (
+            f'{{"owner": {user0.id}, "followed": {user1.id}}}\n'
+            f'{{"owner": {user2.id}, "followed": {user1.id}}}\n'
+            ))
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(Profile.objects.get(owner=user1).followers_count, 2)
+
+    def test_import_creates_follows_in_chunks(self):
+        """
+        Tests if a graph larger than one chunk is fully imported.
+        """
+        user0, user1, user2 = self.users
+        rows = (
+            f'{{"owner": {user0.id}, "followed": {user1.id}}}\n'
+            f'{{"owner": {user0.id}, "followed": {user2.id}}}\n'
+            f'{{"owner": {user1.id}, "followed": {user2.id}}}\n'
+            )
+        result = import_follows(
+            parse_follow_rows(BytesIO(rows.encode()), 'jsonl'), chunk_size=2
+            )
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(Profile.objects.get(owner=user2).followers_count, 2)
+
+    def test_import_bumps_the_owners_follow_versions(self):
+        """
+        Tests if importing follows marks the follows
+        of their owners as changed.
+        """
+        user0, user1, user2 = self.users
+        rows = f'{user0.id},{user1.id}\n{user2.id},{user1.id}\n'
+        import_follows(parse_follow_rows(BytesIO(rows.encode()), 'csv'))
+        versions = dict(Profile.objects.values_list(
+            'owner_id', 'follows_version'
+            ))
+        self.assertEqual(versions[user0.id], 1)
+        self.assertEqual(versions[user1.id], 0)
+        self.assertEqual(versions[user2.id], 1)
+
+    def test_import_rejects_files_over_max_rows(self):
+        """
+        Tests if files with more than max_rows rows are rejected
+        without importing any of their follows.
+        """
+        user0, user1, user2 = self.users
+        self.client.force_login(self.staff_user)
+        with mock.patch.object(FollowerImport, 'max_rows', 1):
+            response = self.upload('graph.csv', (
+                f'{user0.id},{user1.id}\n'
+                f'{user0.id},{user2.id}\n'
+                ))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('import_follows', response.data['file'])
+        self.assertEqual(Follower.objects.count(), 0)
+
+    def test_user_who_is_not_staff_cannot_import(self):
+        """
+        Tests if users who aren't staff cannot import follows.
+        """
+        self.client.force_login(self.users[0])
+        response = self.upload('graph.csv', f'{self.users[0].id},1\n')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -4,5 +4,7 @@ from followers import views
 
 urlpatterns = [
     path('followers/', views.FollowerList.as_view()),
+    path('followers/bulk/', views.FollowerBulk.as_view()),
+    path('followers/import/', views.FollowerImport.as_view()),
     path('followers/<int:pk>/', views.FollowerDetail.as_view())
 ]
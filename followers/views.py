@@ -1,11 +1,17 @@
+from itertools import islice
 from django.shortcuts import render
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .bulk import apply_follows, import_follows, parse_follow_rows
 from .models import Follower
-from .serializers import FollowerSerializer
+from .serializers import BulkFollowSerializer, FollowerSerializer
+from captured_drf_api.mixins import OwnerQuerySetMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
 
 
-class FollowerList(generics.ListCreateAPIView):
+class FollowerList(OwnerQuerySetMixin, generics.ListCreateAPIView):
     """
     Lists followers and handles creation of a follower if logged in.
     """
@@ -14,12 +20,13 @@ class FollowerList(generics.ListCreateAPIView):
         permissions.IsAuthenticatedOrReadOnly
         ]
     queryset = Follower.objects.all()
+    select_related_fields = ['owner', 'followed']
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class FollowerDetail(generics.RetrieveDestroyAPIView):
+class FollowerDetail(OwnerQuerySetMixin, generics.RetrieveDestroyAPIView):
     """
     Handles retrieving and deleting of followers by id if owned.
     """
@@ -28,3 +35,71 @@ class FollowerDetail(generics.RetrieveDestroyAPIView):
         IsOwnerOrReadOnly
         ]
     queryset = Follower.objects.all()
+    select_related_fields = ['owner', 'followed']
+
+
+class FollowerBulk(generics.GenericAPIView):
+    """
+    Follows and unfollows several users at once for the logged in user.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BulkFollowSerializer
+
+    def post(self, request):
+        """
+        Applies the follows and unfollows in one transaction and
+        returns the follower id per user, null for users
+        that aren't followed.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        follow = serializer.validated_data['follow']
+        unfollow = serializer.validated_data['unfollow']
+        apply_follows(request.user.id, follow, unfollow)
+        follower_ids = dict.fromkeys(follow | unfollow)
+        follower_ids.update(Follower.objects.filter(
+            owner=request.user, followed__in=follow | unfollow
+        ).values_list('followed_id', 'id'))
+        return Response(follower_ids)
+
+
+class FollowerImport(APIView):
+    """
+    Imports a follow graph from an uploaded CSV or JSONL file
+    in chunks, for staff users only. Files over max_rows rows are
+    rejected, as they're meant for the import_follows command.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+    file_formats = {'csv': 'csv', 'jsonl': 'jsonl', 'ndjson': 'jsonl'}
+    max_rows = 10000
+
+    def post(self, request):
+        """
+        Returns the numbers of created, skipped and malformed follows.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'file': 'No file was submitted.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        extension = upload.name.rsplit('.', 1)[-1].lower()
+        if extension not in self.file_formats:
+            return Response(
+                {'file': 'Upload a .csv or .jsonl file.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        rows = list(islice(
+            parse_follow_rows(upload.file, self.file_formats[extension]),
+            self.max_rows + 1
+        ))
+        if len(rows) > self.max_rows:
+            return Response(
+                {'file': (
+                    f'Upload at most {self.max_rows} rows, or import '
+                    f'larger files with the import_follows command.'
+                )},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(import_follows(rows))
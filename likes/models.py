@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from photos.models import Photo
 
@@ -23,9 +25,45 @@ class Like(models.Model):
         """
         unique_together = ['owner', 'photo']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='like_created_at_idx'),
+        ]
 
     def __str__(self):
         """
         Returns the owner and photo of the like
         """
         return f'{self.owner} {self.photo}'
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the like and updates the photo's likes count
+        in the same transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def increment_likes_count(sender, instance, created, **kwargs):
+    """
+    Increments the photo's likes count
+    upon the creation of a new like.
+    """
+    if created:
+        Photo.objects.filter(pk=instance.photo_id).update(
+            likes_count=F('likes_count') + 1
+        )
+
+
+def decrement_likes_count(sender, instance, **kwargs):
+    """
+    Decrements the photo's likes count
+    upon the deletion of a like.
+    """
+    Photo.objects.filter(pk=instance.photo_id).update(
+        likes_count=F('likes_count') - 1
+    )
+
+
+post_save.connect(increment_likes_count, sender=Like)
+post_delete.connect(decrement_likes_count, sender=Like)
@@ -1,9 +1,13 @@
 from django.db import IntegrityError
 from rest_framework import serializers
+from captured_drf_api.serializers import BaseModelSerializer
 from likes.models import Like
+from photos.models import Photo
 
+BULK_MAX_LENGTH = 500
 
-class LikeSerializer(serializers.ModelSerializer):
+
+class LikeSerializer(BaseModelSerializer):
     """
     Serializes like data.
     """
@@ -24,3 +28,37 @@ class LikeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({
                 'detail': 'possible duplicate'
             })
+
+
+class BulkLikeSerializer(serializers.Serializer):
+    """
+    Validates the photo ids a user likes and unlikes in one request.
+    """
+    like = serializers.ListField(
+        child=serializers.IntegerField(), default=list,
+        max_length=BULK_MAX_LENGTH
+    )
+    unlike = serializers.ListField(
+        child=serializers.IntegerField(), default=list,
+        max_length=BULK_MAX_LENGTH
+    )
+
+    def validate(self, data):
+        """
+        Checks no photo is both liked and unliked and
+        that every liked photo exists, in one query.
+        """
+        like = set(data['like'])
+        unlike = set(data['unlike'])
+        if like & unlike:
+            raise serializers.ValidationError({
+                'detail': 'photos cannot be liked and unliked at once'
+            })
+        missing = like - set(
+            Photo.objects.filter(pk__in=like).values_list('pk', flat=True)
+        )
+        if missing:
+            raise serializers.ValidationError({
+                'like': f'unknown photo ids {sorted(missing)}'
+            })
+        return {'like': like, 'unlike': unlike}
@@ -3,6 +3,7 @@ from .models import Like
 from photos.models import Photo
 from rest_framework import status
 from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
 
 
 class LikeListViewTests(APITestCase):
@@ -132,3 +133,159 @@ class LikeModelTests(APITestCase):
             owner=user, photo=photo
             )
         self.assertEquals(str(Like.objects.first()), "user 1 test title")
+
+
+class LikeCounterTests(APITestCase):
+    """
+    Tests the photo likes count is kept up to date.
+    """
+    def test_likes_count_follows_created_and_deleted_likes(self):
+        """
+        Tests if creating and deleting a like updates
+        the stored likes count of the photo.
+        """
+        user = User.objects.create_user(
+            username='user', password='password1'
+            )
+        photo = Photo.objects.create(owner=user, title='test title')
+        like = Like.objects.create(owner=user, photo=photo)
+        photo.refresh_from_db()
+        self.assertEqual(photo.likes_count, 1)
+        like.delete()
+        photo.refresh_from_db()
+        self.assertEqual(photo.likes_count, 0)
+
+
+class LikeQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the like views.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def create_likes(self, count):
+        """
+        Creates the given number of photos, each liked
+        by a different user.
+        """
+        start = Like.objects.count()
+        for number in range(start, start + count):
+            photo = Photo.objects.create(
+                owner=self.user1, title=f'title {number}'
+                )
+            user = User.objects.create(username=f'liker{number}')
+            Like.objects.create(owner=user, photo=photo)
+
+    def test_like_list_budget(self):
+        """
+        Tests if the like list runs the count and page
+        queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget('/likes/', 2, self.create_likes)
+
+    def test_like_detail_budget(self):
+        """
+        Tests if the like detail runs a single query,
+        plus the session and user if logged in.
+        """
+        self.create_likes(1)
+        like = Like.objects.first()
+        self.assertQueryBudget(f'/likes/{like.id}/', 1)
+        self.client.force_login(self.user1)
+        self.assertQueryBudget(f'/likes/{like.id}/', 3)
+
+
+class LikeBulkViewTests(APITestCase):
+    """
+    Tests the bulk like and unlike view.
+    """
+    def setUp(self):
+        """
+        Sets up a user and photos to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photos = [
+            Photo.objects.create(owner=self.user1, title=f'title {number}')
+            for number in range(3)
+        ]
+
+    def test_logged_in_user_can_like_and_unlike_photos(self):
+        """
+        Tests if likes and unlikes are applied together, the like
+        ids are returned per photo and the counters are updated.
+        """
+        photo1, photo2, photo3 = self.photos
+        like = Like.objects.create(owner=self.user1, photo=photo3)
+        self.client.force_login(self.user1)
+        response = self.client.post('/likes/bulk/', {
+            'like': [photo1.id, photo2.id],
+            'unlike': [photo3.id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            photo1.id: Like.objects.get(photo=photo1).id,
+            photo2.id: Like.objects.get(photo=photo2).id,
+            photo3.id: None,
+            })
+        self.assertFalse(Like.objects.filter(pk=like.pk).exists())
+        photo1.refresh_from_db()
+        photo3.refresh_from_db()
+        self.assertEqual(photo1.likes_count, 1)
+        self.assertEqual(photo3.likes_count, 0)
+
+    def test_already_liked_photos_are_ignored(self):
+        """
+        Tests if liking an already liked photo keeps the
+        existing like instead of failing.
+        """
+        photo = self.photos[0]
+        like = Like.objects.create(owner=self.user1, photo=photo)
+        self.client.force_login(self.user1)
+        response = self.client.post('/likes/bulk/', {
+            'like': [photo.id, photo.id],
+            }, format='json')
+        self.assertEqual(response.data, {photo.id: like.id})
+        photo.refresh_from_db()
+        self.assertEqual(photo.likes_count, 1)
+
+    def test_bulk_like_query_count(self):
+        """
+        Tests if the query count doesn't grow with the number
+        of photos liked or unliked.
+        """
+        self.client.force_login(self.user1)
+        first, *others = [photo.id for photo in self.photos]
+        for field in ['like', 'unlike']:
+            for photo_ids in [[first], others]:
+                with self.assertNumQueries(10):
+                    self.client.post(
+                        '/likes/bulk/', {field: photo_ids}, format='json'
+                        )
+        self.assertEqual(Like.objects.count(), 0)
+
+    def test_cannot_like_unknown_photo(self):
+        """
+        Tests if liking a photo that doesn't exist is rejected.
+        """
+        self.client.force_login(self.user1)
+        response = self.client.post('/likes/bulk/', {
+            'like': [self.photos[0].id, 999],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Like.objects.count(), 0)
+
+    def test_not_logged_in_user_cannot_bulk_like(self):
+        """
+        Tests if logged out users cannot like photos in bulk.
+        """
+        response = self.client.post('/likes/bulk/', {
+            'like': [self.photos[0].id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,25 +1,87 @@
+from django.db import transaction
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from captured_drf_api.bulk import delete_rows
+from captured_drf_api.cache import invalidate
+from captured_drf_api.counters import refresh_photo_counters
+from captured_drf_api.memberships import bump_memberships
+from captured_drf_api.mixins import OwnerQuerySetMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
 from likes.models import Like
-from likes.serializers import LikeSerializer
+from likes.serializers import BulkLikeSerializer, LikeSerializer
+from photos.models import Photo
+from trending.models import record_events
 
 
-class LikeList(generics.ListCreateAPIView):
+class LikeList(OwnerQuerySetMixin, generics.ListCreateAPIView):
     """
     Lists likes and handles creation of a like if logged in.
     """
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     serializer_class = LikeSerializer
     queryset = Like.objects.all()
+    select_related_fields = ['owner']
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class LikeDetail(generics.RetrieveDestroyAPIView):
+class LikeDetail(OwnerQuerySetMixin, generics.RetrieveDestroyAPIView):
     """
     Handles retrieving and deleting of likes by id if owned.
     """
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = LikeSerializer
     queryset = Like.objects.all()
+    select_related_fields = ['owner']
+
+
+class LikeBulk(generics.GenericAPIView):
+    """
+    Likes and unlikes several photos at once for the logged in user.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BulkLikeSerializer
+
+    def post(self, request):
+        """
+        Applies the likes and unlikes in one transaction, with one
+        conflict-ignoring INSERT and one DELETE. Both skip the model
+        signals, so the photo counters, trending events, membership
+        version and cached responses are updated explicitly, once for
+        the whole batch. Returns the like id per photo, null for
+        photos that aren't liked.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        like = serializer.validated_data['like']
+        unlike = serializer.validated_data['unlike']
+        photo_ids = like | unlike
+        with transaction.atomic():
+            new_likes = Like.objects.bulk_create(
+                [Like(owner=request.user, photo_id=pk) for pk in like],
+                ignore_conflicts=True,
+            )
+            unliked = list(Like.objects.filter(
+                owner=request.user, photo__in=unlike
+            ).values_list('pk', 'photo_id', 'created_at'))
+            delete_rows(Like, [pk for pk, _, _ in unliked])
+            rows = Like.objects.filter(
+                owner=request.user, photo__in=photo_ids
+            ).values_list('photo_id', 'id', 'created_at')
+            # Likes that already existed were ignored by the INSERT
+            # and keep their own creation time
+            created = {(obj.photo_id, obj.created_at) for obj in new_likes}
+            record_events(Like, created=[
+                (photo_id, created_at) for photo_id, _, created_at in rows
+                if (photo_id, created_at) in created
+            ], deleted=[
+                (photo_id, created_at) for _, photo_id, created_at in unliked
+            ])
+            refresh_photo_counters(photo_ids)
+            bump_memberships('likes', [request.user.id])
+        invalidate(Like)
+        invalidate(Photo, photo_ids)
+        like_ids = dict.fromkeys(photo_ids)
+        like_ids.update((photo_id, pk) for photo_id, pk, _ in rows)
+        return Response(like_ids)
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:43
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field, outer_field='pk'):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Photo = apps.get_model('photos', 'Photo')
+    Like = apps.get_model('likes', 'Like')
+    Comment = apps.get_model('comments', 'Comment')
+    Photo.objects.update(
+        likes_count=count_of(Like.objects.all(), 'photo'),
+        comments_count=count_of(Comment.objects.all(), 'photo'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photos', '0003_alter_photo_image'),
+        ('likes', '0001_initial'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='comments_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='photo',
+            name='likes_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_counters, migrations.RunPython.noop
+        ),
+    ]
@@ -1,5 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from captured_drf_api.search import (
+    update_search_index, remove_from_search_index, refresh_search_index,
+)
+from profiles.models import Profile
 
 
 class Photo(models.Model):
@@ -26,16 +33,100 @@ class Photo(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    likes_count = models.IntegerField(default=0, editable=False)
+    comments_count = models.IntegerField(default=0, editable=False)
+    search_document = models.TextField(blank=True, editable=False)
 
     class Meta:
         """
         Orders photos by date they were created
-        from newest to oldest.
+        from newest to oldest and indexes the columns
+        the photo list filters and orders by.
         """
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='photo_created_at_idx'),
+            models.Index(
+                fields=['owner', '-created_at'],
+                name='photo_owner_created_idx'
+            ),
+            models.Index(
+                fields=['-likes_count'], name='photo_likes_count_idx'
+            ),
+            models.Index(
+                fields=['-comments_count'], name='photo_comments_count_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns the id and title of the photo.
         """
         return f'{self.id} {self.title}'
+
+    def get_search_document(self):
+        """
+        Returns the text the photo is found by in searches.
+        """
+        return f'{self.owner.username} {self.title}'
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the photo with its search document and updates the
+        owner's profile counters in the same transaction. The search
+        document is also saved when only some fields are updated.
+        """
+        self.search_document = self.get_search_document()
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_document'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def increment_photos_count(sender, instance, created, **kwargs):
+    """
+    Increments the owner's profile photos count
+    upon the creation of a new photo.
+    """
+    if created:
+        Profile.objects.filter(owner_id=instance.owner_id).update(
+            photos_count=F('photos_count') + 1
+        )
+
+
+def decrement_photos_count(sender, instance, **kwargs):
+    """
+    Decrements the owner's profile photos count
+    upon the deletion of a photo.
+    """
+    Profile.objects.filter(owner_id=instance.owner_id).update(
+        photos_count=F('photos_count') - 1
+    )
+
+
+def update_owner_search_documents(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    """
+    Rewrites the search documents of the user's photos, which
+    start with the username, when the user is saved. Saves leaving
+    the username out of update_fields, like updating last_login,
+    are skipped.
+    """
+    if created or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    photos = Photo.objects.filter(owner=instance)
+    photos.update(search_document=Concat(
+        Value(f'{instance.username} '), 'title', output_field=TextField()
+    ))
+    refresh_search_index(photos)
+
+
+post_save.connect(increment_photos_count, sender=Photo)
+post_delete.connect(decrement_photos_count, sender=Photo)
+post_save.connect(update_search_index, sender=Photo)
+post_delete.connect(remove_from_search_index, sender=Photo)
+post_save.connect(update_owner_search_documents, sender=User)
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from captured_drf_api.fields import ImageURLField, ImageUploadField
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Photo
 from likes.models import Like
 
 
-class PhotoSerializer(serializers.ModelSerializer):
+class PhotoSerializer(BaseModelSerializer):
     """
     Serializes photo data.
     """
@@ -11,42 +13,30 @@ class PhotoSerializer(serializers.ModelSerializer):
     owner = serializers.ReadOnlyField(source='owner.username')
     camera_used = serializers.CharField(default='unstated')
     lense_used = serializers.CharField(default='unstated')
+    image = ImageUploadField(required=False)
     is_owner = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
-    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+    profile_image = ImageURLField(source='owner.profile.image')
     like_id = serializers.SerializerMethodField()
     likes_count = serializers.ReadOnlyField()
     comments_count = serializers.ReadOnlyField()
 
-    def validate_image(self, value):
-        """
-        Validates whether the image is the correct size.
-        """
-        if value.size > 2 * 1024 * 1024:
-            raise serializers.ValidationError('Image size larger than 2MB!')
-        if value.image.height > 4096:
-            raise serializers.ValidationError(
-                'Image height larger than 4096px!'
-            )
-        if value.image.width > 4096:
-            raise serializers.ValidationError(
-                'Image width larger than 4096px!'
-            )
-        return value
-
     def get_is_owner(self, obj):
         """
         Returns true if the user is the object owner.
         """
         request = self.context['request']
-        return request.user == obj.owner
+        return request.user.id == obj.owner_id
 
     def get_like_id(self, obj):
         """
-        Returns the id of the relevant like for the user and photo.
+        Returns the id of the relevant like for the user and photo,
+        using the like_id annotation from the view when available.
         """
         user = self.context['request'].user
         if user.is_authenticated:
+            if hasattr(obj, 'like_id'):
+                return obj.like_id
             like = Like.objects.filter(
                 owner=user, photo=obj
             ).first()
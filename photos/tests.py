@@ -1,7 +1,11 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from .models import Photo
+from likes.models import Like
 from rest_framework import status
 from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
 
 
 class PhotoListViewTests(APITestCase):
@@ -136,3 +140,281 @@ class PhotoModelTests(APITestCase):
             owner=user1, title='title 1'
         )
         self.assertEquals(str(Photo.objects.first()), "1 title 1")
+
+
+class PhotoCounterTests(APITestCase):
+    """
+    Tests the stored photo counters.
+    """
+    def setUp(self):
+        """
+        Sets up users and photos to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.photo1 = Photo.objects.create(owner=self.user1, title='title 1')
+        self.photo2 = Photo.objects.create(owner=self.user1, title='title 2')
+
+    def test_photos_count_follows_created_and_deleted_photos(self):
+        """
+        Tests if creating and deleting a photo updates
+        the photos count of the owner's profile.
+        """
+        self.user1.profile.refresh_from_db()
+        self.assertEqual(self.user1.profile.photos_count, 2)
+        self.photo2.delete()
+        self.user1.profile.refresh_from_db()
+        self.assertEqual(self.user1.profile.photos_count, 1)
+
+    def test_can_order_photos_by_stored_likes_count(self):
+        """
+        Tests if photos are ordered by the stored likes count.
+        """
+        Like.objects.create(owner=self.user1, photo=self.photo1)
+        Like.objects.create(owner=self.user2, photo=self.photo1)
+        Like.objects.create(owner=self.user2, photo=self.photo2)
+        response = self.client.get('/photos/?ordering=-likes_count')
+        results = response.data['results']
+        self.assertEqual(results[0]['id'], self.photo1.id)
+        self.assertEqual(results[0]['likes_count'], 2)
+        self.assertEqual(results[1]['likes_count'], 1)
+
+
+class PhotoSearchTests(APITestCase):
+    """
+    Tests the full text search of the photo list.
+    """
+    def setUp(self):
+        """
+        Sets up users and photos to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='alice', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='bob', password='password2'
+            )
+        self.sunset = Photo.objects.create(
+            owner=self.user1, title='Sunset over the harbour'
+            )
+        self.mountain = Photo.objects.create(
+            owner=self.user2, title='Mountain sunset'
+            )
+        Photo.objects.create(owner=self.user2, title='City lights')
+
+    def search(self, query):
+        """
+        Returns the ids of the photos found by the query.
+        """
+        response = self.client.get('/photos/', {'search': query})
+        return [photo['id'] for photo in response.data['results']]
+
+    def test_can_search_photos_by_title_words(self):
+        """
+        Tests if photos are found by whole and partial title words.
+        """
+        self.assertCountEqual(
+            self.search('sunset'), [self.sunset.id, self.mountain.id]
+            )
+        self.assertEqual(self.search('harb'), [self.sunset.id])
+        self.assertEqual(self.search('SUNSET mountain'), [self.mountain.id])
+
+    def test_can_search_photos_by_owner_username(self):
+        """
+        Tests if photos are found by the username of their owner.
+        """
+        self.assertEqual(self.search('alice'), [self.sunset.id])
+
+    def test_can_search_photos_by_new_username(self):
+        """
+        Tests if photos are found by their owner's new username
+        after a rename, and no longer by the old one.
+        """
+        self.user1.username = 'carol'
+        self.user1.save()
+        self.assertEqual(self.search('carol'), [self.sunset.id])
+        self.assertEqual(self.search('alice'), [])
+        self.assertEqual(
+            Photo.objects.get(pk=self.sunset.pk).search_document,
+            'carol Sunset over the harbour'
+            )
+
+    def test_search_matches_word_prefixes_only(self):
+        """
+        Tests if search terms match the start of words,
+        and no longer any substring of the title.
+        """
+        self.assertEqual(self.search('harb'), [self.sunset.id])
+        self.assertEqual(self.search('arbour'), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """
+        Tests if edited and deleted photos are reflected in searches.
+        """
+        self.sunset.title = 'Harbour at dawn'
+        self.sunset.save()
+        self.assertEqual(self.search('sunset'), [self.mountain.id])
+        self.assertEqual(self.search('dawn'), [self.sunset.id])
+        self.mountain.delete()
+        self.assertEqual(self.search('sunset'), [])
+
+    def test_saving_some_fields_saves_the_search_document(self):
+        """
+        Tests if saving a photo with update_fields also
+        stores its new search document.
+        """
+        self.sunset.title = 'Harbour at dawn'
+        self.sunset.save(update_fields=['title'])
+        self.assertEqual(
+            Photo.objects.get(pk=self.sunset.pk).search_document,
+            'alice Harbour at dawn'
+            )
+        self.assertEqual(self.search('dawn'), [self.sunset.id])
+
+    def test_search_terms_with_query_syntax_are_escaped(self):
+        """
+        Tests if characters with a meaning in full text query
+        syntax are treated as plain text.
+        """
+        self.assertEqual(self.search('"sunset* OR ('), [])
+        self.assertEqual(self.search('harbour"'), [self.sunset.id])
+
+    def test_search_keeps_requested_ordering(self):
+        """
+        Tests if an explicit ordering takes precedence over the rank.
+        """
+        Like.objects.create(owner=self.user1, photo=self.mountain)
+        response = self.client.get(
+            '/photos/', {'search': 'sunset', 'ordering': '-likes_count'}
+            )
+        self.assertEqual(response.data['results'][0]['id'], self.mountain.id)
+        self.assertEqual(response.data['count'], 2)
+
+
+class PhotoQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the photo views.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def create_photos(self, count):
+        """
+        Creates the given number of photos, each liked by user1.
+        """
+        for number in range(count):
+            photo = Photo.objects.create(
+                owner=self.user1, title=f'title {number}'
+                )
+            Like.objects.create(owner=self.user1, photo=photo)
+
+    def test_photo_list_budget(self):
+        """
+        Tests if the photo list runs the count and
+        page queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget('/photos/', 2, self.create_photos)
+
+    def test_photo_list_budget_logged_in(self):
+        """
+        Tests if the photo list of a logged in user also loads
+        the session and user at 1 and 100 rows, resolving the
+        like_id of the whole page in the page query.
+        """
+        self.client.force_login(self.user1)
+        self.assertListQueryBudget('/photos/', 4, self.create_photos)
+        response = self.client.get('/photos/')
+        for photo in response.data['results']:
+            self.assertIsNotNone(photo['like_id'])
+
+    def test_photo_detail_budget(self):
+        """
+        Tests if the photo detail runs the object query, plus
+        the session and user if logged in, with the user's like_id.
+        """
+        self.create_photos(1)
+        like = Like.objects.first()
+        self.assertQueryBudget(f'/photos/{like.photo_id}/', 1)
+        self.client.force_login(self.user1)
+        response = self.assertQueryBudget(f'/photos/{like.photo_id}/', 3)
+        self.assertEqual(response.data['like_id'], like.id)
+
+
+class PhotoSparseFieldsTests(APITestCase):
+    """
+    Tests the photo views with sparse fieldsets.
+    """
+    def setUp(self):
+        """
+        Sets up a user and a liked photo to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photo = Photo.objects.create(owner=self.user1, title='title')
+        self.like = Like.objects.create(owner=self.user1, photo=self.photo)
+
+    def test_photo_list_returns_requested_fields_only(self):
+        """
+        Tests if the photo list only serializes the requested fields.
+        """
+        response = self.client.get('/photos/?fields=id,image,likes_count')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data['results'][0]), {'id', 'image', 'likes_count'}
+            )
+        self.assertEqual(response.data['results'][0]['likes_count'], 1)
+
+    def test_sparse_photo_list_defers_unused_columns(self):
+        """
+        Tests if the photo list only selects the columns
+        the requested fields read, without joins.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/photos/?fields=id,image,likes_count')
+        sql = queries[-1]['sql']
+        self.assertNotIn('description', sql)
+        self.assertNotIn('JOIN', sql)
+
+    def test_sparse_photo_list_skips_like_id_annotation(self):
+        """
+        Tests if the like_id annotation is only computed when requested.
+        """
+        self.client.force_login(self.user1)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/photos/?fields=id,is_owner')
+        self.assertNotIn('likes_like', queries[-1]['sql'])
+        self.assertTrue(response.data['results'][0]['is_owner'])
+        response = self.client.get('/photos/?fields=id,like_id')
+        self.assertEqual(
+            response.data['results'][0]['like_id'], self.like.id
+            )
+
+    def test_sparse_photo_detail_joins_profile_when_requested(self):
+        """
+        Tests if the photo detail still resolves the
+        profile fields in the same query when requested.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/photos/{self.photo.id}/?fields=id,profile_id,profile_image'
+                )
+        self.assertEqual(
+            response.data['profile_id'], self.user1.profile.id
+            )
+
+    def test_unknown_field_is_rejected(self):
+        """
+        Tests if requesting an unknown field returns a 400 response.
+        """
+        response = self.client.get('/photos/?fields=id,nonexistent')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,27 +1,72 @@
-from django.db.models import Count
+from django.db.models import OuterRef, Subquery
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from captured_drf_api.cache import CachedResponseMixin
+from captured_drf_api.conditional import ConditionalGetMixin
+from captured_drf_api.images import IMAGE_UPLOAD_PARSER_CLASSES
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
+from captured_drf_api.search import FullTextSearchFilter
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from profiles.models import Profile
 from .models import Photo
 from .serializers import PhotoSerializer
 
+PHOTO_ETAG_FIELDS = [
+    'updated_at', 'likes_count', 'comments_count', 'like_id',
+    'owner__username', 'owner__profile__updated_at',
+]
 
-class PhotoList(generics.ListCreateAPIView):
+
+class PhotoQuerySetMixin:
+    """
+    Annotates photos with the id of the requesting user's like
+    so it is resolved for the whole page in a single query, unless
+    a sparse fieldset leaves it out.
+    """
+    method_field_sources = {
+        'is_owner': ['owner'],
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated and self.wants_field('like_id'):
+            queryset = queryset.annotate(
+                like_id=Subquery(
+                    Like.objects.filter(
+                        owner=user, photo=OuterRef('pk')
+                    ).values('id')[:1]
+                )
+            )
+        return queryset
+
+
+class PhotoList(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    PhotoQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListCreateAPIView
+):
     """
     Lists photos and handles creation of a photo if logged in.
     """
 
     serializer_class = PhotoSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    parser_classes = IMAGE_UPLOAD_PARSER_CLASSES
 
-    queryset = Photo.objects.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comment', distinct=True)
-    ).order_by('-created_at')
+    queryset = Photo.objects.order_by('-created_at')
+    cache_models = [Photo, Like, Comment, Follower, Profile]
+    etag_fields = PHOTO_ETAG_FIELDS
 
     filter_backends = [
         filters.OrderingFilter,
-        filters.SearchFilter,
+        FullTextSearchFilter,
         DjangoFilterBackend,
     ]
 
@@ -46,13 +91,19 @@ class PhotoList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class PhotoDetail(generics.RetrieveUpdateDestroyAPIView):
+class PhotoDetail(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    PhotoQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Handles retrieving, updating and deleting photos by id if owned.
     """
     serializer_class = PhotoSerializer
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Photo.objects.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comment', distinct=True)
-    ).order_by('-created_at')
+    parser_classes = IMAGE_UPLOAD_PARSER_CLASSES
+    queryset = Photo.objects.order_by('-created_at')
+    etag_fields = PHOTO_ETAG_FIELDS
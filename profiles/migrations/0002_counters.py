@@ -0,0 +1,62 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:43
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field, outer_field='pk'):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Photo = apps.get_model('photos', 'Photo')
+    Follower = apps.get_model('followers', 'Follower')
+    Profile.objects.update(
+        photos_count=count_of(Photo.objects.all(), 'owner', 'owner'),
+        followers_count=count_of(
+            Follower.objects.all(), 'followed', 'owner'
+        ),
+        following_count=count_of(Follower.objects.all(), 'owner', 'owner'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+        ('photos', '0001_initial'),
+        ('followers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='photos_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_counters, migrations.RunPython.noop
+        ),
+    ]
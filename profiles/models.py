@@ -16,13 +16,36 @@ class Profile(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    photos_count = models.IntegerField(default=0, editable=False)
+    followers_count = models.IntegerField(default=0, editable=False)
+    following_count = models.IntegerField(default=0, editable=False)
+    likes_version = models.IntegerField(default=0, editable=False)
+    follows_version = models.IntegerField(default=0, editable=False)
+    attendances_version = models.IntegerField(default=0, editable=False)
 
     class Meta:
         """
         Orders profiles by date they were created
-        from newest to oldest.
+        from newest to oldest and indexes the columns
+        the profile list orders by.
         """
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'], name='profile_created_at_idx'
+            ),
+            models.Index(
+                fields=['-photos_count'], name='profile_photos_count_idx'
+            ),
+            models.Index(
+                fields=['-followers_count'],
+                name='profile_followers_count_idx'
+            ),
+            models.Index(
+                fields=['-following_count'],
+                name='profile_following_count_idx'
+            ),
+        ]
 
     def __str__(self):
         """
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Profile
 from followers.models import Follower
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(BaseModelSerializer):
     """
     Serializes profile data.
     """
@@ -19,14 +20,17 @@ class ProfileSerializer(serializers.ModelSerializer):
         Returns true if the user is the object owner.
         """
         request = self.context['request']
-        return request.user == obj.owner
+        return request.user.id == obj.owner_id
 
     def get_following_id(self, obj):
         """
-        Returns the id of profiles a user is following.
+        Returns the id of profiles a user is following,
+        using the following_id annotation from the view when available.
         """
         user = self.context['request'].user
         if user.is_authenticated:
+            if hasattr(obj, 'following_id'):
+                return obj.following_id
             following = Follower.objects.filter(
                 owner=user, followed=obj.owner
             ).first()
@@ -1,7 +1,9 @@
 from django.contrib.auth.models import User
 from .models import Profile
+from followers.models import Follower
 from rest_framework import status
 from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
 
 
 class ProfileListViewTests(APITestCase):
@@ -113,3 +115,108 @@ class ProfileModelTests(APITestCase):
             username='user3', password='password3'
             )
         self.assertEquals(str(Profile.objects.first()), "user3's profile")
+
+
+class ProfileQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the profile views.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def create_profiles(self, count):
+        """
+        Creates the given number of users, each followed by user1.
+        """
+        start = User.objects.count()
+        for number in range(start, start + count):
+            user = User.objects.create(username=f'followed{number}')
+            Follower.objects.create(owner=self.user1, followed=user)
+
+    def test_profile_list_budget(self):
+        """
+        Tests if the profile list runs the count and
+        page queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget(
+            '/profiles/', 2, self.create_profiles, existing=1
+            )
+
+    def test_profile_list_budget_logged_in(self):
+        """
+        Tests if the profile list of a logged in user also loads
+        the session and user at 1 and 100 rows, resolving the
+        following_id of the whole page in the page query.
+        """
+        self.client.force_login(self.user1)
+        self.assertListQueryBudget(
+            '/profiles/', 4, self.create_profiles, existing=1
+            )
+        response = self.client.get('/profiles/')
+        for profile in response.data['results']:
+            if not profile['is_owner']:
+                self.assertIsNotNone(profile['following_id'])
+
+    def test_profile_detail_budget(self):
+        """
+        Tests if the profile detail runs the object query, plus
+        the session and user if logged in, with the following_id.
+        """
+        self.create_profiles(1)
+        follower = Follower.objects.first()
+        profile_id = follower.followed.profile.id
+        self.assertQueryBudget(f'/profiles/{profile_id}/', 1)
+        self.client.force_login(self.user1)
+        response = self.assertQueryBudget(f'/profiles/{profile_id}/', 3)
+        self.assertEqual(response.data['following_id'], follower.id)
+
+
+class ProfileSparseFieldsTests(APITestCase):
+    """
+    Tests the profile views with sparse fieldsets.
+    """
+    def setUp(self):
+        """
+        Sets up two users, one following the other, to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.user2 = User.objects.create_user(
+            username='user2', password='password2'
+            )
+        self.follower = Follower.objects.create(
+            owner=self.user1, followed=self.user2
+            )
+
+    def test_profile_list_returns_requested_fields_only(self):
+        """
+        Tests if the profile list only serializes the requested fields.
+        """
+        self.client.force_login(self.user1)
+        response = self.client.get(
+            '/profiles/?fields=owner,is_owner,following_id'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'owner': 'user2', 'is_owner': False,
+             'following_id': self.follower.id},
+            {'owner': 'user1', 'is_owner': True, 'following_id': None},
+        ])
+
+    def test_fields_are_ignored_when_updating(self):
+        """
+        Tests if an update returns every field whatever the fields param.
+        """
+        self.client.force_login(self.user1)
+        response = self.client.put(
+            f'/profiles/{self.user1.profile.id}/?fields=id',
+            {'name': 'new name'}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'new name')
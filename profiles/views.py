@@ -1,28 +1,63 @@
-from django.db.models import Count
+from django.db.models import OuterRef, Subquery
 from rest_framework import generics, filters, status
 from django_filters.rest_framework import DjangoFilterBackend
+from captured_drf_api.cache import CachedResponseMixin
+from captured_drf_api.conditional import ConditionalGetMixin
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
 from captured_drf_api.permissions import IsOwnerOrReadOnly
+from followers.models import Follower
+from photos.models import Photo
 from .models import Profile
 from .serializers import ProfileSerializer
 from rest_framework.response import Response
 
+PROFILE_ETAG_FIELDS = [
+    'updated_at', 'photos_count', 'followers_count', 'following_count',
+    'following_id', 'owner__username',
+]
 
-class ProfileList(generics.ListAPIView):
+
+class ProfileQuerySetMixin:
+    """
+    Annotates profiles with the id of the requesting user's follower
+    object for the profile owner, computed in the same statement
+    as the profile page, unless a sparse fieldset leaves it out.
+    """
+    method_field_sources = {
+        'is_owner': ['owner'],
+        'following_id': ['owner'],
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated and self.wants_field('following_id'):
+            queryset = queryset.annotate(
+                following_id=Subquery(
+                    Follower.objects.filter(
+                        owner=user, followed=OuterRef('owner')
+                    ).values('id')[:1]
+                )
+            )
+        return queryset
+
+
+class ProfileList(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ProfileQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListAPIView
+):
     """
     Lists all profiles.
     """
-    queryset = Profile.objects.annotate(
-        photos_count=Count('owner__photo', distinct=True),
-        followers_count=Count(
-            'owner__followed',
-            distinct=True
-            ),
-        following_count=Count(
-            'owner__following',
-            distinct=True
-        )
-    ).order_by('-created_at')
+    queryset = Profile.objects.order_by('-created_at')
     serializer_class = ProfileSerializer
+    select_related_fields = ['owner']
+    cache_models = [Profile, Photo, Follower]
+    etag_fields = PROFILE_ETAG_FIELDS
     filter_backends = [
         filters.OrderingFilter,
         DjangoFilterBackend,
@@ -42,17 +77,22 @@ class ProfileList(generics.ListAPIView):
     ]
 
 
-class ProfileDetail(generics.RetrieveUpdateDestroyAPIView):
+class ProfileDetail(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ProfileQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Handles retrieving and updating profiles by id if owned.
     """
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Profile.objects.annotate(
-        photos_count=Count('owner__photo', distinct=True),
-        followers_count=Count('owner__followed', distinct=True),
-        following_count=Count('owner__following', distinct=True)
-    ).order_by('-created_at')
+    queryset = Profile.objects.order_by('-created_at')
     serializer_class = ProfileSerializer
+    select_related_fields = ['owner']
+    etag_fields = PROFILE_ETAG_FIELDS
 
     def perform_destroy(self, instance):
         """
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from suggestions.models import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    """
+    Recomputes every user's follow suggestions from the whole follow
+    graph. Follows and unfollows only update the suggestions of the
+    user making them, so this is meant to run periodically, e.g.
+    nightly from a scheduler.
+    """
+    help = 'Rebuilds the follow suggestions of every user.'
+
+    def handle(self, *args, **options):
+        stored = rebuild_suggestions()
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {stored} suggestions.'
+        ))
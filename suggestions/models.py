@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from followers.models import Follower
+from .graph import FollowGraph
+
+BATCH_SIZE = 1000
+
+
+class Suggestion(models.Model):
+    """
+    The model for an account suggested to a user to follow,
+    one of their top SUGGESTIONS_PER_USER candidates by score.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='suggestions'
+        )
+    suggested = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='suggested_to'
+        )
+    score = models.FloatField()
+
+    class Meta:
+        """
+        Orders suggestions from highest to lowest score, ensures a user
+        isn't suggested the same account twice and indexes each user's
+        suggestions by score.
+        """
+        unique_together = ['owner', 'suggested']
+        ordering = ['-score']
+        indexes = [
+            models.Index(
+                fields=['owner', '-score'], name='suggestion_owner_score_idx'
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Returns the owner, suggested user and score.
+        """
+        return f'{self.owner_id} {self.suggested_id} {self.score}'
+
+
+def build_suggestions(graph, owner_id):
+    """
+    Returns the unsaved suggestions of the owner in the graph.
+    """
+    return [
+        Suggestion(owner_id=owner_id, suggested_id=suggested_id, score=score)
+        for suggested_id, score in graph.suggest(
+            owner_id, settings.SUGGESTIONS_PER_USER
+        )
+    ]
+
+
+def rebuild_suggestions():
+    """
+    Recomputes the suggestions of every user from one in-memory
+    load of the follow graph and returns how many were stored.
+    """
+    graph = FollowGraph.load()
+    stored = 0
+    with transaction.atomic():
+        Suggestion.objects.all().delete()
+        for start in range(0, len(graph.owners), BATCH_SIZE):
+            suggestions = []
+            for owner_id in graph.owners[start:start + BATCH_SIZE]:
+                suggestions.extend(build_suggestions(graph, owner_id))
+            Suggestion.objects.bulk_create(suggestions)
+            stored += len(suggestions)
+    return stored
+
+
+def update_suggestions(owner_id):
+    """
+    Recomputes the suggestions of the owner from the follows
+    around them, after they follow or unfollow someone.
+    """
+    suggestions = build_suggestions(FollowGraph.around(owner_id), owner_id)
+    with transaction.atomic():
+        Suggestion.objects.filter(owner_id=owner_id).delete()
+        Suggestion.objects.bulk_create(suggestions)
+
+
+def update_owner_suggestions(sender, instance, created=True, **kwargs):
+    """
+    Recomputes the owner's suggestions upon the creation or deletion
+    of a follower, once the change is committed. The suggestions of
+    their own followers, which reach the followed user in two hops,
+    are left to the next rebuild_suggestions run.
+    """
+    if created:
+        owner_id = instance.owner_id
+        transaction.on_commit(lambda: update_suggestions(owner_id))
+
+
+post_save.connect(update_owner_suggestions, sender=Follower)
+post_delete.connect(update_owner_suggestions, sender=Follower)
@@ -0,0 +1,194 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin
+from followers.models import Follower
+from .graph import FollowGraph
+from .models import Suggestion, rebuild_suggestions
+
+
+class SuggestionTestMixin:
+    """
+    Sets up users where user0 follows user1 and user2, user1 follows
+    user0, user3 and user4 and user2 follows user3, so user3 is
+    suggested to user0 through two users and user4 through one.
+    """
+    def setUp(self):
+        """
+        Sets up the users and follows to be used in the tests.
+        """
+        self.users = [
+            User.objects.create_user(
+                username=f'user{number}', password='password'
+                )
+            for number in range(5)
+        ]
+        self.edges = [(0, 1), (0, 2), (1, 0), (1, 3), (1, 4), (2, 3)]
+        for owner, followed in self.edges:
+            Follower.objects.create(
+                owner=self.users[owner], followed=self.users[followed]
+                )
+
+    def get_suggested(self, user):
+        """
+        Returns the ids of the users suggested to the user, best first.
+        """
+        return list(Suggestion.objects.filter(
+            owner=user
+            ).values_list('suggested_id', flat=True))
+
+
+class FollowGraphTests(SuggestionTestMixin, APITestCase):
+    """
+    Tests the in-memory follow graph.
+    """
+    def test_rows_hold_the_sorted_followed_ids(self):
+        """
+        Tests if each row holds the ids a user follows in order,
+        and users following nobody get an empty row.
+        """
+        graph = FollowGraph.load()
+        ids = [user.id for user in self.users]
+        self.assertEqual(
+            list(graph.following(ids[1])), [ids[0], ids[3], ids[4]]
+            )
+        self.assertEqual(list(graph.following(ids[4])), [])
+        self.assertEqual(len(graph.targets), len(self.edges))
+
+    def test_candidates_are_scored_by_weighted_paths(self):
+        """
+        Tests if candidates are the users two hops away, leaving out
+        the user and the users they follow, with every path weighted
+        by the following count of the user in between.
+        """
+        graph = FollowGraph.load()
+        suggested = graph.suggest(self.users[0].id, 10)
+        self.assertEqual(
+            [user_id for user_id, _ in suggested],
+            [self.users[3].id, self.users[4].id]
+            )
+        self.assertAlmostEqual(suggested[0][1], 1.5)
+        self.assertAlmostEqual(suggested[1][1], 0.5)
+        self.assertEqual(len(graph.suggest(self.users[0].id, 1)), 1)
+
+    def test_graph_around_a_user_scores_the_same(self):
+        """
+        Tests if the graph of the follows around a user suggests
+        the same as the whole graph.
+        """
+        for user in self.users:
+            self.assertEqual(
+                FollowGraph.around(user.id).suggest(user.id, 10),
+                FollowGraph.load().suggest(user.id, 10)
+                )
+
+
+class SuggestionUpdateTests(SuggestionTestMixin, APITestCase):
+    """
+    Tests the rebuilding and updating of suggestions.
+    """
+    def test_rebuild_stores_the_suggestions_of_every_user(self):
+        """
+        Tests if a rebuild stores every user's suggestions by score.
+        """
+        self.assertEqual(rebuild_suggestions(), 3)
+        self.assertEqual(
+            self.get_suggested(self.users[0]),
+            [self.users[3].id, self.users[4].id]
+            )
+        self.assertEqual(
+            self.get_suggested(self.users[1]), [self.users[2].id]
+            )
+
+    def test_following_and_unfollowing_update_the_owner(self):
+        """
+        Tests if following a suggested user drops them from the
+        owner's suggestions and unfollowing brings them back.
+        """
+        rebuild_suggestions()
+        user0, user3 = self.users[0], self.users[3]
+        with self.captureOnCommitCallbacks(execute=True):
+            follower = Follower.objects.create(owner=user0, followed=user3)
+        self.assertEqual(self.get_suggested(user0), [self.users[4].id])
+        with self.captureOnCommitCallbacks(execute=True):
+            follower.delete()
+        self.assertEqual(
+            self.get_suggested(user0), [user3.id, self.users[4].id]
+            )
+
+    def test_bulk_follow_updates_the_owner(self):
+        """
+        Tests if following users in bulk updates the owner's suggestions.
+        """
+        rebuild_suggestions()
+        self.client.force_login(self.users[0])
+        response = self.client.post('/followers/bulk/', {
+            'follow': [self.users[4].id],
+            'unfollow': [self.users[2].id],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_suggested(self.users[0]), [self.users[3].id]
+            )
+
+    def test_deleting_a_user_drops_their_suggestions(self):
+        """
+        Tests if deleting a user removes them from suggestions.
+        """
+        rebuild_suggestions()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[3].delete()
+        self.assertEqual(
+            self.get_suggested(self.users[0]), [self.users[4].id]
+            )
+
+    def test_rebuild_suggestions_command(self):
+        """
+        Tests if the command reports the number of suggestions stored.
+        """
+        out = StringIO()
+        call_command('rebuild_suggestions', stdout=out)
+        self.assertIn('Stored 3 suggestions.', out.getvalue())
+
+
+class ProfileSuggestionsViewTests(
+    SuggestionTestMixin, QueryBudgetMixin, APITestCase
+):
+    """
+    Tests the profile suggestions view.
+    """
+    def setUp(self):
+        """
+        Sets up the users and follows and rebuilds the suggestions.
+        """
+        super().setUp()
+        rebuild_suggestions()
+
+    def test_logged_in_user_can_list_suggestions(self):
+        """
+        Tests if the suggested profiles are listed best first.
+        """
+        self.client.force_login(self.users[0])
+        response = self.client.get('/profiles/suggestions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [profile['owner'] for profile in response.data],
+            ['user3', 'user4']
+            )
+
+    def test_not_logged_in_user_cannot_list_suggestions(self):
+        """
+        Tests if logged out users cannot list suggestions.
+        """
+        response = self.client.get('/profiles/suggestions/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_suggestions_budget(self):
+        """
+        Tests if the suggestions are listed in one query
+        after the session and user are loaded.
+        """
+        self.client.force_login(self.users[0])
+        self.assertQueryBudget('/profiles/suggestions/', 3)
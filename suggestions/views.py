@@ -0,0 +1,27 @@
+from rest_framework import generics, permissions
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
+from profiles.models import Profile
+from profiles.serializers import ProfileSerializer
+from profiles.views import ProfileQuerySetMixin
+
+
+class ProfileSuggestions(
+    ProfileQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListAPIView
+):
+    """
+    Lists the profiles suggested to the requesting user to follow,
+    from the best suggestion to the worst.
+    """
+    serializer_class = ProfileSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    select_related_fields = ['owner']
+    queryset = Profile.objects.all()
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            owner__suggested_to__owner=self.request.user
+        ).order_by('-owner__suggested_to__score', 'owner_id')
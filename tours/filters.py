@@ -0,0 +1,38 @@
+from django_filters import rest_framework as filters
+from captured_drf_api.clock import today
+from .models import Tour
+
+
+class TourFilter(filters.FilterSet):
+    """
+    Filters tours by attendee, place and start date. upcoming and
+    past compare start_date with the request's date, so they are
+    range scans on the start_date index.
+    """
+    upcoming = filters.BooleanFilter(method='filter_upcoming')
+    past = filters.BooleanFilter(method='filter_past')
+
+    class Meta:
+        model = Tour
+        fields = {
+            'attendances__owner__profile': ['exact'],
+            'start_date': ['range'],
+            'country': ['exact'],
+            'city': ['exact'],
+        }
+
+    def filter_upcoming(self, queryset, name, value):
+        """
+        Returns the tours starting after today, or the
+        others when the value is false.
+        """
+        if value:
+            return queryset.filter(start_date__gt=today(self.request))
+        return queryset.filter(start_date__lte=today(self.request))
+
+    def filter_past(self, queryset, name, value):
+        """
+        Returns the tours that started today or before, or
+        the others when the value is false.
+        """
+        return self.filter_upcoming(queryset, name, not value)
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:43
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field, outer_field='pk'):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Tour = apps.get_model('tours', 'Tour')
+    Attendance = apps.get_model('attendances', 'Attendance')
+    Tour.objects.update(
+        attendance_count=count_of(Attendance.objects.all(), 'tour'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0005_alter_tour_price'),
+        ('attendances', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='attendance_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            populate_counters, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:48
+
+from django.db import migrations, models
+from captured_drf_api.search import create_search_index, drop_search_index
+
+
+def populate_search_documents(apps, schema_editor):
+    Tour = apps.get_model('tours', 'Tour')
+    for tour in Tour.objects.iterator():
+        tour.search_document = f'{tour.title} {tour.country} {tour.city}'
+        tour.save(update_fields=['search_document'])
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor, apps.get_model('tours', 'Tour'))
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor, apps.get_model('tours', 'Tour'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0007_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(
+            populate_search_documents, migrations.RunPython.noop
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
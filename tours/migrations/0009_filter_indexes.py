@@ -0,0 +1,21 @@
+# Generated by Django 3.2.19 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0008_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['start_date'], name='tour_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['country', 'city'], name='tour_country_city_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from captured_drf_api.search import (
+    update_search_index, remove_from_search_index,
+)
 
 
 class Tour(models.Model):
@@ -27,16 +31,52 @@ class Tour(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    attendance_count = models.IntegerField(default=0, editable=False)
+    search_document = models.TextField(blank=True, editable=False)
 
     class Meta:
         """
         Orders tours by date they were created
-        from newest to oldest.
+        from newest to oldest and indexes the columns
+        the tour list orders and filters by.
         """
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='tour_created_at_idx'),
+            models.Index(
+                fields=['-attendance_count'], name='tour_attendance_count_idx'
+            ),
+            models.Index(fields=['start_date'], name='tour_start_date_idx'),
+            models.Index(
+                fields=['country', 'city'], name='tour_country_city_idx'
+            ),
+        ]
 
     def __str__(self):
         """
         Returns the id and title of the tour.
         """
         return f'{self.id} {self.title}'
+
+    def get_search_document(self):
+        """
+        Returns the text the tour is found by in searches.
+        """
+        return f'{self.title} {self.country} {self.city}'
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the tour with its search document and updates the
+        search index in the same transaction. The search document
+        is also saved when only some fields are updated.
+        """
+        self.search_document = self.get_search_document()
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_document'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+post_save.connect(update_search_index, sender=Tour)
+post_delete.connect(remove_from_search_index, sender=Tour)
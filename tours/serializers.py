@@ -1,12 +1,12 @@
 from rest_framework import serializers
+from captured_drf_api.clock import today
+from captured_drf_api.fields import ImageUploadField
+from captured_drf_api.serializers import BaseModelSerializer
 from .models import Tour
 from attendances.models import Attendance
-from datetime import date, datetime, timedelta
 
-TOMORROW = date.today() + timedelta(days=1)
 
-
-class TourSerializer(serializers.ModelSerializer):
+class TourSerializer(BaseModelSerializer):
     """
     Serializes tour data.
     """
@@ -23,36 +23,18 @@ class TourSerializer(serializers.ModelSerializer):
         )
     owner = serializers.ReadOnlyField(source='owner.username')
     guide = serializers.CharField(default='currently unknown')
+    image = ImageUploadField(required=False, allow_null=True)
     is_owner = serializers.SerializerMethodField()
     has_passed = serializers.SerializerMethodField()
     profile_id = serializers.ReadOnlyField(source='owner.profile.id')
     attendance_id = serializers.SerializerMethodField()
     attendance_count = serializers.ReadOnlyField()
 
-    def validate_image(self, value):
-        """
-        Validates whether the image is the correct size.
-        """
-        if value:
-            if value.size > 2 * 1024 * 1024:
-                raise serializers.ValidationError(
-                    'Image size larger than 2MB!'
-                    )
-            if value.image.height > 4096:
-                raise serializers.ValidationError(
-                    'Image height larger than 4096px!'
-                )
-            if value.image.width > 4096:
-                raise serializers.ValidationError(
-                    'Image width larger than 4096px!'
-                )
-        return value
-
     def validate_start_date(self, value):
         """
         Validates whether the start date is a present or past date.
         """
-        if value < TOMORROW:
+        if value <= today(self.context.get('request')):
             raise serializers.ValidationError(
                 "Start date cannot be a present or past date."
                 )
@@ -73,20 +55,23 @@ class TourSerializer(serializers.ModelSerializer):
         Returns true if the user is the object owner.
         """
         request = self.context['request']
-        return request.user == obj.owner
+        return request.user.id == obj.owner_id
 
     def get_has_passed(self, obj):
         """
         Returns true if the object start date is a present or past date.
         """
-        return TOMORROW > obj.start_date
+        return obj.start_date <= today(self.context.get('request'))
 
     def get_attendance_id(self, obj):
         """
-        Returns the id of the relevant attendance for the user and tour.
+        Returns the id of the relevant attendance for the user and tour,
+        using the attendance_id annotation from the view when available.
         """
         user = self.context['request'].user
         if user.is_authenticated:
+            if hasattr(obj, 'attendance_id'):
+                return obj.attendance_id
             attendance = Attendance.objects.filter(
                 owner=user, tour=obj
             ).first()
@@ -1,9 +1,15 @@
+import datetime
 from django.contrib.auth.models import User
 from .models import Tour
+from attendances.models import Attendance
 from rest_framework import status
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.test import APITestCase
+from captured_drf_api.testing import QueryBudgetMixin, fixed_clock, page_size
 
 
+@override_settings(API_CLOCK=fixed_clock('2024-06-01'))
 class TourListViewTests(APITestCase):
     """
     Tests the list view for the tours app.
@@ -70,6 +76,7 @@ class TourListViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+@override_settings(API_CLOCK=fixed_clock('2024-06-01'))
 class TourDetailViewTests(APITestCase):
     """
     Tests the detail view for the tours app.
@@ -177,3 +184,348 @@ class TourModelTests(APITestCase):
             city='London'
             )
         self.assertEquals(str(Tour.objects.first()), "1 title 1")
+
+
+class TourSearchTests(APITestCase):
+    """
+    Tests the full text search of the tour list.
+    """
+    def test_can_search_tours_by_title_country_and_city(self):
+        """
+        Tests if tours are found by their title, country and city.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        london = Tour.objects.create(
+            title='Street photography',
+            owner=user1,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='England',
+            city='London'
+            )
+        Tour.objects.create(
+            title='Alpine landscapes',
+            owner=user1,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='Switzerland',
+            city='Zermatt'
+            )
+        for query in ['street', 'england', 'lond']:
+            response = self.client.get('/tours/', {'search': query})
+            self.assertEqual(
+                [tour['id'] for tour in response.data['results']],
+                [london.id]
+                )
+
+    def test_saving_some_fields_saves_the_search_document(self):
+        """
+        Tests if saving a tour with update_fields also
+        stores its new search document.
+        """
+        user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        tour = Tour.objects.create(
+            title='Street photography',
+            owner=user1,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='England',
+            city='London'
+            )
+        tour.city = 'York'
+        tour.save(update_fields=['city'])
+        self.assertEqual(
+            Tour.objects.get(pk=tour.pk).search_document,
+            'Street photography England York'
+            )
+
+
+class TourQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the query budgets of the tour views.
+    """
+    def setUp(self):
+        """
+        Sets up a user to be used in the tests.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+
+    def create_tours(self, count):
+        """
+        Creates the given number of tours, each attended by user1.
+        """
+        for number in range(count):
+            tour = Tour.objects.create(
+                title=f'title {number}',
+                owner=self.user1,
+                start_date='2024-11-11',
+                end_date='2024-12-12',
+                booking_means='book online',
+                country='England',
+                city='London'
+                )
+            Attendance.objects.create(owner=self.user1, tour=tour)
+
+    def test_tour_list_budget(self):
+        """
+        Tests if the tour list runs the count and
+        page queries at 1 and 100 rows.
+        """
+        self.assertListQueryBudget('/tours/', 2, self.create_tours)
+
+    def test_tour_list_budget_logged_in(self):
+        """
+        Tests if the tour list of a logged in user also loads
+        the session and user at 1 and 100 rows, resolving the
+        attendance_id of every row in the page query.
+        """
+        self.client.force_login(self.user1)
+        self.assertListQueryBudget('/tours/', 4, self.create_tours)
+        with page_size(100):
+            response = self.client.get('/tours/')
+        self.assertEqual(len(response.data['results']), 100)
+        for tour in response.data['results']:
+            self.assertIsNotNone(tour['attendance_id'])
+
+    def test_tour_detail_budget(self):
+        """
+        Tests if the tour detail runs the object query, plus
+        the session and user if logged in, with the attendance_id.
+        """
+        self.create_tours(1)
+        attendance = Attendance.objects.first()
+        self.assertQueryBudget(f'/tours/{attendance.tour_id}/', 1)
+        self.client.force_login(self.user1)
+        response = self.assertQueryBudget(
+            f'/tours/{attendance.tour_id}/', 3
+            )
+        self.assertEqual(response.data['attendance_id'], attendance.id)
+
+
+class TourSparseFieldsTests(APITestCase):
+    """
+    Tests the tour views with sparse fieldsets.
+    """
+    def setUp(self):
+        """
+        Sets up an admin user and an attended tour to be used in the tests.
+        """
+        self.admin = User.objects.create_user(
+            username='admin', password='password1', is_staff=True
+            )
+        self.tour = Tour.objects.create(
+            title='title 1',
+            owner=self.admin,
+            start_date='2024-11-11',
+            end_date='2024-12-12',
+            booking_means='book online',
+            country='England',
+            city='London',
+            )
+        Attendance.objects.create(owner=self.admin, tour=self.tour)
+
+    def test_tour_list_returns_requested_fields_only(self):
+        """
+        Tests if the tour list only serializes the requested fields
+        and method fields still read their deferred columns.
+        """
+        response = self.client.get('/tours/?fields=id,title,has_passed')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.tour.id, 'title': 'title 1', 'has_passed': True}
+            )
+
+    def test_sparse_tour_detail_skips_attendance_id(self):
+        """
+        Tests if the tour detail of a logged in user runs the same
+        queries without the attendance_id annotation when it isn't
+        requested.
+        """
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/tours/{self.tour.id}/?fields=id')
+        self.assertEqual(response.data, {'id': self.tour.id})
+
+
+@override_settings(API_CLOCK=fixed_clock('2024-06-01'))
+class TourDateTests(APITestCase):
+    """
+    Tests the tour fields and filters depending on the current date.
+    """
+    def setUp(self):
+        """
+        Sets up a past, a current and an upcoming tour.
+        """
+        self.admin = User.objects.create_user(
+            username='admin', password='password1', is_staff=True
+            )
+        for title, start_date, country, city in [
+            ('past', '2024-05-01', 'England', 'London'),
+            ('today', '2024-06-01', 'France', 'Paris'),
+            ('upcoming', '2024-07-01', 'England', 'York'),
+        ]:
+            Tour.objects.create(
+                title=title,
+                owner=self.admin,
+                start_date=start_date,
+                end_date='2024-12-12',
+                booking_means='book online',
+                country=country,
+                city=city,
+                )
+
+    def get_titles(self, query):
+        """
+        Returns the titles of the tours listed for the query.
+        """
+        response = self.client.get(f'/tours/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(tour['title'] for tour in response.data['results'])
+
+    def test_has_passed_uses_the_request_date(self):
+        """
+        Tests if has_passed is true for tours starting today or before.
+        """
+        response = self.client.get('/tours/')
+        self.assertEqual(
+            {
+                tour['title']: tour['has_passed']
+                for tour in response.data['results']
+            },
+            {'past': True, 'today': True, 'upcoming': False}
+            )
+
+    def test_has_passed_follows_the_clock(self):
+        """
+        Tests if has_passed changes with the clock, without restarting.
+        """
+        with override_settings(API_CLOCK=fixed_clock('2024-08-01')):
+            response = self.client.get('/tours/')
+        self.assertTrue(all(
+            tour['has_passed'] for tour in response.data['results']
+            ))
+
+    def test_can_filter_upcoming_and_past_tours(self):
+        """
+        Tests if the upcoming and past filters split tours by today.
+        """
+        self.assertEqual(self.get_titles('upcoming=true'), ['upcoming'])
+        self.assertEqual(self.get_titles('upcoming=false'), ['past', 'today'])
+        self.assertEqual(self.get_titles('past=true'), ['past', 'today'])
+
+    def test_can_filter_tours_by_start_date_range_and_place(self):
+        """
+        Tests if tours can be filtered by start date range, country and city.
+        """
+        self.assertEqual(
+            self.get_titles('start_date__range=2024-05-15,2024-07-01'),
+            ['today', 'upcoming']
+            )
+        self.assertEqual(
+            self.get_titles('country=England'), ['past', 'upcoming']
+            )
+        self.assertEqual(
+            self.get_titles('country=England&city=York'), ['upcoming']
+            )
+
+    def test_start_date_must_be_after_today(self):
+        """
+        Tests if a tour cannot start on the current date.
+        """
+        self.client.force_login(self.admin)
+        response = self.client.post('/tours/', {
+            'title': 'test title',
+            'start_date': datetime.date(2024, 6, 1),
+            'end_date': '2024-12-12',
+            'booking_means': 'book online',
+            'country': 'England',
+            'city': 'London'
+            })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start_date', response.data)
+
+
+@override_settings(API_CLOCK=fixed_clock('2024-06-01'))
+class TourFacetsTests(APITestCase):
+    """
+    Tests the tour facets view.
+    """
+    def setUp(self):
+        """
+        Sets up past and upcoming tours in several places.
+        """
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin', password='password1', is_staff=True
+            )
+        for title, start_date, country, city in [
+            ('london walk', '2024-05-01', 'England', 'London'),
+            ('london food', '2024-07-01', 'England', 'London'),
+            ('london night', '2024-08-01', 'England', 'London'),
+            ('york walk', '2024-07-01', 'England', 'York'),
+            ('paris walk', '2024-07-01', 'France', 'Paris'),
+        ]:
+            Tour.objects.create(
+                title=title,
+                owner=self.admin,
+                start_date=start_date,
+                end_date='2024-12-12',
+                booking_means='book online',
+                country=country,
+                city=city,
+                )
+
+    def test_facets_count_upcoming_tours_in_one_query(self):
+        """
+        Tests if the facets count upcoming tours by country
+        and city with a single query.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get('/tours/facets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'England': {'London': 2, 'York': 1},
+            'France': {'Paris': 1},
+        })
+
+    def test_facets_use_the_tour_list_filters(self):
+        """
+        Tests if the facets take the filters and search of the tour list.
+        """
+        response = self.client.get('/tours/facets/?past=true')
+        self.assertEqual(response.data, {'England': {'London': 1}})
+        response = self.client.get('/tours/facets/?country=France')
+        self.assertEqual(response.data, {'France': {'Paris': 1}})
+        response = self.client.get('/tours/facets/?search=walk')
+        self.assertEqual(response.data, {
+            'England': {'York': 1},
+            'France': {'Paris': 1},
+        })
+
+    @override_settings(API_CACHE_TIMEOUT=60)
+    def test_facets_are_cached_until_a_tour_changes(self):
+        """
+        Tests if the facets are served from the cache, for logged
+        in users too, until a tour is saved or deleted.
+        """
+        self.client.get('/tours/facets/')
+        with self.assertNumQueries(0):
+            self.client.get('/tours/facets/')
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(2):
+            response = self.client.get('/tours/facets/')
+        self.assertEqual(response.data['France'], {'Paris': 1})
+        with self.captureOnCommitCallbacks(execute=True):
+            Tour.objects.get(title='paris walk').delete()
+        response = self.client.get('/tours/facets/')
+        self.assertNotIn('France', response.data)
@@ -3,5 +3,6 @@ from tours import views
 
 urlpatterns = [
     path('tours/', views.TourList.as_view()),
+    path('tours/facets/', views.TourFacets.as_view()),
     path('tours/<int:pk>/', views.TourDetail.as_view()),
 ]
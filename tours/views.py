@@ -1,31 +1,76 @@
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Subquery
 from rest_framework import generics, permissions, filters
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from captured_drf_api.cache import CachedResponseMixin
+from captured_drf_api.clock import today
+from captured_drf_api.conditional import ConditionalGetMixin
+from captured_drf_api.images import IMAGE_UPLOAD_PARSER_CLASSES
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
 from captured_drf_api.permissions import IsAdminOrReadOnly
+from captured_drf_api.search import FullTextSearchFilter
+from attendances.models import Attendance
+from .filters import TourFilter
 from .models import Tour
 from .serializers import TourSerializer
 
+TOUR_ETAG_FIELDS = [
+    'updated_at', 'attendance_count', 'attendance_id', 'owner__username',
+]
 
-class TourList(generics.ListCreateAPIView):
+
+class TourQuerySetMixin:
+    """
+    Annotates tours with the id of the requesting user's attendance
+    so it is resolved for the whole page in a single query, unless
+    a sparse fieldset leaves it out.
+    """
+    method_field_sources = {
+        'is_owner': ['owner'],
+        'has_passed': ['start_date'],
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated and self.wants_field('attendance_id'):
+            queryset = queryset.annotate(
+                attendance_id=Subquery(
+                    Attendance.objects.filter(
+                        owner=user, tour=OuterRef('pk')
+                    ).values('id')[:1]
+                )
+            )
+        return queryset
+
+
+class TourList(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    TourQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListCreateAPIView
+):
     """
     Lists tours and handles creation of a tour
     if logged in as an admin.
     """
     serializer_class = TourSerializer
     permission_classes = [IsAdminOrReadOnly]
-    queryset = Tour.objects.annotate(
-        attendance_count=Count('attendances', distinct=True)
-    ).order_by('-created_at')
+    parser_classes = IMAGE_UPLOAD_PARSER_CLASSES
+    queryset = Tour.objects.order_by('-created_at')
+    cache_models = [Tour, Attendance]
+    etag_fields = TOUR_ETAG_FIELDS
 
     filter_backends = [
         filters.OrderingFilter,
-        filters.SearchFilter,
+        FullTextSearchFilter,
         DjangoFilterBackend,
     ]
 
-    filterset_fields = [
-        'attendances__owner__profile',
-    ]
+    filterset_class = TourFilter
+    vary_on_today = True
 
     search_fields = [
         'title',
@@ -42,13 +87,63 @@ class TourList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class TourDetail(generics.RetrieveUpdateDestroyAPIView):
+class TourDetail(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    TourQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.RetrieveUpdateDestroyAPIView
+):
     """
     Handles editing and deleting of tours by id
     if the user is the owner.
     """
     permission_classes = [IsAdminOrReadOnly]
+    parser_classes = IMAGE_UPLOAD_PARSER_CLASSES
     serializer_class = TourSerializer
-    queryset = Tour.objects.annotate(
-        attendance_count=Count('attendances', distinct=True)
-    ).order_by('-created_at')
+    queryset = Tour.objects.order_by('-created_at')
+    etag_fields = TOUR_ETAG_FIELDS
+    vary_on_today = True
+
+
+class TourFacets(CachedResponseMixin, generics.ListAPIView):
+    """
+    Counts the upcoming tours by country and city, as
+    {country: {city: count}}, in one grouped query. Takes the same
+    search and filters as the tour list, so the counts match its
+    results. past=true or upcoming=false count the other tours.
+    """
+    permission_classes = [permissions.AllowAny]
+    queryset = Tour.objects.all()
+    pagination_class = None
+    cache_models = [Tour, Attendance]
+    cache_authenticated = True
+    vary_on_today = True
+
+    filter_backends = [
+        FullTextSearchFilter,
+        DjangoFilterBackend,
+    ]
+    filterset_class = TourFilter
+    search_fields = TourList.search_fields
+
+    def get_queryset(self):
+        """
+        Returns the upcoming tours, unless the request
+        filters on upcoming or past itself.
+        """
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if 'upcoming' in params or 'past' in params:
+            return queryset
+        return queryset.filter(start_date__gt=today(self.request))
+
+    def list(self, request, *args, **kwargs):
+        rows = self.filter_queryset(self.get_queryset()).order_by().values(
+            'country', 'city'
+        ).annotate(count=Count('pk')).order_by('country', 'city')
+        facets = {}
+        for row in rows:
+            facets.setdefault(row['country'], {})[row['city']] = row['count']
+        return Response(facets)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from trending.models import refresh_trending
+
+
+class Command(BaseCommand):
+    """
+    Applies the likes and comments created or deleted since the
+    last run to the trending scores. Meant to run periodically, e.g. every few
+    minutes from a scheduler.
+    """
+    help = 'Refreshes the trending photo scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute every score instead of applying new events.',
+        )
+
+    def handle(self, *args, **options):
+        counted = refresh_trending(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Counted {counted} like and comment changes.'
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.19 on 2026-10-18 11:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def reset_state(apps, schema_editor):
+    """
+    Deletes the refresh state, so the next refresh recomputes every
+    score instead of missing the rows after the old high-water marks.
+    """
+    apps.get_model('trending', 'TrendingState').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photos', '0006_search'),
+        ('trending', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_state, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='trendingstate',
+            name='last_comment_id',
+        ),
+        migrations.RemoveField(
+            model_name='trendingstate',
+            name='last_like_id',
+        ),
+        migrations.CreateModel(
+            name='TrendingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.FloatField()),
+                ('created_at', models.DateTimeField()),
+                ('photo', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='photos.photo')),
+            ],
+        ),
+    ]
@@ -0,0 +1,266 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.signals import post_save, post_delete
+from captured_drf_api import clock
+from captured_drf_api.cache import invalidate
+from comments.models import Comment
+from likes.models import Like
+from photos.models import Photo
+
+# The models whose rows add to a photo's score, and
+# the setting holding the weight of each of their rows
+SCORE_SOURCES = {
+    Like: 'TRENDING_LIKE_WEIGHT',
+    Comment: 'TRENDING_COMMENT_WEIGHT',
+}
+# Scores are rescaled to a new landmark once the newest
+# contributions outgrow the oldest by this many half-lives
+REBASE_HALF_LIVES = 64
+# Scores left at or below this, such as those of photos whose likes
+# were all removed, are deleted rather than kept as rounding errors
+MIN_SCORE = 1e-9
+BATCH_SIZE = 1000
+
+
+class TrendingScore(models.Model):
+    """
+    The model for the trending score of a photo, the sum of its likes
+    and comments weighted by 2 ** (age relative to the landmark in
+    half-lives). Scores don't decay in place, yet ranking them is the
+    same as ranking exponentially decayed scores, since decaying every
+    score to the current time divides all of them by the same factor.
+    """
+    photo = models.OneToOneField(
+        Photo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending_score'
+        )
+    score = models.FloatField(default=0)
+
+    class Meta:
+        """
+        Orders scores from highest to lowest and indexes them,
+        so the trending list is an ordered slice of the index.
+        """
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['-score'], name='trendingscore_score_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the photo and score.
+        """
+        return f'{self.photo_id} {self.score}'
+
+
+class TrendingState(models.Model):
+    """
+    The model for the single row recording the landmark scores are
+    relative to and the time of the last refresh.
+    """
+    landmark = models.DateTimeField()
+    refreshed_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        """
+        Returns the landmark and time of the last refresh.
+        """
+        return f'{self.landmark} {self.refreshed_at}'
+
+
+class TrendingEvent(models.Model):
+    """
+    The model for a change to a photo's trending score not counted
+    yet, recorded when a like or comment is created or deleted. The
+    weight is negative for deletions and created_at is the creation
+    time of the like or comment, so deleting one subtracts exactly
+    what creating it added. Events reference photos without a
+    constraint, as deleting a photo records the deletion of its
+    likes and comments; refreshes drop the events of missing photos.
+    """
+    photo = models.ForeignKey(
+        Photo,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+        )
+    weight = models.FloatField()
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        """
+        Returns the photo and weight.
+        """
+        return f'{self.photo_id} {self.weight}'
+
+
+def get_half_life():
+    """
+    Returns the half-life of trending scores in seconds.
+    """
+    return settings.TRENDING_HALF_LIFE_HOURS * 60 * 60
+
+
+def decay_weight(created_at, landmark, half_life):
+    """
+    Returns the forward decay weight of an event, which doubles
+    every half-life after the landmark.
+    """
+    return 2 ** ((created_at - landmark).total_seconds() / half_life)
+
+
+def apply_increments(increments):
+    """
+    Adds the increments, keyed by photo id, to the stored scores,
+    creating the scores of photos without one. Increments of photos
+    deleted in the meantime are dropped, as are the scores left at
+    or below MIN_SCORE.
+    """
+    photo_ids = list(increments)
+    for start in range(0, len(photo_ids), BATCH_SIZE):
+        batch = photo_ids[start:start + BATCH_SIZE]
+        existing = set(TrendingScore.objects.filter(
+            photo__in=batch
+        ).values_list('photo_id', flat=True))
+        if existing:
+            TrendingScore.objects.filter(photo__in=existing).update(
+                score=F('score') + Case(
+                    *[
+                        When(photo_id=photo_id, then=Value(
+                            increments[photo_id]
+                        ))
+                        for photo_id in existing
+                    ],
+                    output_field=FloatField(),
+                )
+            )
+            TrendingScore.objects.filter(
+                photo__in=existing, score__lte=MIN_SCORE
+            ).delete()
+        new = Photo.objects.filter(pk__in=[
+            photo_id for photo_id in batch
+            if photo_id not in existing and increments[photo_id] > MIN_SCORE
+        ]).values_list('pk', flat=True)
+        TrendingScore.objects.bulk_create([
+            TrendingScore(photo_id=photo_id, score=increments[photo_id])
+            for photo_id in new
+        ])
+
+
+def get_full_increments(landmark, half_life):
+    """
+    Returns the score of every photo with likes or comments,
+    keyed by photo id, and the number of rows counted.
+    """
+    increments = defaultdict(float)
+    counted = 0
+    for model, weight_setting in SCORE_SOURCES.items():
+        weight = getattr(settings, weight_setting)
+        for photo_id, created_at in model.objects.order_by().values_list(
+            'photo_id', 'created_at'
+        ).iterator():
+            increments[photo_id] += weight * decay_weight(
+                created_at, landmark, half_life
+            )
+            counted += 1
+    return increments, counted
+
+
+def consume_events(landmark, half_life):
+    """
+    Deletes the recorded events and returns their increments,
+    keyed by photo id, and the number of events consumed. Events
+    are deleted by primary key, so those committed while they
+    are read are left to the next refresh.
+    """
+    increments = defaultdict(float)
+    pks = []
+    for pk, photo_id, weight, created_at in TrendingEvent.objects.order_by(
+        'pk'
+    ).values_list('pk', 'photo_id', 'weight', 'created_at').iterator():
+        increments[photo_id] += weight * decay_weight(
+            created_at, landmark, half_life
+        )
+        pks.append(pk)
+    for start in range(0, len(pks), BATCH_SIZE):
+        TrendingEvent.objects.filter(
+            pk__in=pks[start:start + BATCH_SIZE]
+        ).delete()
+    return increments, len(pks)
+
+
+def refresh_trending(full=False):
+    """
+    Applies the likes and comments created or deleted since the last
+    refresh to the trending scores and returns how many changes were
+    counted. A full refresh recomputes every score from scratch.
+    """
+    now = clock.now()
+    half_life = get_half_life()
+    with transaction.atomic():
+        state = TrendingState.objects.select_for_update().first()
+        if state is None or full:
+            TrendingScore.objects.all().delete()
+            TrendingState.objects.all().delete()
+            TrendingEvent.objects.all().delete()
+            state = TrendingState(landmark=now)
+            increments, counted = get_full_increments(
+                state.landmark, half_life
+            )
+        else:
+            if (now - state.landmark).total_seconds() > (
+                REBASE_HALF_LIVES * half_life
+            ):
+                factor = decay_weight(state.landmark, now, half_life)
+                TrendingScore.objects.update(score=F('score') * factor)
+                state.landmark = now
+            increments, counted = consume_events(state.landmark, half_life)
+        apply_increments(increments)
+        state.refreshed_at = now
+        state.save()
+    invalidate(TrendingScore)
+    return counted
+
+
+def record_events(model, created=(), deleted=()):
+    """
+    Records the trending events of created and deleted likes or
+    comments of the model, given as (photo id, created_at) pairs.
+    """
+    weight = getattr(settings, SCORE_SOURCES[model])
+    TrendingEvent.objects.bulk_create([
+        TrendingEvent(
+            photo_id=photo_id, weight=sign * weight, created_at=created_at
+        )
+        for sign, rows in [(1, created), (-1, deleted)]
+        for photo_id, created_at in rows
+    ])
+
+
+def record_created_event(sender, instance, created, **kwargs):
+    """
+    Records the trending event of a new like or comment.
+    """
+    if created:
+        record_events(
+            sender, created=[(instance.photo_id, instance.created_at)]
+        )
+
+
+def record_deleted_event(sender, instance, **kwargs):
+    """
+    Records the trending event of a deleted like or comment.
+    """
+    record_events(
+        sender, deleted=[(instance.photo_id, instance.created_at)]
+    )
+
+
+post_save.connect(record_created_event, sender=Like)
+post_delete.connect(record_deleted_event, sender=Like)
+post_save.connect(record_created_event, sender=Comment)
+post_delete.connect(record_deleted_event, sender=Comment)
@@ -0,0 +1,281 @@
+import datetime
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from captured_drf_api.testing import (
+    QueryBudgetMixin, fixed_clock, page_size,
+)
+from comments.models import Comment
+from likes.models import Like
+from photos.models import Photo
+from .models import (
+    TrendingEvent, TrendingScore, TrendingState, refresh_trending,
+)
+
+
+def set_created_at(instance, value):
+    """
+    Moves the creation time of a like or comment
+    and of its pending trending event.
+    """
+    created_at = datetime.datetime.fromisoformat(value)
+    type(instance).objects.filter(pk=instance.pk).update(
+        created_at=created_at
+        )
+    TrendingEvent.objects.filter(
+        photo=instance.photo_id, created_at=instance.created_at
+        ).update(created_at=created_at)
+
+
+@override_settings(
+    API_CLOCK=fixed_clock('2024-06-03T00:00:00+00:00'),
+    TRENDING_HALF_LIFE_HOURS=24,
+)
+class RefreshTrendingTests(APITestCase):
+    """
+    Tests the refreshing of trending scores.
+    """
+    def setUp(self):
+        """
+        Sets up users and photos to be used in the tests.
+        """
+        self.users = [
+            User.objects.create_user(
+                username=f'user{number}', password='password'
+                )
+            for number in range(3)
+        ]
+        self.old_photo = Photo.objects.create(
+            owner=self.users[0], title='old'
+            )
+        self.new_photo = Photo.objects.create(
+            owner=self.users[0], title='new'
+            )
+
+    def get_scores(self):
+        """
+        Returns the stored scores by photo id.
+        """
+        return dict(TrendingScore.objects.values_list('photo', 'score'))
+
+    def test_recent_events_outweigh_older_ones(self):
+        """
+        Tests if two likes from two days ago count less
+        than a like and a comment from yesterday.
+        """
+        for user in self.users[:2]:
+            like = Like.objects.create(owner=user, photo=self.old_photo)
+            set_created_at(like, '2024-06-01T00:00:00+00:00')
+        like = Like.objects.create(owner=self.users[0], photo=self.new_photo)
+        set_created_at(like, '2024-06-02T00:00:00+00:00')
+        comment = Comment.objects.create(
+            owner=self.users[1], photo=self.new_photo, content='comment'
+            )
+        set_created_at(comment, '2024-06-02T00:00:00+00:00')
+        self.assertEqual(refresh_trending(), 4)
+        scores = self.get_scores()
+        self.assertAlmostEqual(scores[self.old_photo.id], 2 * 0.25)
+        self.assertAlmostEqual(scores[self.new_photo.id], 3 * 0.5)
+
+    def test_refresh_only_counts_new_events(self):
+        """
+        Tests if a refresh adds only the likes and comments
+        created since the last one.
+        """
+        like = Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        set_created_at(like, '2024-06-02T00:00:00+00:00')
+        refresh_trending()
+        first_score = self.get_scores()[self.old_photo.id]
+        self.assertEqual(refresh_trending(), 0)
+        self.assertEqual(self.get_scores()[self.old_photo.id], first_score)
+        like = Like.objects.create(owner=self.users[1], photo=self.old_photo)
+        set_created_at(like, '2024-06-02T00:00:00+00:00')
+        self.assertEqual(refresh_trending(), 1)
+        self.assertAlmostEqual(
+            self.get_scores()[self.old_photo.id], 2 * first_score
+            )
+
+    def test_refresh_subtracts_deleted_events(self):
+        """
+        Tests if unliking and deleting comments subtracts what they
+        added, dropping photos left without a score.
+        """
+        like = Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        set_created_at(like, '2024-06-02T00:00:00+00:00')
+        comment = Comment.objects.create(
+            owner=self.users[1], photo=self.new_photo, content='comment'
+            )
+        other_like = Like.objects.create(
+            owner=self.users[1], photo=self.old_photo
+            )
+        set_created_at(other_like, '2024-06-02T00:00:00+00:00')
+        refresh_trending()
+        like.refresh_from_db()
+        like.delete()
+        comment.delete()
+        self.assertEqual(refresh_trending(), 2)
+        self.assertEqual(list(self.get_scores()), [self.old_photo.id])
+        self.assertAlmostEqual(self.get_scores()[self.old_photo.id], 0.5)
+        self.assertEqual(TrendingEvent.objects.count(), 0)
+
+    def test_liking_again_does_not_inflate_the_score(self):
+        """
+        Tests if unliking and liking a photo again
+        leaves the score of a single like.
+        """
+        like = Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        set_created_at(like, '2024-06-02T00:00:00+00:00')
+        refresh_trending()
+        for _ in range(2):
+            Like.objects.get(pk=like.pk).delete()
+            like = Like.objects.create(
+                owner=self.users[0], photo=self.old_photo
+                )
+            set_created_at(like, '2024-06-02T00:00:00+00:00')
+            refresh_trending()
+        self.assertAlmostEqual(self.get_scores()[self.old_photo.id], 0.5)
+
+    def test_events_committed_out_of_order_are_counted(self):
+        """
+        Tests if an event with a lower id than the events
+        already counted is counted by the next refresh.
+        """
+        Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        Like.objects.create(owner=self.users[1], photo=self.old_photo)
+        refresh_trending()
+        TrendingEvent.objects.create(
+            pk=1, photo=self.new_photo, weight=1,
+            created_at=datetime.datetime.fromisoformat(
+                '2024-06-02T00:00:00+00:00'
+                )
+            )
+        self.assertEqual(refresh_trending(), 1)
+        self.assertAlmostEqual(self.get_scores()[self.new_photo.id], 0.5)
+
+    def test_bulk_likes_record_events(self):
+        """
+        Tests if liking and unliking photos in bulk
+        records their trending events.
+        """
+        self.client.force_login(self.users[0])
+        self.client.post('/likes/bulk/', {
+            'like': [self.old_photo.id, self.new_photo.id],
+            }, format='json')
+        refresh_trending()
+        self.assertEqual(
+            set(self.get_scores()), {self.old_photo.id, self.new_photo.id}
+            )
+        self.client.post('/likes/bulk/', {
+            'like': [self.old_photo.id],
+            'unlike': [self.new_photo.id],
+            }, format='json')
+        self.assertEqual(refresh_trending(), 1)
+        self.assertEqual(list(self.get_scores()), [self.old_photo.id])
+
+    def test_full_refresh_drops_deleted_events(self):
+        """
+        Tests if a full refresh recomputes scores without deleted likes.
+        """
+        like = Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        refresh_trending()
+        like.delete()
+        self.assertEqual(refresh_trending(full=True), 0)
+        self.assertEqual(self.get_scores(), {})
+
+    def test_scores_are_rebased_without_changing_the_ranking(self):
+        """
+        Tests if moving the landmark far ahead rescales scores
+        and keeps the ranking.
+        """
+        for owner, photo in [
+            (self.users[0], self.old_photo),
+            (self.users[1], self.old_photo),
+            (self.users[0], self.new_photo),
+        ]:
+            like = Like.objects.create(owner=owner, photo=photo)
+            set_created_at(like, '2024-06-02T00:00:00+00:00')
+        refresh_trending()
+        with override_settings(API_CLOCK=fixed_clock('2024-12-01')):
+            refresh_trending()
+        state = TrendingState.objects.get()
+        self.assertEqual(state.landmark.date(), datetime.date(2024, 12, 1))
+        scores = self.get_scores()
+        self.assertGreater(scores[self.old_photo.id], 0)
+        self.assertAlmostEqual(
+            scores[self.old_photo.id] / scores[self.new_photo.id], 2
+            )
+
+    def test_refresh_trending_command(self):
+        """
+        Tests if the command reports the number of events counted.
+        """
+        Like.objects.create(owner=self.users[0], photo=self.old_photo)
+        out = StringIO()
+        call_command('refresh_trending', '--full', stdout=out)
+        self.assertIn('Counted 1 like and comment changes.', out.getvalue())
+
+
+class TrendingPhotoListViewTests(QueryBudgetMixin, APITestCase):
+    """
+    Tests the trending photo list view.
+    """
+    def setUp(self):
+        """
+        Sets up a user and photos with different numbers of likes.
+        """
+        self.user1 = User.objects.create_user(
+            username='user1', password='password1'
+            )
+        self.photos = [
+            Photo.objects.create(owner=self.user1, title=f'title {number}')
+            for number in range(3)
+        ]
+        for number, photo in enumerate(self.photos[1:], start=1):
+            for like_number in range(number):
+                owner = User.objects.create(
+                    username=f'fan{number}-{like_number}'
+                    )
+                Like.objects.create(owner=owner, photo=photo)
+        refresh_trending()
+
+    def test_lists_photos_by_trending_score(self):
+        """
+        Tests if trending photos are listed from highest to lowest
+        score, leaving out photos without likes or comments.
+        """
+        response = self.client.get('/photos/trending/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [photo['id'] for photo in response.data['results']],
+            [self.photos[2].id, self.photos[1].id]
+            )
+
+    def test_cursor_pages_follow_the_trending_score(self):
+        """
+        Tests if cursor mode pages through the photos by
+        score, skipping the count query.
+        """
+        with page_size(1):
+            with self.assertNumQueries(1):
+                response = self.client.get(
+                    '/photos/trending/', {'pagination': 'cursor'}
+                    )
+            self.assertNotIn('count', response.data)
+            self.assertEqual(
+                response.data['results'][0]['id'], self.photos[2].id
+                )
+            response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [photo['id'] for photo in response.data['results']],
+            [self.photos[1].id]
+            )
+        self.assertIsNone(response.data['next'])
+
+    def test_trending_list_budget(self):
+        """
+        Tests if the trending list runs the count and page queries.
+        """
+        self.assertQueryBudget('/photos/trending/', 2)
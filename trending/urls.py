@@ -0,0 +1,6 @@
+from django.urls import path
+from trending import views
+
+urlpatterns = [
+    path('photos/trending/', views.TrendingPhotoList.as_view()),
+]
@@ -0,0 +1,51 @@
+from django.db.models import F
+from rest_framework import generics, permissions
+from captured_drf_api.cache import CachedResponseMixin
+from captured_drf_api.mixins import OwnerQuerySetMixin, SparseFieldsMixin
+from captured_drf_api.pagination import (
+    CreatedAtCursorPagination, PageOrCursorPagination,
+)
+from photos.models import Photo
+from photos.serializers import PhotoSerializer
+from photos.views import PhotoQuerySetMixin
+from profiles.models import Profile
+from .models import TrendingScore
+
+
+class TrendingCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination on (-score, -id) of the trending list.
+    """
+    ordering = ('-score', '-id')
+
+
+class TrendingPagination(PageOrCursorPagination):
+    """
+    The default pagination, with its cursor mode keyed
+    on the trending score instead of the creation date.
+    """
+    cursor_pagination_class = TrendingCursorPagination
+
+
+class TrendingPhotoList(
+    CachedResponseMixin,
+    PhotoQuerySetMixin,
+    SparseFieldsMixin,
+    OwnerQuerySetMixin,
+    generics.ListAPIView
+):
+    """
+    Lists photos by their trending score, as stored by the last
+    refresh_trending run, from most to least trending. Cached
+    responses are only invalidated by refreshes and profile
+    changes, so their counters may lag until the cache times out.
+    """
+    serializer_class = PhotoSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = TrendingPagination
+    queryset = Photo.objects.filter(
+        trending_score__score__gt=0
+    ).annotate(
+        score=F('trending_score__score')
+    ).order_by('-score', '-id')
+    cache_models = [TrendingScore, Profile]